@@ -0,0 +1,42 @@
+"""gunicorn settings, read from the project root: `gunicorn pixel_portfolio.wsgi`.
+
+The app is imported once in the master (preload_app), which then imports
+every view and compiles every template (pages.warmup) before forking, so
+workers start with them in memory. Each worker opens its own database
+connection before it accepts a request. Values come from the environment or
+.env (python-decouple); DJANGO_ENV picks the settings module (see
+pixel_portfolio.settings_module).
+"""
+import multiprocessing
+
+# Not `from decouple import config`: gunicorn would read `config` as its own setting.
+import decouple
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = decouple.config('WEB_CONCURRENCY', default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+threads = decouple.config('GUNICORN_THREADS', default=1, cast=int)
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+accesslog = decouple.config('GUNICORN_ACCESS_LOG', default='-')
+
+preload_app = True
+
+
+def when_ready(server):
+    # Master, after the preloaded app is imported and before the first fork.
+    from pages.warmup import warm_up
+
+    summary = warm_up(databases=False)
+    server.log.info('Warmed up in master: %d views modules, %d templates in %.0f ms',
+                    summary['views'], summary['templates'], summary['ms']['total'])
+    for name in summary['failed']:
+        server.log.warning('Template does not compile: %s', name)
+
+
+def post_worker_init(worker):
+    # Worker, before it accepts: views and templates are inherited, so this
+    # mostly opens the connection (on this thread, which sync workers serve on).
+    from pages.warmup import warm_up
+
+    summary = warm_up()
+    worker.log.info('Worker %s ready in %.0f ms (databases: %s)',
+                    worker.pid, summary['ms']['total'], ', '.join(summary['databases']))
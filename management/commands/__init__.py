@@ -1 +0,0 @@
-# Management commands package
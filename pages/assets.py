@@ -0,0 +1,522 @@
+"""Per-page CSS/JS bundles for ``manage.py build_assets``.
+
+Each entry of ``ASSET_BUNDLES`` names the stylesheets and scripts one page
+loads. A build concatenates them into ``<bundle>.css`` / ``<bundle>.js`` under
+``ASSET_BUNDLE_DIR`` (``static/dist``), after
+
+- dropping CSS rules whose class or id selectors appear in no template and no
+  script, and ``@keyframes`` no kept rule animates;
+- minifying: comments and insignificant whitespace go, and ``console.log`` /
+  ``debug`` / ``info`` / ``trace`` calls become ``void 0``. Line breaks in
+  scripts are kept wherever a statement could end, so automatic semicolon
+  insertion behaves as in the source.
+
+Pages link bundles with ``{% asset_bundle %}`` (``pages.templatetags.asset_tags``),
+which falls back to the individual sources until a bundle is built or while
+``ASSET_BUNDLES_ENABLED`` is off (the default under ``DEBUG``).
+"""
+import gzip
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+MANIFEST_NAME = "manifest.json"
+# Static-relative prefix under which bundles are published.
+STATIC_PREFIX = "dist"
+KINDS = ("css", "js")
+
+_manifest_lock = threading.Lock()
+_manifest_cache = {"stamp": None, "data": {}}
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def output_dir() -> Path:
+    return Path(_setting("ASSET_BUNDLE_DIR", settings.BASE_DIR / "static" / STATIC_PREFIX))
+
+
+def bundles() -> dict:
+    return _setting("ASSET_BUNDLES", {})
+
+
+def budget(bundle: str, kind: str) -> Optional[int]:
+    """Gzipped-size budget in bytes for ``<bundle>.<kind>``: a per-file entry, else the per-kind one."""
+    budgets = _setting("ASSET_BUDGETS", {})
+    return budgets.get(f"{bundle}.{kind}", budgets.get(kind))
+
+
+# -- CSS ---------------------------------------------------------------------
+
+_CSS_COMMENT = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|/\*.*?\*/", re.S)
+# At-rules whose block holds further rules, as opposed to declarations or keyframes.
+_GROUP_AT_RULES = ("@media", "@supports", "@container", "@layer", "@document")
+_SELECTOR_NAME = re.compile(r"[.#](-?[A-Za-z_][\w-]*)")
+_SELECTOR_ARGS = re.compile(r"\([^()]*\)|\[[^\]]*\]")
+_ANIMATION = re.compile(r"animation(?:-name)?:([^;}]+)")
+_KEYFRAMES = re.compile(r"@(?:-\w+-)?keyframes\s+(\S+)")
+_TOKEN = re.compile(r"[A-Za-z_-][\w-]*")
+
+
+def _scan(text: str, i: int, stops: str) -> int:
+    """Index of the first character of ``stops`` at or after ``i``, outside strings and parentheses."""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c in "\"'":
+            i = _skip_string(text, i)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth = max(depth - 1, 0)
+        elif not depth and c in stops:
+            return i
+        i += 1
+    return i
+
+
+def _parse(css: str, i: int = 0):
+    """``(nodes, end)`` for the block starting at ``i``.
+
+    Nodes are ``("rule", selector, declarations)``, ``("group", prelude, nodes)``,
+    ``("block", prelude, body)`` for other at-rules with a block, and
+    ``("statement", text)``.
+    """
+    nodes = []
+    while True:
+        while i < len(css) and css[i].isspace():
+            i += 1
+        if i >= len(css):
+            return nodes, i
+        if css[i] == "}":
+            return nodes, i + 1
+        j = _scan(css, i, "{;}")
+        prelude = css[i:j].strip()
+        if j >= len(css) or css[j] != "{":
+            if prelude:
+                nodes.append(("statement", prelude))
+            i = j + 1 if j < len(css) and css[j] == ";" else j
+            continue
+        if prelude.lower().startswith(_GROUP_AT_RULES):
+            children, i = _parse(css, j + 1)
+            nodes.append(("group", prelude, children))
+            continue
+        depth, k = 1, j + 1
+        while k < len(css) and depth:
+            k = _scan(css, k, "{}")
+            if k < len(css):
+                depth += 1 if css[k] == "{" else -1
+                k += 1
+        body = css[j + 1:k - 1]
+        nodes.append(("block" if prelude.startswith("@") else "rule", prelude, body))
+        i = k
+
+
+def _squeeze(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _minify_selector(selector: str) -> str:
+    return re.sub(r"\s*([,>~+])\s*", r"\1", _squeeze(selector))
+
+
+def _minify_prelude(prelude: str) -> str:
+    return re.sub(r"\s*([:,])\s*", r"\1", _squeeze(prelude)).replace("( ", "(").replace(" )", ")")
+
+
+def _minify_declarations(body: str) -> str:
+    declarations = []
+    i = 0
+    while i < len(body):
+        j = _scan(body, i, ";")
+        name, colon, value = body[i:j].partition(":")
+        if colon and name.strip():
+            value = re.sub(r"\s*,\s*", ",", _squeeze(value)).replace("! important", "!important")
+            declarations.append(f"{name.strip()}:{value}")
+        i = j + 1
+    return ";".join(declarations)
+
+
+def _serialize(nodes) -> str:
+    out = []
+    for node in nodes:
+        kind = node[0]
+        if kind == "statement":
+            out.append(_minify_prelude(node[1]) + ";")
+        elif kind == "rule":
+            out.append(f"{_minify_selector(node[1])}{{{_minify_declarations(node[2])}}}")
+        elif kind == "group":
+            out.append(f"{_minify_prelude(node[1])}{{{_serialize(node[2])}}}")
+        elif "{" in node[2]:
+            # @keyframes: the body is a list of "<selector>{...}" frames.
+            out.append(f"{_minify_prelude(node[1])}{{{_serialize(_parse(node[2])[0])}}}")
+        else:
+            out.append(f"{_minify_prelude(node[1])}{{{_minify_declarations(node[2])}}}")
+    return "".join(out)
+
+
+class UsedNames:
+    """Class/id names a selector may refer to, gathered from templates and scripts.
+
+    Names built at runtime (``'theme-' + key``, ``{{ kind }}-active``) leave a
+    token ending or starting in ``-``, which then matches any name with that
+    prefix or suffix.
+    """
+
+    def __init__(self, texts: Iterable[str]):
+        self.tokens = set()
+        for text in texts:
+            self.tokens.update(_TOKEN.findall(text))
+        self.prefixes = tuple(t for t in self.tokens if t.endswith("-") and len(t) > 2)
+        self.suffixes = tuple(t for t in self.tokens if t.startswith("-") and len(t) > 2)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tokens or name.startswith(self.prefixes) or name.endswith(self.suffixes)
+
+    def selector_used(self, selector: str) -> bool:
+        # Names inside :not(...) or [attr=...] need not occur anywhere.
+        bare = selector
+        while True:
+            stripped = _SELECTOR_ARGS.sub("", bare)
+            if stripped == bare:
+                break
+            bare = stripped
+        return all(name in self for name in _SELECTOR_NAME.findall(bare))
+
+
+def _prune(nodes, used: UsedNames, stats: dict, animations: set):
+    kept = []
+    for node in nodes:
+        kind = node[0]
+        if kind == "rule":
+            selectors = [s for s in _scan_split(node[1]) if used.selector_used(s)]
+            stats["rules"] += 1
+            if not selectors:
+                stats["removed"] += 1
+                continue
+            for match in _ANIMATION.finditer(_minify_declarations(node[2])):
+                animations.update(_TOKEN.findall(match.group(1)))
+            kept.append(("rule", ",".join(selectors), node[2]))
+        elif kind == "group":
+            children = _prune(node[2], used, stats, animations)
+            if children:
+                kept.append(("group", node[1], children))
+        else:
+            kept.append(node)
+    return kept
+
+
+def _drop_unused_keyframes(nodes, used: UsedNames, animations: set, stats: dict):
+    kept = []
+    for node in nodes:
+        if node[0] == "group":
+            children = _drop_unused_keyframes(node[2], used, animations, stats)
+            if children:
+                kept.append(("group", node[1], children))
+            continue
+        match = _KEYFRAMES.match(node[1]) if node[0] == "block" else None
+        # Kept rules animate by name; templates may too, in a style attribute.
+        if match and match.group(1) not in animations and match.group(1) not in used:
+            stats["removed"] += 1
+            continue
+        kept.append(node)
+    return kept
+
+
+def _scan_split(selector: str) -> list:
+    parts, i = [], 0
+    while i <= len(selector):
+        j = _scan(selector, i, ",")
+        if selector[i:j].strip():
+            parts.append(selector[i:j].strip())
+        i = j + 1
+    return parts
+
+
+def minify_css(css: str, used: Optional[UsedNames] = None, stats: Optional[dict] = None) -> str:
+    """Minified ``css``; with ``used``, rules and keyframes nothing refers to are dropped."""
+    stats = stats if stats is not None else {}
+    stats.setdefault("rules", 0)
+    stats.setdefault("removed", 0)
+    nodes, _ = _parse(_CSS_COMMENT.sub(lambda m: m.group(1) or "", css))
+    if used is not None:
+        animations = set()
+        nodes = _drop_unused_keyframes(_prune(nodes, used, stats, animations), used, animations, stats)
+    return _serialize(nodes)
+
+
+# -- JS ----------------------------------------------------------------------
+
+_CONSOLE_CALL = re.compile(r"console\.(?:log|debug|info|trace)\s*\(")
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "in", "of", "delete", "void", "throw", "new",
+                   "instanceof", "yield", "await", "else", "do"}
+# A line break is only dropped after a token that cannot end a statement.
+_CONTINUES = set("{([,;=:?&|+-*/%<>!~^")
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c in "_$" or ord(c) > 127
+
+
+def _skip_string(src: str, i: int) -> int:
+    quote, i = src[i], i + 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or c == "\n":
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_template(src: str, i: int) -> int:
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "`":
+            return i + 1
+        if src.startswith("${", i):
+            i = _skip_code(src, i + 2)
+            continue
+        i += 1
+    return i
+
+
+def _skip_code(src: str, i: int) -> int:
+    """Index just past the bracket closing the one opened before ``i``."""
+    depth = 0
+    while i < len(src):
+        c = src[i]
+        if c in "\"'":
+            i = _skip_string(src, i)
+            continue
+        if c == "`":
+            i = _skip_template(src, i)
+            continue
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            if not depth:
+                return i + 1
+            depth -= 1
+        i += 1
+    return i
+
+
+def _skip_regex(src: str, i: int) -> int:
+    i += 1
+    in_class = False
+    while i < len(src) and src[i] != "\n":
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(src) and src[i].isalpha():
+        i += 1
+    return i
+
+
+def _regex_allowed(out: list) -> bool:
+    if not out:
+        return True
+    last = out[-1]
+    if last[-1] in _REGEX_AFTER:
+        return True
+    return last in _REGEX_KEYWORDS
+
+
+def minify_js(src: str, drop_console: bool = True) -> str:
+    """Strip comments and insignificant whitespace from ``src``.
+
+    A tokenizer rather than a parser: strings, template literals and regex
+    literals are copied untouched, and line breaks are kept unless the
+    previous token cannot end a statement.
+    """
+    out = []
+    pending = ""
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c == "\n":
+            pending = "\n"
+            i += 1
+            continue
+        if c.isspace():
+            pending = pending or " "
+            i += 1
+            continue
+        if src.startswith("//", i):
+            end = src.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            pending = pending or " "
+            continue
+        if c in "\"'":
+            j = _skip_string(src, i)
+        elif c == "`":
+            j = _skip_template(src, i)
+        elif c == "/" and _regex_allowed(out):
+            j = _skip_regex(src, i)
+        elif _is_word(c):
+            j = i + 1
+            while j < n and _is_word(src[j]):
+                j += 1
+            if drop_console and src.startswith("console", i) and (not i or src[i - 1] != "."):
+                call = _CONSOLE_CALL.match(src, i)
+                if call:
+                    _emit(out, pending, "void 0")
+                    pending = ""
+                    i = _skip_code(src, call.end())
+                    continue
+        else:
+            j = i + 1
+        _emit(out, pending, src[i:j])
+        pending = ""
+        i = j
+    return "".join(out) + "\n"
+
+
+def _emit(out: list, pending: str, token: str) -> None:
+    if out and pending:
+        prev, first = out[-1][-1], token[0]
+        # Operators are emitted one character at a time; longer tokens are
+        # words, strings and regex literals, all of which can end a statement.
+        continues = len(out[-1]) == 1 and prev in _CONTINUES
+        if pending == "\n" and not continues and first not in ".,;)]}":
+            out.append("\n")
+        elif (_is_word(prev) and _is_word(first)) or (prev == first and prev in "+-") or (prev == "/" and first in "/*"):
+            out.append(" ")
+    out.append(token)
+
+
+# -- Build -------------------------------------------------------------------
+
+def reference_files() -> list:
+    """Templates of the project's own apps and template dirs, plus every static script."""
+    roots = [Path(d) for engine in settings.TEMPLATES for d in engine.get("DIRS", [])]
+    base = Path(settings.BASE_DIR).resolve()
+    for config in apps.get_app_configs():
+        path = Path(config.path).resolve()
+        if base in path.parents:
+            roots.append(path / "templates")
+    files = [p for root in roots if root.is_dir() for p in sorted(root.rglob("*.html"))]
+    out = output_dir().resolve()
+    for root in settings.STATICFILES_DIRS:
+        files += [p for p in sorted(Path(root).rglob("*.js")) if out not in p.resolve().parents]
+    return files
+
+
+def used_names() -> UsedNames:
+    return UsedNames(path.read_text(encoding="utf-8", errors="replace") for path in reference_files())
+
+
+def source_path(name: str) -> Path:
+    found = finders.find(name)
+    if not found:
+        raise FileNotFoundError(f"Static file {name!r} not found")
+    return Path(found)
+
+
+def build(directory: Optional[Path] = None, prune: bool = True, drop_console: bool = True) -> list:
+    """Write every configured bundle and the manifest; returns one report row per file."""
+    directory = directory or output_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    used = used_names() if prune else None
+    manifest, rows = {}, []
+    for name, config in sorted(bundles().items()):
+        for kind in KINDS:
+            sources = config.get(kind) or []
+            if not sources:
+                continue
+            texts = [source_path(source).read_text(encoding="utf-8") for source in sources]
+            stats = {}
+            if kind == "css":
+                parts = [minify_css(text, used, stats) for text in texts]
+                content = "\n".join(parts) + "\n"
+            else:
+                # ";" in case a source ends without one.
+                content = ";\n".join(minify_js(text, drop_console).rstrip("\n") for text in texts) + "\n"
+            filename = f"{name}.{kind}"
+            data = content.encode("utf-8")
+            tmp = directory / (filename + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, directory / filename)
+            manifest.setdefault(name, {})[kind] = filename
+            rows.append({
+                "bundle": name, "kind": kind, "file": filename, "sources": sources,
+                "source_bytes": sum(len(text.encode("utf-8")) for text in texts),
+                "bytes": len(data),
+                "gzip_bytes": len(gzip.compress(data, compresslevel=9, mtime=0)),
+                "rules": stats.get("rules"), "rules_removed": stats.get("removed"),
+                "budget": budget(name, kind),
+            })
+    written = {filename for files in manifest.values() for filename in files.values()}
+    for kind in KINDS:
+        for path in directory.glob(f"*.{kind}"):
+            if path.name not in written:
+                path.unlink(missing_ok=True)
+    tmp = directory / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, directory / MANIFEST_NAME)
+    return rows
+
+
+def unbundled() -> list:
+    """Static CSS/JS sources that no bundle includes."""
+    bundled = {source for config in bundles().values() for kind in KINDS for source in config.get(kind) or []}
+    out = output_dir().resolve()
+    names = []
+    for root in settings.STATICFILES_DIRS:
+        root = Path(root)
+        for kind in KINDS:
+            for path in sorted(root.rglob(f"*.{kind}")):
+                if out in path.resolve().parents:
+                    continue
+                name = path.relative_to(root).as_posix()
+                if name not in bundled:
+                    names.append(name)
+    return names
+
+
+def bundle_file(name: str, kind: str) -> Optional[str]:
+    """Static-relative path of the built ``<name>.<kind>`` bundle, or None."""
+    path = output_dir() / MANIFEST_NAME
+    try:
+        stamp = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return None
+    with _manifest_lock:
+        if _manifest_cache["stamp"] != stamp:
+            try:
+                _manifest_cache["data"] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                _manifest_cache["data"] = {}
+            _manifest_cache["stamp"] = stamp
+        filename = _manifest_cache["data"].get(name, {}).get(kind)
+    return f"{STATIC_PREFIX}/{filename}" if filename else None
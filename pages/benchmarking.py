@@ -0,0 +1,198 @@
+"""Latency, throughput and allocation measurements for the ``benchmark`` command.
+
+A benchmark is a zero-argument callable that performs one request. It is run
+``warmup`` times unmeasured, then ``requests`` times timed back to back, then
+a few more times under ``tracemalloc`` (kept separate so tracing overhead
+does not leak into the latency numbers).
+
+:func:`measure_concurrent` and :func:`ameasure_concurrent` instead keep
+``concurrency`` requests in flight, from a thread pool or as asyncio tasks,
+and are used with :func:`wsgi_sender` / :func:`asgi_sender` to drive the
+project's WSGI and ASGI applications the way gunicorn and uvicorn would,
+minus the sockets.
+
+Results are plain dicts so they can be written to and compared against a
+baseline JSON file:
+``{"<scale>": {"<benchmark>": {"rps", "p50_ms", "p95_ms", "p99_ms", "alloc_kib"}}}``.
+"""
+import asyncio
+import math
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Awaitable, Callable, Optional
+
+# metric -> +1 if larger is worse, -1 if smaller is worse
+METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "alloc_kib": 1, "rps": -1}
+# Metrics checked by compare(); p50/p99 are reported but too noisy to gate on.
+GATED = ("p95_ms", "rps", "alloc_kib")
+
+
+def percentile(samples, q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _summary(samples, elapsed: float) -> dict:
+    return {
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "alloc_kib": None,
+    }
+
+
+def measure(send: Callable[[], object], requests: int = 100, warmup: int = 10,
+            alloc_runs: Optional[int] = 5) -> dict:
+    for _ in range(warmup):
+        send()
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        send()
+        samples.append((time.perf_counter() - t0) * 1000)
+    result = _summary(samples, time.perf_counter() - started)
+    if alloc_runs:
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_runs):
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                send()
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - base)
+        finally:
+            tracemalloc.stop()
+        result["alloc_kib"] = round(percentile(peaks, 50) / 1024, 1)
+    return result
+
+
+def measure_concurrent(send: Callable[[], object], requests: int = 100, warmup: int = 10,
+                       concurrency: int = 8) -> dict:
+    """Like :func:`measure` with ``concurrency`` threads sending at once (no allocations)."""
+    def timed(_):
+        t0 = time.perf_counter()
+        send()
+        return (time.perf_counter() - t0) * 1000
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        # Warm every thread, so per-thread DB connections are open before timing.
+        list(pool.map(lambda _: send(), range(max(warmup, concurrency))))
+        started = time.perf_counter()
+        samples = list(pool.map(timed, range(requests)))
+        elapsed = time.perf_counter() - started
+    return _summary(samples, elapsed)
+
+
+async def ameasure_concurrent(send: Callable[[], Awaitable[object]], requests: int = 100, warmup: int = 10,
+                              concurrency: int = 8) -> dict:
+    """:func:`measure_concurrent` for a coroutine function, with ``concurrency`` tasks."""
+    for _ in range(warmup):
+        await send()
+    samples = []
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            t0 = time.perf_counter()
+            await send()
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summary(samples, time.perf_counter() - started)
+
+
+def wsgi_sender(app, path: str) -> Callable[[], int]:
+    """A callable that GETs ``path`` from a WSGI ``app`` and returns the status code."""
+    path, _, query = path.partition("?")
+
+    def send():
+        status = []
+        environ = {
+            "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "SCRIPT_NAME": "",
+            "SERVER_NAME": "testserver", "SERVER_PORT": "80", "HTTP_HOST": "testserver",
+            "SERVER_PROTOCOL": "HTTP/1.1", "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.version": (1, 0), "wsgi.url_scheme": "http", "wsgi.input": BytesIO(),
+            "wsgi.errors": BytesIO(), "wsgi.multithread": True, "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        body = app(environ, lambda line, headers, exc_info=None: status.append(line))
+        try:
+            for _ in body:
+                pass
+        finally:
+            # close() sends request_finished, as a server would.
+            body.close()
+        return int(status[0].split()[0])
+
+    return send
+
+
+def asgi_sender(app, path: str) -> Callable[[], Awaitable[int]]:
+    """A coroutine function that GETs ``path`` from an ASGI ``app`` and returns the status code."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+    }
+
+    async def send():
+        status = []
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # The client stays connected; Django cancels this once the response is sent.
+            await asyncio.Future()
+
+        async def respond(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await app(dict(scope), receive, respond)
+        return status[0]
+
+    return send
+
+
+def _per_request_ms(metric: str, value: float) -> float:
+    return 1000 / value if metric == "rps" else value
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_ms: float = 1.0) -> list:
+    """Regressions of ``current`` against ``baseline`` beyond ``threshold`` (0.1 = 10%).
+
+    Timing changes smaller than ``min_ms`` per request are treated as noise,
+    however large they are relatively. Returns ``(scale, benchmark, metric,
+    baseline, current, change)`` tuples; benchmarks or scales missing from
+    either side are skipped.
+    """
+    regressions = []
+    for scale, benchmarks in current.items():
+        for name, metrics in benchmarks.items():
+            before = baseline.get(scale, {}).get(name)
+            if not before:
+                continue
+            for metric in GATED:
+                old, new = before.get(metric), metrics.get(metric)
+                if not old or not new:
+                    continue
+                change = (new - old) / old
+                if change * METRICS[metric] <= threshold:
+                    continue
+                if metric != "alloc_kib" and abs(_per_request_ms(metric, new) - _per_request_ms(metric, old)) < min_ms:
+                    continue
+                regressions.append((scale, name, metric, old, new, change))
+    return regressions
@@ -0,0 +1,142 @@
+"""Theme catalog cache: pre-encoded JSON bytes behind a two-level cache.
+
+Level 1 is a small per-process LRU; level 2 is a Django cache alias
+(``THEME_CACHE_ALIAS``, file-based by default so all gunicorn workers share
+it). Invalidation bumps a generation number in the shared cache, and each
+process re-checks that generation at most every ``THEME_CACHE_LOCAL_TTL``
+seconds, so an admin edit is visible everywhere within that window.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def theme_rows() -> list:
+    """Theme catalog rows as served by the API, including the CSS bundle URL."""
+    from .models import Theme
+    from .theme_css import css_url
+
+    rows = list(Theme.objects.order_by("name").values("key", "name", "category", "variables", "icons", "is_default"))
+    for row in rows:
+        row["css_url"] = css_url(row["key"])
+    return rows
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    body: bytes
+    etag: str
+    generation: int
+
+
+class ThemeCatalogCache:
+    """Serve the ``/api/themes/`` body without touching the database."""
+
+    key_prefix = "pages:theme-catalog"
+
+    def __init__(self, maxsize: int = 4):
+        self.maxsize = maxsize
+        self._local = OrderedDict()
+        self._checked = {}
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def shared(self):
+        return caches[getattr(settings, "THEME_CACHE_ALIAS", "default")]
+
+    @property
+    def local_ttl(self) -> float:
+        return getattr(settings, "THEME_CACHE_LOCAL_TTL", 2.0)
+
+    def _generation(self) -> int:
+        key = f"{self.key_prefix}:generation"
+        generation = self.shared.get(key)
+        if generation is None:
+            self.shared.add(key, 0, timeout=None)
+            generation = self.shared.get(key, 0)
+        return generation
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, variant: str = "all") -> CatalogEntry:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(variant)
+            fresh = entry is not None and now - self._checked.get(variant, 0) < self.local_ttl
+            if fresh:
+                self._local.move_to_end(variant)
+                self._stats["local_hits"] += 1
+                return entry
+
+        generation = self._generation()
+        if entry is not None and entry.generation == generation:
+            self._remember(variant, entry, now)
+            self._count("local_hits")
+            return entry
+
+        shared_key = f"{self.key_prefix}:{variant}:{generation}"
+        entry = self.shared.get(shared_key)
+        if entry is not None:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            entry = self._build(generation)
+            self.shared.set(shared_key, entry, timeout=None)
+        self._remember(variant, entry, now)
+        return entry
+
+    async def aget(self, variant: str = "all") -> CatalogEntry:
+        """:meth:`get` for async views: a fresh local entry is returned without a thread hop."""
+        with self._lock:
+            entry = self._local.get(variant)
+            if entry is not None and time.monotonic() - self._checked.get(variant, 0) < self.local_ttl:
+                self._local.move_to_end(variant)
+                self._stats["local_hits"] += 1
+                return entry
+        return await sync_to_async(self.get)(variant)
+
+    def _remember(self, variant: str, entry: CatalogEntry, now: float) -> None:
+        with self._lock:
+            self._local[variant] = entry
+            self._local.move_to_end(variant)
+            self._checked[variant] = now
+            while len(self._local) > self.maxsize:
+                old, _ = self._local.popitem(last=False)
+                self._checked.pop(old, None)
+
+    def _build(self, generation: int) -> CatalogEntry:
+        body = json.dumps({"results": theme_rows()}, cls=DjangoJSONEncoder).encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        return CatalogEntry(body=body, etag=etag, generation=generation)
+
+    def invalidate(self) -> None:
+        key = f"{self.key_prefix}:generation"
+        try:
+            self.shared.incr(key)
+        except ValueError:
+            self.shared.set(key, 1, timeout=None)
+        with self._lock:
+            self._local.clear()
+            self._checked.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+theme_catalog = ThemeCatalogCache()
@@ -0,0 +1,241 @@
+"""Change events for ``/api/events/`` (Server-Sent Events).
+
+Saving or deleting a Note, DesktopItem or UserPreference appends a
+:class:`~pages.models.ChangeEvent` row in the same transaction (see
+``signals.py``; ``api_desktop_items_sync`` publishes its ``bulk_update``
+itself). Each process runs one :class:`ChangeFeed` task per event loop. The
+task reads rows past the newest id it has seen every ``EVENTS_POLL_INTERVAL``
+seconds, or right after a local commit, and fans them out to every open
+stream. N connected clients therefore cost one indexed query per interval,
+not N full-list refetches, and a write made through any worker reaches all
+of them.
+
+A client that reconnects with ``Last-Event-ID`` first gets the events it
+missed. If they have been pruned (see :func:`prune`), it gets a ``reset``
+event and should refetch its lists.
+
+With ``EVENTS_ENABLED`` off (a WSGI-only deployment, where nothing could
+stream them) no rows are written and ``/api/events/`` answers 204.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# model label -> (resource name, fields sent with an upsert)
+RESOURCES = {
+    "pages.Note": ("notes", ("id", "title", "is_deleted", "created_at", "updated_at")),
+    "pages.DesktopItem": ("desktop-items", ("id", "label", "item_type", "pos_x", "pos_y", "updated_at")),
+    "pages.UserPreference": ("preferences", ("id", "theme", "wallpaper", "sound_enabled", "volume")),
+}
+
+# Rows fetched per poll, and the most a reconnecting client is replayed before a reset.
+BATCH = 200
+BACKLOG_LIMIT = 1000
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def enabled() -> bool:
+    return _setting("EVENTS_ENABLED", True)
+
+
+def _row(instance) -> dict:
+    _, fields = RESOURCES[instance._meta.label]
+    return {name: getattr(instance, name) for name in fields}
+
+
+def _event(instance, action: str) -> ChangeEvent:
+    resource, _ = RESOURCES[instance._meta.label]
+    return ChangeEvent(resource=resource, action=action, object_id=instance.pk,
+                       data=_row(instance) if action == "upsert" else None)
+
+
+def prune(now=None) -> int:
+    """Keep the newest ``EVENTS_RETAIN`` rows younger than ``EVENTS_MAX_AGE`` seconds; returns rows deleted."""
+    now = now or timezone.now()
+    deleted = 0
+    max_age = _setting("EVENTS_MAX_AGE", 24 * 3600)
+    if max_age:
+        deleted += ChangeEvent.objects.filter(created_at__lt=now - timedelta(seconds=max_age)).delete()[0]
+    retain = _setting("EVENTS_RETAIN", 1000)
+    if retain:
+        boundary = ChangeEvent.objects.order_by("-id").values_list("id", flat=True)[retain:retain + 1].first()
+        if boundary:
+            deleted += ChangeEvent.objects.filter(id__lte=boundary).delete()[0]
+    return deleted
+
+
+_last_prune = {"at": float("-inf")}
+
+
+def _published() -> None:
+    # Prune at most every EVENTS_PRUNE_INTERVAL seconds per process, whatever ids were written.
+    now = time.monotonic()
+    if now - _last_prune["at"] >= _setting("EVENTS_PRUNE_INTERVAL", 60):
+        _last_prune["at"] = now
+        prune()
+    transaction.on_commit(feed.wake)
+
+
+def publish(instance, action: str = "upsert") -> None:
+    """Record that ``instance`` was saved (``upsert``) or deleted (``delete``)."""
+    if not enabled():
+        return
+    _event(instance, action).save()
+    _published()
+
+
+def publish_many(instances, action: str = "upsert") -> None:
+    """:func:`publish` for rows written with ``bulk_update``, in one INSERT."""
+    if not enabled():
+        return
+    if ChangeEvent.objects.bulk_create([_event(instance, action) for instance in instances]):
+        _published()
+
+
+def format_event(event: ChangeEvent) -> bytes:
+    payload = {"resource": event.resource, "action": event.action, "id": event.object_id, "data": event.data}
+    return f"id: {event.id}\nevent: change\ndata: {json.dumps(payload, cls=DjangoJSONEncoder)}\n\n".encode("utf-8")
+
+
+def _control(name: str, event_id: int) -> bytes:
+    return f"id: {event_id}\nevent: {name}\ndata: {{}}\n\n".encode("utf-8")
+
+
+class Subscription:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=_setting("EVENTS_QUEUE_SIZE", 1000))
+        self.overflowed = False
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind refetches instead of buffering without bound.
+            self.overflowed = True
+
+
+class ChangeFeed:
+    """One poller per event loop, shared by every stream in the process."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._start_lock = None
+        self._cursor = 0
+
+    async def _head(self) -> int:
+        return await ChangeEvent.objects.order_by("-id").values_list("id", flat=True).afirst() or 0
+
+    async def subscribe(self):
+        """Register a subscription; returns it with the id it is guaranteed to see events after."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new loop (tests, or a restarted server thread): objects of the old one are unusable.
+            self._loop, self._task = loop, None
+            self._wake, self._start_lock = asyncio.Event(), asyncio.Lock()
+        subscription = Subscription()
+        async with self._start_lock:
+            self._subscriptions.add(subscription)
+            if self._task is None or self._task.done():
+                self._cursor = await self._head()
+                self._task = loop.create_task(self._poll())
+            # The poller only advances the cursor after handing rows to every
+            # registered subscription, so nothing past this id can be missed.
+            return subscription, self._cursor
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def wake(self) -> None:
+        """Poll now instead of at the next interval; safe to call from any thread."""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    async def _poll(self) -> None:
+        interval = _setting("EVENTS_POLL_INTERVAL", 0.5)
+        while self._subscriptions:
+            # Cleared before reading, so a commit during the query triggers another read.
+            self._wake.clear()
+            try:
+                rows = [event async for event in ChangeEvent.objects.filter(id__gt=self._cursor).order_by("id")[:BATCH]]
+            except Exception:
+                logger.exception("Reading change events failed")
+                rows = []
+            for event in rows:
+                for subscription in list(self._subscriptions):
+                    subscription.put(event)
+                self._cursor = event.id
+            if len(rows) == BATCH:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+feed = ChangeFeed()
+
+
+async def _backlog(after: int, cursor: int):
+    """Events in (after, cursor], or None when some of them are gone."""
+    if after > cursor:
+        # The log is younger than the client's id: the database was replaced.
+        return None
+    if after == cursor:
+        return []
+    oldest = await ChangeEvent.objects.order_by("id").values_list("id", flat=True).afirst()
+    if oldest is None or oldest > after + 1 or cursor - after > BACKLOG_LIMIT:
+        return None
+    return [event async for event in ChangeEvent.objects.filter(id__gt=after, id__lte=cursor).order_by("id")]
+
+
+async def stream(last_event_id=None):
+    """Async iterator of SSE frames, resuming after ``last_event_id`` when given."""
+    subscription, cursor = await feed.subscribe()
+    try:
+        yield f"retry: {_setting('EVENTS_RETRY_MS', 3000)}\n\n".encode("utf-8")
+        try:
+            after = int(last_event_id)
+        except (TypeError, ValueError):
+            after = None
+        backlog = [] if after is None else await _backlog(after, cursor)
+        if backlog is None:
+            yield _control("reset", cursor)
+        else:
+            for event in backlog:
+                yield format_event(event)
+            yield _control("ready", cursor)
+        last = cursor
+        keepalive = _setting("EVENTS_KEEPALIVE", 15.0)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                # Comments keep proxies from timing out an idle stream.
+                yield b": keepalive\n\n"
+                continue
+            if subscription.overflowed:
+                yield _control("reset", event.id)
+                return
+            if event.id > last:
+                last = event.id
+                yield format_event(event)
+    finally:
+        feed.unsubscribe(subscription)
@@ -0,0 +1,143 @@
+"""Resized WebP/AVIF/JPEG derivatives for uploaded images.
+
+When a model with a registered image field is saved with a new file, the
+derivatives are generated in a small thread pool after the transaction
+commits, so uploads never wait on Pillow. Files are written next to the
+original as ``<stem>.<sha>.<width>w.<ext>`` (the hash is of the original's
+bytes), and the result is recorded in the model's ``*_variants`` JSON field
+for templates to turn into ``srcset`` (see ``pages.templatetags.media_tags``).
+"""
+import hashlib
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from PIL import Image, ImageOps, features
+
+from . import render_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (320, 640, 1280)
+# Most efficient first: <picture> picks the first <source> the browser supports.
+FORMATS = (
+    ("avif", "image/avif", {"quality": 55}),
+    ("webp", "image/webp", {"quality": 80, "method": 6}),
+    ("jpeg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+# (model label, image field, variants field) handled by the pipeline.
+IMAGE_FIELDS = (
+    ("showcase.Project", "image", "image_variants"),
+    ("pages.Profile", "avatar", "avatar_variants"),
+)
+
+_executor = None
+
+
+def widths():
+    return tuple(getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", DEFAULT_WIDTHS))
+
+
+def supported_formats():
+    available = {"avif": features.check("avif"), "webp": features.check("webp"), "jpeg": True}
+    return [fmt for fmt in FORMATS if available[fmt[0]]]
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "IMAGE_DERIVATIVE_WORKERS", 2),
+            thread_name_prefix="image-derivatives",
+        )
+    return _executor
+
+
+def build_variants(field_file) -> dict:
+    """Write every derivative of ``field_file``; return the variants manifest."""
+    storage = field_file.storage
+    with field_file.open("rb") as fh:
+        data = fh.read()
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, _ = posixpath.splitext(field_file.name)
+
+    with Image.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        base = img.convert("RGBA" if has_alpha else "RGB")
+        # Never upscale; the original width stands in for sizes larger than it.
+        targets = sorted({min(w, base.width) for w in widths()})
+
+        manifest = {
+            "source": field_file.name,
+            "hash": digest,
+            "width": base.width,
+            "widths": list(widths()),
+            "formats": {},
+        }
+        for ext, mime, options in supported_formats():
+            entries = []
+            for width in targets:
+                name = f"{stem}.{digest}.{width}w.{ext}"
+                if not storage.exists(name):
+                    height = max(1, round(base.height * width / base.width))
+                    frame = base.resize((width, height), Image.LANCZOS) if width != base.width else base
+                    if ext == "jpeg" and frame.mode == "RGBA":
+                        frame = _flatten(frame)
+                    buf = io.BytesIO()
+                    frame.save(buf, format=ext.upper(), **options)
+                    storage.save(name, ContentFile(buf.getvalue()))
+                entries.append({"name": name, "width": width})
+            manifest["formats"][ext] = {"type": mime, "files": entries}
+    return manifest
+
+
+def _flatten(image):
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def needs_variants(instance, image_field: str, variants_field: str) -> bool:
+    field_file = getattr(instance, image_field)
+    variants = getattr(instance, variants_field) or {}
+    if not field_file:
+        return bool(variants)
+    return variants.get("source") != field_file.name or variants.get("widths") != list(widths())
+
+
+def generate_for(model, pk, image_field: str, variants_field: str) -> None:
+    """Worker entry point: (re)build derivatives for one row and record them."""
+    try:
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            return
+        field_file = getattr(instance, image_field)
+        manifest = build_variants(field_file) if field_file else {}
+        # update() skips post_save, so this does not re-trigger the pipeline.
+        model.objects.filter(pk=pk).update(**{variants_field: manifest})
+        render_cache.bump(model._meta.label)
+    except Exception:
+        logger.exception("Generating image derivatives for %s #%s failed", model._meta.label, pk)
+
+
+def _run_in_worker(*args) -> None:
+    try:
+        generate_for(*args)
+    finally:
+        # Pool threads outlive requests; don't leave their connections behind.
+        connection.close()
+
+
+def schedule(instance, image_field: str, variants_field: str) -> None:
+    """Queue derivative generation once the surrounding transaction commits."""
+    model, pk = type(instance), instance.pk
+    if getattr(settings, "IMAGE_DERIVATIVES_SYNC", False):
+        transaction.on_commit(lambda: generate_for(model, pk, image_field, variants_field))
+    else:
+        transaction.on_commit(lambda: executor().submit(_run_in_worker, model, pk, image_field, variants_field))
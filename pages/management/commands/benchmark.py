@@ -0,0 +1,251 @@
+import asyncio
+import http.client
+import json
+import os
+import platform
+import tempfile
+import threading
+from io import StringIO
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from pages.benchmarking import (
+    ameasure_concurrent, asgi_sender, compare, measure, measure_concurrent, wsgi_sender,
+)
+from pages.testing import BUDGET_SETTINGS
+from showcase.models import Project
+
+# benchmark name -> (route name, URL kwargs needed)
+BENCHMARKS = {
+    'home': ('pages:home', None),
+    'about': ('pages:about', None),
+    'projects': ('showcase:projects', None),
+    'project_detail': ('showcase:project_detail', 'pk'),
+    'api_bootstrap': ('pages:api_bootstrap', None),
+    'api_notes': ('pages:api_notes', None),
+    'api_desktop_items': ('pages:api_desktop_items', None),
+    'api_run_history': ('pages:api_run_history', None),
+    'api_themes': ('pages:api_themes', None),
+}
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'baseline.json'
+
+SERVERS = ('wsgi', 'asgi')
+
+
+def _paths(names):
+    first_project = Project.objects.order_by('pk').values_list('pk', flat=True).first()
+    paths = {}
+    for name in names:
+        route, kwarg = BENCHMARKS[name]
+        if kwarg and first_project is None:
+            continue
+        paths[name] = reverse(route, kwargs={kwarg: first_project} if kwarg else None)
+    return paths
+
+
+class Command(BaseCommand):
+    help = ('Benchmark page renders and the JSON API at several data scales, '
+            'optionally saving a baseline or comparing against one')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000,10000',
+                            help='Comma-separated populate_db --scale sizes to benchmark at')
+        parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per benchmark')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests before measuring')
+        parser.add_argument('--seed', type=int, default=0, help='populate_db seed')
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Requests kept in flight with --servers or --base-url (default 1)')
+        parser.add_argument('--servers',
+                            help='Comma-separated wsgi,asgi: drive the WSGI and/or ASGI application directly '
+                                 'instead of the test client, as gunicorn/uvicorn would, and compare throughput')
+        parser.add_argument('--page-cache', action='store_true',
+                            help='Leave the rendered-page cache on (default: measure real renders)')
+        parser.add_argument('--base-url',
+                            help='Benchmark a running server (e.g. gunicorn) at this URL instead of the '
+                                 'in-process test client; its database is used as-is and scales are ignored')
+        parser.add_argument('--save', nargs='?', const=str(DEFAULT_BASELINE), metavar='PATH',
+                            help=f'Write the results as a baseline (default {DEFAULT_BASELINE.relative_to(settings.BASE_DIR)})')
+        parser.add_argument('--compare', nargs='?', const=str(DEFAULT_BASELINE), metavar='PATH',
+                            help='Compare against a baseline and fail on regressions')
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Relative change treated as a regression in --compare (default 0.15)')
+        parser.add_argument('--min-ms', type=float, default=1.0,
+                            help='Ignore timing changes smaller than this many ms per request (default 1.0)')
+
+    def handle(self, *args, **options):
+        names = options['only'] or list(BENCHMARKS)
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+        servers = [s.strip() for s in (options['servers'] or '').split(',') if s.strip()]
+        unknown = set(servers) - set(SERVERS)
+        if unknown:
+            raise CommandError(f'Unknown --servers: {", ".join(sorted(unknown))} (choose from {", ".join(SERVERS)})')
+        options['servers'] = servers
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as fh:
+                    baseline = json.load(fh)['results']
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f'Cannot read baseline {options["compare"]}: {exc}')
+
+        if options['base_url']:
+            results = {'live': self.run_live(options['base_url'], names, options)}
+        else:
+            try:
+                scales = sorted({int(s) for s in options['scales'].split(',') if s.strip()})
+            except ValueError:
+                raise CommandError('--scales must be a comma-separated list of integers')
+            results = self.run_in_process(scales, names, options)
+
+        if options['save']:
+            self.save(options['save'], results, options)
+        if baseline is not None:
+            self.report_comparison(baseline, results, options['threshold'], options['min_ms'])
+
+    def run_in_process(self, scales, names, options):
+        """Seed a throwaway database scale by scale and benchmark through the test client."""
+        results = {}
+        overrides = dict(BUDGET_SETTINGS, PAGE_CACHE_ENABLED=options['page_cache'])
+        test_settings = connection.settings_dict['TEST']
+        old_name, old_test_name = connection.settings_dict['NAME'], test_settings.get('NAME')
+        setup_test_environment()
+        with tempfile.TemporaryDirectory(prefix='pixel-bench-') as tmp:
+            # A file database, so the configured pragmas (WAL, mmap) apply as in production.
+            test_settings['NAME'] = os.path.join(tmp, 'bench.sqlite3')
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                with override_settings(**overrides):
+                    client, seeded = Client(), 0
+                    apps = {'wsgi': get_wsgi_application(), 'asgi': get_asgi_application()}
+                    for index, scale in enumerate(scales):
+                        # Grow the tables to the next scale; a fresh seed per step keeps it deterministic.
+                        call_command('populate_db', scale=scale - seeded, seed=options['seed'] + index,
+                                     stdout=StringIO())
+                        seeded = scale
+                        self.stdout.write(f'scale {scale}:')
+                        results[str(scale)] = {}
+                        for name, path in _paths(names).items():
+                            if not options['servers']:
+                                results[str(scale)][name] = self.run_one(name, lambda p=path: client.get(p), options)
+                                continue
+                            for server in options['servers']:
+                                results[str(scale)][f'{name}@{server}'] = self.run_server(
+                                    name, server, apps[server], path, options)
+                        if len(options['servers']) > 1:
+                            self.report_servers(results[str(scale)])
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                test_settings['NAME'] = old_test_name
+                teardown_test_environment()
+        return results
+
+    def run_live(self, base_url, names, options):
+        parts = urlsplit(base_url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        prefix = parts.path.rstrip('/')
+        # One keep-alive connection per sending thread.
+        local, opened = threading.local(), []
+
+        def get(path):
+            conn = getattr(local, 'conn', None)
+            if conn is None:
+                conn = local.conn = conn_class(parts.netloc, timeout=30)
+                opened.append(conn)
+            conn.request('GET', prefix + path, headers={'Accept-Encoding': 'identity'})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                raise CommandError(f'GET {path}: HTTP {response.status}')
+
+        self.stdout.write(f'live server {base_url}:')
+        try:
+            return {
+                name: self.run_one(name, lambda p=path: get(p), dict(options, live=True))
+                for name, path in _paths(names).items()
+            }
+        finally:
+            for conn in opened:
+                conn.close()
+
+    def run_one(self, name, send, options):
+        if options.get('live') and options['concurrency'] > 1:
+            result = measure_concurrent(send, requests=options['requests'], warmup=options['warmup'],
+                                        concurrency=options['concurrency'])
+        else:
+            # Allocations are only observable in-process.
+            result = measure(send, requests=options['requests'], warmup=options['warmup'],
+                             alloc_runs=None if options.get('live') else 5)
+        return self.report(name, result)
+
+    def run_server(self, name, server, app, path, options):
+        """Benchmark ``path`` through the WSGI or ASGI application with concurrent requests."""
+        kwargs = dict(requests=options['requests'], warmup=options['warmup'], concurrency=options['concurrency'])
+        if server == 'asgi':
+            send = asgi_sender(app, path)
+            status = asyncio.run(send())
+            run = lambda: asyncio.run(ameasure_concurrent(send, **kwargs))
+        else:
+            send = wsgi_sender(app, path)
+            status = send()
+            run = lambda: measure_concurrent(send, **kwargs)
+        if status >= 400:
+            raise CommandError(f'GET {path} ({server}): HTTP {status}')
+        result = run()
+        return self.report(f'{name}@{server}', result)
+
+    def report(self, name, result):
+        alloc = '-' if result['alloc_kib'] is None else f"{result['alloc_kib']:.0f} KiB"
+        self.stdout.write(
+            f"  {name:<24} {result['rps']:>8.0f} req/s  p50 {result['p50_ms']:>7.2f}  "
+            f"p95 {result['p95_ms']:>7.2f}  p99 {result['p99_ms']:>7.2f} ms  alloc {alloc}"
+        )
+        return result
+
+    def report_servers(self, results):
+        for key, wsgi in results.items():
+            name, _, server = key.rpartition('@')
+            asgi = results.get(f'{name}@asgi')
+            if server == 'wsgi' and asgi and wsgi['rps']:
+                self.stdout.write(f"  {name:<24} asgi/wsgi throughput {asgi['rps'] / wsgi['rps']:.2f}x")
+
+    def save(self, path, results, options):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        document = {
+            'meta': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'machine': platform.machine(),
+                'requests': options['requests'],
+                'seed': options['seed'],
+                'page_cache': options['page_cache'],
+                'concurrency': options['concurrency'],
+                'servers': options['servers'],
+            },
+            'results': results,
+        }
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(document, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        self.stdout.write(self.style.SUCCESS(f'Baseline written to {path}'))
+
+    def report_comparison(self, baseline, results, threshold, min_ms):
+        regressions = compare(baseline, results, threshold, min_ms)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'No regressions beyond {threshold:.0%} against the baseline'))
+            return
+        for scale, name, metric, old, new, change in regressions:
+            self.stdout.write(self.style.ERROR(f'scale {scale} {name}: {metric} {old} -> {new} ({change:+.0%})'))
+        raise CommandError(f'{len(regressions)} regression(s) beyond {threshold:.0%}')
@@ -0,0 +1,158 @@
+import gzip
+import re
+import tempfile
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponseNotFound
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from pages.benchmarking import measure
+from pages.staticfiles import WhiteNoiseMiddleware
+from pages.testing import BUDGET_SETTINGS
+
+from .benchmark_static import ACCEPT_ENCODING, HASHED_STORAGE, Command as StaticCommand, _drain, _storages
+
+SCRIPT_TYPES = ('', 'text/javascript', 'module')
+
+
+class PageResources(HTMLParser):
+    """Inline code and the static resources a page loads, by how they load.
+
+    ``blocking``: stylesheets and plain scripts, which hold up rendering or
+    parsing; ``deferred``: ``defer``/``async`` scripts, which run once the
+    document is parsed; ``preload``: fetched early, applied without blocking;
+    ``lazy``: any other static URL in the page, fetched by script on demand.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.inline = {'script': 0, 'style': 0}
+        self.roles = {}
+        self._inline = None
+        self._noscript = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'noscript':
+            self._noscript = True
+        elif tag == 'script':
+            if attrs.get('src'):
+                deferred = 'defer' in attrs or 'async' in attrs or attrs.get('type') == 'module'
+                self.roles.setdefault(attrs['src'], 'deferred' if deferred else 'blocking')
+            elif (attrs.get('type') or '') in SCRIPT_TYPES:
+                self._inline = 'script'
+        elif tag == 'style':
+            self._inline = 'style'
+        elif tag == 'link' and attrs.get('href') and not self._noscript:
+            rel = (attrs.get('rel') or '').lower()
+            if rel == 'stylesheet' and 'disabled' not in attrs:
+                self.roles.setdefault(attrs['href'], 'blocking')
+            elif rel in ('preload', 'modulepreload'):
+                self.roles.setdefault(attrs['href'], 'preload')
+
+    def handle_endtag(self, tag):
+        if tag == 'noscript':
+            self._noscript = False
+        elif tag == self._inline:
+            self._inline = None
+
+    def handle_data(self, data):
+        if self._inline:
+            self.inline[self._inline] += len(data.encode('utf-8'))
+
+
+class Command(BaseCommand):
+    help = ('Measure what the home page costs a visitor: HTML bytes, inline code, the static files it blocks '
+            'on, defers or loads on demand, and a modelled time-to-interactive for a cold and a repeat visit')
+
+    def add_arguments(self, parser):
+        # Defaults are Lighthouse's simulated mobile network.
+        parser.add_argument('--rtt-ms', type=float, default=150.0, help='Round-trip time of the modelled network')
+        parser.add_argument('--kbps', type=float, default=1638.4, help='Downlink of the modelled network, Kbit/s')
+        parser.add_argument('--requests', type=int, default=50, help='Timed renders of the page')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed renders before measuring')
+        parser.add_argument('--bundles', action='store_true',
+                            help='Link the bundles build_assets wrote, as production does, instead of the sources')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            bundles = options['bundles'] or getattr(settings, 'ASSET_BUNDLES_ENABLED', False)
+            with tempfile.TemporaryDirectory() as root, \
+                    override_settings(**BUDGET_SETTINGS, ASSET_BUNDLES_ENABLED=bundles):
+                StaticCommand().collect(root)
+                with override_settings(STATIC_ROOT=root, STORAGES=_storages(HASHED_STORAGE), DEBUG=False):
+                    row = self.run_page(options)
+        finally:
+            teardown_test_environment()
+        self.report(row, options)
+
+    def run_page(self, options) -> dict:
+        client, url = Client(), reverse('pages:home')
+        html = client.get(url).content
+        parser = PageResources()
+        parser.feed(html.decode('utf-8'))
+        prefix = re.escape(settings.STATIC_URL)
+        for found in re.findall(rf'["\']({prefix}[^"\'?#]+)', html.decode('utf-8')):
+            parser.roles.setdefault(found, 'lazy')
+
+        factory = RequestFactory()
+        middleware = WhiteNoiseMiddleware(lambda request: HttpResponseNotFound())
+        files = {}
+        for src, role in parser.roles.items():
+            if not src.startswith(settings.STATIC_URL):
+                continue  # third-party (fonts): the same before and after
+            response = middleware(factory.get(src, HTTP_ACCEPT_ENCODING=ACCEPT_ENCODING))
+            immutable = 'immutable' in response.get('Cache-Control', '')
+            files[src] = {'role': role, 'bytes': _drain(response), 'immutable': immutable}
+
+        render = measure(lambda: client.get(url), requests=options['requests'], warmup=options['warmup'],
+                         alloc_runs=None)
+        return {
+            'html_bytes': len(html),
+            'html_gzip_bytes': len(gzip.compress(html, mtime=0)),
+            'inline': parser.inline,
+            'files': files,
+            'render_ms': render['p50_ms'],
+        }
+
+    def report(self, row, options) -> None:
+        rtt, kbps = options['rtt_ms'], options['kbps']
+
+        def transfer(size):
+            return size * 8 / kbps  # ms
+
+        def total(*roles, cached=False):
+            return sum(f['bytes'] for f in row['files'].values()
+                       if f['role'] in roles and not (cached and f['immutable']))
+
+        needed = [f for f in row['files'].values() if f['role'] in ('blocking', 'deferred')]
+        document = row['render_ms'] + rtt + transfer(row['html_gzip_bytes'])
+        # Files needed before the page is interactive are fetched in parallel
+        # once the HTML names them: one more round trip plus their bytes.
+        cold = document + (rtt + transfer(total('blocking', 'deferred')) if needed else 0)
+        # Immutable files come from cache; anything else is revalidated.
+        stale = [f for f in needed if not f['immutable']]
+        repeat = document + (rtt + transfer(total('blocking', 'deferred', cached=True)) if stale else 0)
+
+        kib = lambda size: f'{size / 1024:.1f} KiB'  # noqa: E731
+        for label, value in (
+            ('HTML', f"{kib(row['html_bytes'])} ({kib(row['html_gzip_bytes'])} gzipped)"),
+            ('inline script', kib(row['inline']['script'])),
+            ('inline style', kib(row['inline']['style'])),
+        ):
+            self.stdout.write(f'{label:<20} {value}')
+        for role in ('blocking', 'deferred', 'preload', 'lazy'):
+            names = [src for src, f in row['files'].items() if f['role'] == role]
+            self.stdout.write(f'{role + " files":<20} {len(names):>2}  {kib(total(role))} on the wire')
+        self.stdout.write(f"{'server render p50':<20} {row['render_ms']:.2f} ms")
+        self.stdout.write(f"{'TTI cold visit':<20} {cold:.0f} ms")
+        self.stdout.write(f"{'TTI repeat visit':<20} {repeat:.0f} ms")
+        self.stdout.write(f'TTI is modelled for a {rtt:g} ms RTT, {kbps:g} Kbit/s link: render, one round trip and '
+                          'the gzipped HTML, then one round trip and the bytes of every blocking or deferred file '
+                          'not already cached. Script parse time is not modelled; in a browser, the '
+                          '"desktop-interactive" performance mark gives the real figure.')
@@ -0,0 +1,136 @@
+import re
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.staticfiles.views import serve
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.http import HttpResponseNotFound
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from pages.benchmarking import measure
+from pages.staticfiles import WhiteNoiseMiddleware
+from pages.testing import BUDGET_SETTINGS
+
+PAGES = (
+    'pages:home',
+    'pages:about',
+    'pages:projects',
+    'pages:notepad',
+    'pages:calculator',
+    'pages:mycomputer',
+    'pages:recycle',
+)
+
+PLAIN_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+HASHED_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+ACCEPT_ENCODING = 'br, gzip'
+
+
+def _storages(backend: str) -> dict:
+    return dict(settings.STORAGES, staticfiles={'BACKEND': backend})
+
+
+def _drain(response) -> int:
+    """Read a (streaming) response to the end, as a client would, and return its body size."""
+    try:
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+    finally:
+        response.close()
+
+
+class Command(BaseCommand):
+    help = ('Compare the bytes, requests and latency a cold and a repeat visit spend on static assets, '
+            'served as plain files (runserver-style) versus hashed and precompressed through WhiteNoise')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', nargs='+', choices=PAGES, help='Only these route names')
+        parser.add_argument('--requests', type=int, default=50, help='Timed visits per page and pipeline')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed visits before measuring')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with tempfile.TemporaryDirectory() as root, override_settings(**BUDGET_SETTINGS):
+                self.collect(root)
+                rows = [self.run_page(route, root, options) for route in options['pages'] or PAGES]
+        finally:
+            teardown_test_environment()
+        self.report(rows)
+
+    def collect(self, root: str) -> None:
+        with override_settings(STATIC_ROOT=root, STORAGES=_storages(HASHED_STORAGE)):
+            call_command('collectstatic', interactive=False, verbosity=0, stdout=StringIO())
+
+    def assets(self, route: str) -> list:
+        """Local static URLs referenced by the rendered page, in document order."""
+        html = Client().get(reverse(route)).content.decode('utf-8')
+        prefix = re.escape(settings.STATIC_URL)
+        urls = re.findall(rf'(?:href|src)=["\']({prefix}[^"\'?#]+)', html)
+        return list(dict.fromkeys(urls))
+
+    def run_page(self, route: str, root: str, options) -> dict:
+        factory = RequestFactory()
+        measured = {'requests': options['requests'], 'warmup': options['warmup'], 'alloc_runs': None}
+
+        # Before: each asset as-is through django.contrib.staticfiles, with
+        # Last-Modified only, so a repeat visit revalidates every file.
+        plain = self.assets(route)
+
+        def plain_visit():
+            total = 0
+            for url in plain:
+                path = url[len(settings.STATIC_URL):]
+                total += _drain(serve(factory.get(url, HTTP_ACCEPT_ENCODING=ACCEPT_ENCODING), path, insecure=True))
+            return total
+
+        # After: hashed names from the manifest, the smallest precompressed
+        # variant, and immutable caching, so a repeat visit sends nothing.
+        with override_settings(STATIC_ROOT=root, STORAGES=_storages(HASHED_STORAGE), DEBUG=False):
+            hashed = self.assets(route)
+            middleware = WhiteNoiseMiddleware(lambda request: HttpResponseNotFound())
+
+        immutable = []
+
+        def hashed_visit():
+            total = 0
+            immutable.clear()
+            for url in hashed:
+                response = middleware(factory.get(url, HTTP_ACCEPT_ENCODING=ACCEPT_ENCODING))
+                immutable.append('immutable' in response.get('Cache-Control', ''))
+                total += _drain(response)
+            return total
+
+        before_bytes, after_bytes = plain_visit(), hashed_visit()
+        return {
+            'page': route.split(':', 1)[1],
+            'assets': len(plain),
+            'before_kib': before_bytes / 1024,
+            'after_kib': after_bytes / 1024,
+            'before_ms': measure(plain_visit, **measured)['p50_ms'],
+            'after_ms': measure(hashed_visit, **measured)['p50_ms'],
+            # Conditional requests a repeat visit still makes.
+            'before_repeat': len(plain),
+            'after_repeat': immutable.count(False),
+        }
+
+    def report(self, rows) -> None:
+        header = (f"{'page':<12} {'assets':>6} {'before KiB':>11} {'after KiB':>10} {'saved':>7} "
+                  f"{'before ms':>10} {'after ms':>9} {'repeat reqs':>12}")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows:
+            saved = 1 - row['after_kib'] / row['before_kib'] if row['before_kib'] else 0.0
+            self.stdout.write(
+                f"{row['page']:<12} {row['assets']:>6} {row['before_kib']:>11.1f} {row['after_kib']:>10.1f} "
+                f"{saved:>7.0%} {row['before_ms']:>10.3f} {row['after_ms']:>9.3f} "
+                f"{row['before_repeat']:>5} -> {row['after_repeat']:<3}"
+            )
+        self.stdout.write('Latency is the p50 time to serve all of a page\'s assets back to back in-process; '
+                          'repeat reqs counts the requests a returning visitor still sends for them.')
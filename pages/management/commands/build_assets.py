@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages import assets
+
+
+class Command(BaseCommand):
+    help = ('Minify, prune and bundle the per-page CSS/JS listed in ASSET_BUNDLES into static/dist '
+            'and report their sizes against ASSET_BUDGETS')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Directory to write into (default: ASSET_BUNDLE_DIR or static/dist)')
+        parser.add_argument('--no-prune', action='store_true', help='Keep CSS rules no template or script refers to')
+        parser.add_argument('--keep-console', action='store_true', help='Keep console.log/debug/info/trace calls')
+        parser.add_argument('--check', action='store_true', help='Fail if a bundle is over its gzipped budget')
+
+    def handle(self, *args, **options):
+        directory = Path(options['output']) if options['output'] else assets.output_dir()
+        try:
+            rows = assets.build(directory, prune=not options['no_prune'], drop_console=not options['keep_console'])
+        except FileNotFoundError as exc:
+            raise CommandError(str(exc))
+
+        header = f"{'bundle':<22} {'source':>9} {'minified':>9} {'gzip':>8} {'budget':>8}  pruned rules"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        over = []
+        for row in rows:
+            limit = row['budget']
+            status = '-' if limit is None else f'{limit:>8}'
+            if limit is not None and row['gzip_bytes'] > limit:
+                over.append(row['file'])
+                status = self.style.ERROR(f'{limit:>8}')
+            pruned = '' if row['rules'] is None else f"{row['rules_removed']}/{row['rules']}"
+            self.stdout.write(
+                f"{row['file']:<22} {row['source_bytes']:>9} {row['bytes']:>9} {row['gzip_bytes']:>8} "
+                f"{status:>8}  {pruned}"
+            )
+        source = sum(row['source_bytes'] for row in rows)
+        minified = sum(row['bytes'] for row in rows)
+        if source:
+            self.stdout.write(f'{len(rows)} file(s): {source} -> {minified} bytes ({1 - minified / source:.0%} smaller)')
+        unused = assets.unbundled()
+        if unused:
+            self.stdout.write(f"Not in any bundle: {', '.join(unused)}")
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(rows)} bundle file(s) to {directory}'))
+        if over and options['check']:
+            raise CommandError(f"Over budget: {', '.join(over)}")
@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from pages import images
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/AVIF/JPEG derivatives for Project.image and Profile.avatar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild rows whose derivatives look current')
+
+    def handle(self, *args, **options):
+        formats = ', '.join(ext for ext, _, _ in images.supported_formats())
+        self.stdout.write(f'Widths: {list(images.widths())}; formats: {formats}')
+        built = 0
+        for label, image_field, variants_field in images.IMAGE_FIELDS:
+            model = apps.get_model(label)
+            for instance in model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True}):
+                if not options['force'] and not images.needs_variants(instance, image_field, variants_field):
+                    continue
+                images.generate_for(model, instance.pk, image_field, variants_field)
+                built += 1
+                self.stdout.write(f'{label} #{instance.pk}: {getattr(instance, image_field).name}')
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {built} image(s)'))
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from pages import theme_css
+from pages.cache import theme_catalog
+from pages.models import Theme
+
+
+class Command(BaseCommand):
+    help = 'Render every Theme into a minified, content-hashed CSS file under static/themes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Directory to write into (default: THEME_CSS_DIR or static/themes)')
+        parser.add_argument('--prune', action='store_true', help='Remove bundles of themes that no longer exist')
+
+    def handle(self, *args, **options):
+        directory = Path(options['output']) if options['output'] else theme_css.output_dir()
+        built = theme_css.build_all(Theme.objects.order_by('key'), directory, prune=options['prune'])
+        for key, filename in built.items():
+            size = (directory / filename).stat().st_size
+            self.stdout.write(f'{key:<20} {filename} ({size} bytes)')
+        # The API embeds css_url, so make sure no worker keeps serving the old one.
+        theme_catalog.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Built {len(built)} theme bundle(s) in {directory}'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pages import write_behind
+
+
+class Command(BaseCommand):
+    help = ('Replay RunHistory spools left by stopped workers and apply the '
+            'RUN_HISTORY_RETENTION_DAYS / RUN_HISTORY_MAX_ROWS retention policy')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vacuum', action='store_true',
+                            help='VACUUM afterwards to return the freed pages to the filesystem')
+
+    def handle(self, *args, **options):
+        replayed = write_behind.replay_orphaned_spools()
+        self.stdout.write(f'Replayed {replayed} spooled row(s)')
+        deleted = write_behind.compact()
+        self.stdout.write(f'Deleted {deleted} row(s) past the retention policy')
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write('VACUUM done')
+        self.stdout.write(self.style.SUCCESS('RunHistory compacted'))
@@ -0,0 +1,194 @@
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template.library import SimpleNode
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.templatetags.static import StaticNode, static
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from pages import assets
+from pages.templatetags import asset_tags
+from pages.versioning import resource_version
+from showcase.models import Project
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for the .br siblings
+    brotli = None
+
+
+# route name -> (templates, {model: filter of the rows the page shows}) whose
+# content ends up in the exported page. The home page is exported without the
+# inlined bootstrap state; the desktop fetches it from /api/bootstrap/, which
+# stays on Django.
+PAGES = {
+    'pages:home': (['pages/home.html'], {}),
+    'pages:about': (['pages/about.html'], {
+        'showcase.Skill': {}, 'showcase.Education': {}, 'pages.Profile': {}, 'pages.SocialLink': {'visible': True},
+    }),
+    'pages:projects': (['showcase/projects.html'], {'showcase.Project': {}}),
+    'pages:notepad': (['pages/notepad.html'], {}),
+    'pages:calculator': (['pages/calculator.html'], {}),
+    'pages:mycomputer': (['pages/mycomputer.html'], {}),
+    'pages:recycle': (['pages/recycle.html'], {'pages.Note': {'is_deleted': True}}),
+}
+DETAIL_TEMPLATES = ['showcase/project_detail.html']
+
+STATE_FILE = '.export-state.json'
+
+
+def model_fingerprint(label: str, filters=None) -> str:
+    """Version of the rows of ``label`` matching ``filters``: their count and newest ``updated_at``.
+
+    One aggregate query; an edit bumps ``updated_at`` and an insert or delete
+    changes the count, so the page is re-rendered without reading its rows.
+    """
+    model = apps.get_model(label)
+    return resource_version(label, model.objects.filter(**(filters or {}))).token
+
+
+def _literal(expression):
+    """The value of a quoted, unfiltered tag argument; None for anything resolved at render time."""
+    return expression.var if isinstance(expression.var, str) and not expression.filters else None
+
+
+def template_dependencies(name: str, seen=None) -> list:
+    """``name`` and every template it extends or includes by a literal name, each once."""
+    seen = seen if seen is not None else set()
+    if name in seen:
+        return []
+    seen.add(name)
+    template = get_template(name).template
+    found = [template]
+    nodes = template.nodelist.get_nodes_by_type(ExtendsNode) + template.nodelist.get_nodes_by_type(IncludeNode)
+    for node in nodes:
+        parent = _literal(node.parent_name if isinstance(node, ExtendsNode) else node.template)
+        if parent:
+            found += template_dependencies(parent, seen)
+    return found
+
+
+def static_references(template) -> list:
+    """``(static path, URL)`` of each file ``template`` links with {% static %} or the asset bundle tags."""
+    refs = []
+    for node in template.nodelist.get_nodes_by_type(StaticNode):
+        path = _literal(node.path)
+        if path:
+            refs.append((path, static(path)))
+    for node in template.nodelist.get_nodes_by_type(SimpleNode):
+        if node.func is asset_tags.asset_bundle and len(node.args) >= 2:
+            bundles = [(_literal(node.args[0]), _literal(node.args[1]))]
+        elif node.func is asset_tags.asset_bundle_urls:
+            kind = _literal(node.kwargs['kind']) if 'kind' in node.kwargs else 'js'
+            bundles = [(_literal(arg), kind) for arg in node.args]
+        else:
+            continue
+        for name, kind in bundles:
+            if not (name and kind):
+                continue
+            # The URLs the tag renders (the built bundle's, or its sources'), and every source.
+            paths = list(assets.bundles().get(name, {}).get(kind) or [])
+            bundle = assets.bundle_file(name, kind)
+            if bundle:
+                paths.append(bundle)
+            refs += [(path, '') for path in paths] + [('', url) for url in asset_tags._urls(name, kind)]
+    return refs
+
+
+def template_fingerprint(name: str) -> str:
+    """Hash of the template, everything it extends or includes, and the static files they link."""
+    digest = hashlib.sha1()
+    for template in template_dependencies(name):
+        digest.update(Path(template.origin.name).read_bytes())
+        for path, url in static_references(template):
+            digest.update(f'{path}|{url}'.encode('utf-8'))
+            found = finders.find(path) if path else None
+            if found:
+                digest.update(Path(found).read_bytes())
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the read-only pages (and every project) to static HTML with .gz/.br siblings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(getattr(settings, 'STATIC_EXPORT_DIR', settings.BASE_DIR / 'export')),
+                            help='Directory to write the site into')
+        parser.add_argument('--force', action='store_true', help='Re-render every page even if its inputs are unchanged')
+        parser.add_argument('--no-compress', action='store_true', help='Skip the .gz/.br siblings')
+
+    def handle(self, *args, **options):
+        out = Path(options['output'])
+        out.mkdir(parents=True, exist_ok=True)
+        state_path = out / STATE_FILE
+        try:
+            previous = json.loads(state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            previous = {}
+        if brotli is None and not options['no_compress']:
+            self.stdout.write(self.style.WARNING('brotli is not installed; only .gz siblings will be written'))
+
+        def fingerprint(parts):
+            return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+        targets = []
+        for name, (templates, models) in PAGES.items():
+            parts = [template_fingerprint(t) for t in templates]
+            parts += [model_fingerprint(label, filters) for label, filters in models.items()]
+            targets.append((reverse(name), fingerprint(parts)))
+        detail_fp = [template_fingerprint(t) for t in DETAIL_TEMPLATES]
+        for pk, updated_at in Project.objects.order_by('pk').values_list('pk', 'updated_at').iterator():
+            path = reverse('pages:project_detail', kwargs={'pk': pk})
+            targets.append((path, fingerprint(detail_fp + [updated_at.isoformat()])))
+
+        state, written, skipped = {}, 0, 0
+        factory = RequestFactory()
+        with override_settings(DESKTOP_INLINE_BOOTSTRAP=False, PAGE_CACHE_ENABLED=False):
+            for path, fp in targets:
+                target = out / path.lstrip('/') / 'index.html'
+                state[path] = fp
+                if not options['force'] and previous.get(path) == fp and target.exists():
+                    skipped += 1
+                    continue
+                match = resolve(path)
+                response = match.func(factory.get(path), *match.args, **match.kwargs)
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f'{path}: HTTP {response.status_code}, skipped'))
+                    state.pop(path)
+                    continue
+                self._write(target, response.content, compress=not options['no_compress'])
+                written += 1
+                self.stdout.write(f'{path} -> {target.relative_to(out)} ({len(response.content)} bytes)')
+
+        # Drop pages whose route no longer exists (e.g. deleted projects).
+        for path in set(previous) - set(state):
+            for suffix in ('', '.gz', '.br'):
+                (out / path.lstrip('/') / f'index.html{suffix}').unlink(missing_ok=True)
+            self.stdout.write(f'{path} removed')
+
+        tmp = state_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, state_path)
+        self.stdout.write(self.style.SUCCESS(f'Exported {written} page(s), {skipped} unchanged, into {out}'))
+
+    def _write(self, target: Path, body: bytes, compress: bool) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+        gz, br = target.with_name(target.name + '.gz'), target.with_name(target.name + '.br')
+        if not compress:
+            gz.unlink(missing_ok=True)
+            br.unlink(missing_ok=True)
+            return
+        # mtime=0 keeps the .gz byte-identical across runs for unchanged pages
+        gz.write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            br.write_bytes(brotli.compress(body, quality=11))
@@ -0,0 +1,166 @@
+import inspect
+import json
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve, reverse
+
+from pages.sqlite_tuning import (
+    SMALL_TABLE_ROWS, SQLITE_DEFAULTS, configured_pragmas, effective_pragmas, explain_query_plan, measure_throughput,
+    table_rows, table_scans,
+)
+from showcase.models import Project
+
+# URL namespaces whose GET views are checked.
+NAMESPACES = ('pages', 'showcase')
+# Keyset-paginated APIs: a second request follows ``next_cursor`` so the
+# cursor predicate gets its plan checked too.
+PAGINATED = ('pages:api_run_history', 'pages:api_notes')
+
+
+def allows_get(view) -> bool:
+    """Whether ``view`` answers GET; False if ``require_http_methods`` leaves it out."""
+    while inspect.isfunction(view):
+        # require_http_methods (and require_POST/require_GET) keep the list in the wrapper's closure.
+        methods = inspect.getclosurevars(view).nonlocals.get('request_method_list')
+        if methods is not None:
+            return 'GET' in methods
+        view = getattr(view, '__wrapped__', None)
+    return True
+
+
+def view_routes():
+    """Path of every routable GET page, with the first project for detail routes."""
+    first_project = Project.objects.order_by('pk').values_list('pk', flat=True).first()
+    routes = []
+    for namespace in NAMESPACES:
+        resolver = get_resolver().namespace_dict[namespace][1]
+        for name, entries in resolver.reverse_dict.items():
+            if not isinstance(name, str):
+                continue
+            params = entries[0][0][1]
+            if not params:
+                path = reverse(f'{namespace}:{name}')
+            elif params == ['pk'] and first_project is not None:
+                path = reverse(f'{namespace}:{name}', kwargs={'pk': first_project})
+            else:
+                continue
+            # POST-only views would only answer 405.
+            if allows_get(resolve(path).func):
+                routes.append((f'{namespace}:{name}', path))
+    return sorted(routes)
+
+
+class Command(BaseCommand):
+    help = 'Refresh planner statistics and verify that no view query scans a table it filters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--benchmark', action='store_true',
+                            help='Measure read/write throughput with SQLite defaults vs. the configured pragmas')
+        parser.add_argument('--writes', type=int, default=500, help='Write transactions per benchmark run')
+        parser.add_argument('--reads', type=int, default=5000, help='Point reads per benchmark run')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every captured query')
+        parser.add_argument('--min-rows', type=int, default=SMALL_TABLE_ROWS,
+                            help='Ignore scans of tables with fewer rows than this, which SQLite reads whole '
+                                 f'whatever the indexes (default {SMALL_TABLE_ROWS})')
+
+    def report_pragmas(self):
+        self.stdout.write('Effective connection pragmas:')
+        configured = configured_pragmas(settings)
+        for name, value in effective_pragmas(connection).items():
+            wanted = configured.get(name)
+            note = '' if wanted is None else f' (configured: {wanted})'
+            self.stdout.write(f'  {name:<13} {value}{note}')
+        conn_max_age = settings.DATABASES['default'].get('CONN_MAX_AGE', 0)
+        self.stdout.write(f'  CONN_MAX_AGE  {conn_max_age}')
+
+    def report_throughput(self, writes, reads):
+        self.stdout.write(f'Throughput on a scratch database ({writes} write txns, {reads} point reads):')
+        before = measure_throughput(SQLITE_DEFAULTS, writes=writes, reads=reads)
+        after = measure_throughput(configured_pragmas(settings), writes=writes, reads=reads)
+        for label, key in (('writes/s', 'writes_per_sec'), ('reads/s', 'reads_per_sec')):
+            ratio = after[key] / before[key] if before[key] else 0
+            self.stdout.write(f'  {label:<9} defaults {before[key]:>10.0f}   tuned {after[key]:>10.0f}   x{ratio:.1f}')
+
+    def capture(self, path, query):
+        """Run the view for ``path`` and return its response and the SELECTs it ran."""
+        match = resolve(path)
+        with CaptureQueriesContext(connection) as ctx:
+            view = match.func
+            if iscoroutinefunction(view):
+                # The async ORM runs its queries on this thread, so they are still captured.
+                view = async_to_sync(view)
+            response = view(self.factory.get(path, query), *match.args, **match.kwargs)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        return response, selects
+
+    def verify_plans(self, verbose, min_rows):
+        self.factory = RequestFactory()
+        rows = table_rows(connection)
+        requests = []
+        for name, path in view_routes():
+            requests.append((name, path, {}))
+            if name in PAGINATED:
+                requests.append((name, path, {'limit': 1}))
+
+        problems, checked = [], 0
+        # The page cache would hide the queries behind a cache hit.
+        with override_settings(PAGE_CACHE_ENABLED=False):
+            while requests:
+                name, path, query = requests.pop(0)
+                response, selects = self.capture(path, query)
+                if query and 'cursor' not in query and response.status_code == 200:
+                    next_cursor = json.loads(response.content).get('next_cursor')
+                    if next_cursor:
+                        requests.insert(0, (name, path, {**query, 'cursor': next_cursor}))
+                label = f'{path}?{urlencode(query)}' if query else path
+                for sql in selects:
+                    plan = explain_query_plan(connection, sql)
+                    checked += 1
+                    scans = table_scans(sql, plan, rows, min_rows)
+                    if scans:
+                        problems.append((label, sql, plan, scans))
+                    if verbose:
+                        self.stdout.write(f'  {label}: {sql}')
+                        for line in plan:
+                            self.stdout.write(f'      {line}')
+        return checked, problems
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('optimize_db reads SQLite query plans; the default database is not SQLite')
+
+        executor = MigrationExecutor(connection)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            raise CommandError('There are unapplied migrations; run "python manage.py migrate" first '
+                               'so the declared indexes exist')
+
+        self.stdout.write('Optimizing Pixel Portfolio database...')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute('PRAGMA optimize')
+            cursor.execute('SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()')
+            size_mb = cursor.fetchone()[0] / (1024 * 1024)
+        self.stdout.write(f'Table statistics updated. Database size: {size_mb:.2f} MB')
+
+        self.report_pragmas()
+        if options['benchmark']:
+            self.report_throughput(options['writes'], options['reads'])
+
+        self.stdout.write('Checking query plans of view queries...')
+        checked, problems = self.verify_plans(options['verbose_plans'], options['min_rows'])
+        for path, sql, plan, scans in problems:
+            self.stdout.write(self.style.ERROR(f'{path}: full scan of {", ".join(scans)}'))
+            self.stdout.write(f'    {sql}')
+            for line in plan:
+                self.stdout.write(f'      {line}')
+        if problems:
+            raise CommandError(f'{len(problems)} of {checked} view queries scan a table they filter; '
+                               'declare an index in the model\'s Meta.indexes')
+        self.stdout.write(self.style.SUCCESS(f'All {checked} view queries use an index or read their table whole'))
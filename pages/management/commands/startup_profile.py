@@ -0,0 +1,123 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pages import startup
+
+
+def _project_packages() -> set:
+    base = Path(settings.BASE_DIR).resolve()
+    names = {config.name.split('.', 1)[0] for config in apps.get_app_configs()
+             if base in Path(config.path).resolve().parents}
+    names.add(settings.ROOT_URLCONF.split('.', 1)[0])
+    return names
+
+
+class Command(BaseCommand):
+    help = ('Time how a fresh worker process starts: settings, app setup and ready(), the WSGI application, '
+            'URLconf resolution and the first request, with the slowest imports ranked and the ones the '
+            "project's modules could defer")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes to time; the median is reported')
+        parser.add_argument('--path', default='/', help='URL of the first request (default /)')
+        parser.add_argument('--warm', action='store_true',
+                            help='Run pages.warmup before the first request, as gunicorn.conf.py does')
+        parser.add_argument('--top', type=int, default=15, help='Imports to list in the ranking')
+        parser.add_argument('--defer-ms', type=float, default=5.0,
+                            help='Report module-level imports by project code costing at least this much')
+        parser.add_argument('--budget-ms', type=float,
+                            help='Startup budget up to the first response (default STARTUP_BUDGET_MS)')
+        parser.add_argument('--check', action='store_true', help='Fail if startup is over the budget')
+        parser.add_argument('--save', metavar='PATH', help='Also write the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        results = [self.spawn(options)[0] for _ in range(options['runs'])]
+        # One more run under -X importtime, which slows imports down; it only ranks them.
+        _, stderr = self.spawn(options, importtime=True)
+        entries = startup.parse_importtime(stderr)
+
+        phases = {name: statistics.median(r['phases'][name] for r in results) for name in results[0]['phases']}
+        ready = {label: statistics.median(r['ready'].get(label, 0.0) for r in results) for label in results[0]['ready']}
+        total = sum(ms for name, ms in phases.items() if name != 'second_request')
+        report = {
+            'runs': options['runs'],
+            'path': options['path'],
+            'status': results[0]['status'],
+            'phases_ms': phases,
+            'startup_ms': total,
+            'ready_ms': ready,
+            'imports': sorted(entries, key=lambda e: e['self_us'], reverse=True)[:options['top']],
+            'packages_ms': startup.by_package(entries)[:10],
+            'deferrable': startup.deferrable(entries, _project_packages(), options['defer_ms']),
+        }
+        self.report(report, options)
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Wrote {options['save']}")
+
+        budget = options['budget_ms'] or getattr(settings, 'STARTUP_BUDGET_MS', None)
+        if budget is not None:
+            if total > budget:
+                message = f'Startup took {total:.0f} ms, over the {budget:.0f} ms budget'
+                if options['check']:
+                    raise CommandError(message)
+                self.stdout.write(self.style.WARNING(message))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Startup {total:.0f} ms is within the {budget:.0f} ms budget'))
+
+    def spawn(self, options, importtime: bool = False):
+        """Run the probe in a new interpreter; returns ``(result, stderr)``."""
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-m', 'pages.startup', '--path', options['path']]
+        if options['warm']:
+            command.append('--warm')
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', ''))
+        proc = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith(startup.RESULT)]
+        if proc.returncode or not lines:
+            tail = '\n'.join((proc.stderr or proc.stdout).splitlines()[-15:])
+            raise CommandError(f'Startup probe failed (exit {proc.returncode}):\n{tail}')
+        return json.loads(lines[-1][len(startup.RESULT):]), proc.stderr
+
+    def report(self, report, options) -> None:
+        self.stdout.write(f"Phases (median of {report['runs']} fresh processes, {report['path']} "
+                          f"-> {report['status']}):")
+        for name, ms in report['phases_ms'].items():
+            self.stdout.write(f'  {name:<16} {ms:>8.1f} ms')
+        self.stdout.write(f"  {'startup':<16} {report['startup_ms']:>8.1f} ms  (everything up to the first response)")
+
+        self.stdout.write('App ready():')
+        for label, ms in sorted(report['ready_ms'].items(), key=lambda item: item[1], reverse=True):
+            self.stdout.write(f'  {label:<16} {ms:>8.2f} ms')
+
+        self.stdout.write('Slowest imports (self time under -X importtime, which inflates it):')
+        self.stdout.write(f"  {'module':<44} {'self':>8} {'cumul.':>8}  {'phase':<14} imported by")
+        for entry in report['imports']:
+            self.stdout.write(
+                f"  {entry['module']:<44} {entry['self_us'] / 1000:>6.1f}ms {entry['cumulative_us'] / 1000:>6.1f}ms"
+                f"  {entry['phase'] or '-':<14} {entry['parent'] or '-'}"
+            )
+        self.stdout.write('By package (self time):')
+        self.stdout.write('  ' + ', '.join(f'{name} {ms:.1f} ms' for name, ms in report['packages_ms']))
+
+        if report['deferrable']:
+            self.stdout.write(f"Deferrable: module-level imports in project code during startup "
+                              f"(>= {options['defer_ms']:g} ms; move them into the function that uses them):")
+            for item in report['deferrable']:
+                self.stdout.write(f"  {item['imported_by']} imports {item['module']} "
+                                  f"({item['ms']:.1f} ms, {item['phase']})")
+        else:
+            self.stdout.write(f"No module-level import in project code costs {options['defer_ms']:g} ms or more.")
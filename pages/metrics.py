@@ -0,0 +1,296 @@
+"""In-process metrics, aggregated across worker processes for ``/metrics``.
+
+Each process keeps plain counters in a dict (a histogram is a set of
+cumulative bucket counters plus ``_sum`` and ``_count``). At most every
+``METRICS_FLUSH_INTERVAL`` seconds, after a response, the process writes its
+counters to ``METRICS_DIR/<pid>-<start>.json``. A scrape flushes its own
+process and sums every file in the directory, so one request to ``/metrics``
+sees all gunicorn workers; values from other workers lag by up to one flush
+interval. Files of workers that have exited are folded into ``archive.json``
+so restarts do not reset the counters or pile up files.
+
+Recorded:
+
+- ``pixel_http_requests_total{route,method,status}`` and
+  ``pixel_http_request_duration_seconds{route}`` (histogram), keyed by URL
+  name such as ``pages:api_notes``;
+- ``pixel_db_queries_total{route}``;
+- ``pixel_cache_lookups_total{cache,result}`` for the rendered-page cache and
+  the theme catalog, with ``pixel_cache_hit_ratio{cache}`` derived at scrape;
+- ``pixel_model_writes_total{model}`` for RunHistory and ContactMessage rows.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+try:
+    import fcntl
+except ImportError:  # Windows: no archive compaction, files are still summed
+    fcntl = None
+
+from .cache import theme_catalog
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    "pixel_http_requests_total": ("counter", "HTTP requests by URL name, method and status."),
+    "pixel_http_request_duration_seconds": ("histogram", "Time from request to response by URL name."),
+    "pixel_db_queries_total": ("counter", "Database queries run while handling requests, by URL name."),
+    "pixel_cache_lookups_total": ("counter", "Cache lookups by cache and result."),
+    "pixel_cache_hit_ratio": ("gauge", "Share of cache lookups that did not miss."),
+    "pixel_model_writes_total": ("counter", "Rows written, by model."),
+}
+
+ARCHIVE = "archive.json"
+
+_lock = threading.Lock()
+_values = defaultdict(float)
+_state = {"flushed": 0.0, "started": int(time.time() * 1000)}
+
+
+def enabled() -> bool:
+    return getattr(settings, "METRICS_ENABLED", True)
+
+
+def metrics_dir() -> Path:
+    return Path(getattr(settings, "METRICS_DIR", settings.BASE_DIR / "var" / "metrics"))
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    if not enabled():
+        return
+    with _lock:
+        _values[_key(name, labels)] += amount
+
+
+def observe(name: str, value: float, buckets=DURATION_BUCKETS, **labels) -> None:
+    if not enabled():
+        return
+    with _lock:
+        for bound in buckets:
+            if value <= bound:
+                _values[_key(f"{name}_bucket", dict(labels, le=repr(bound)))] += 1
+        _values[_key(f"{name}_bucket", dict(labels, le="+Inf"))] += 1
+        _values[_key(f"{name}_sum", labels)] += value
+        _values[_key(f"{name}_count", labels)] += 1
+
+
+def _snapshot() -> list:
+    stats = theme_catalog.stats()
+    with _lock:
+        # The catalog keeps its own cumulative per-process counters; mirror them.
+        for result, stat in (("local_hit", "local_hits"), ("shared_hit", "shared_hits"), ("miss", "misses")):
+            _values[_key("pixel_cache_lookups_total", {"cache": "theme_catalog", "result": result})] = stats[stat]
+        return [[name, list(labels), value] for (name, labels), value in _values.items()]
+
+
+def _process_file() -> Path:
+    return metrics_dir() / f"{os.getpid()}-{_state['started']}.json"
+
+
+def _write_json(path: Path, data) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def flush(force: bool = False) -> None:
+    """Write this process's counters, at most once per flush interval unless forced."""
+    if not enabled():
+        return
+    now = time.monotonic()
+    if not force and now - _state["flushed"] < getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+        return
+    _state["flushed"] = now
+    directory = metrics_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_json(_process_file(), _snapshot())
+
+
+def _read(path: Path) -> list:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def process_alive(pid: int) -> bool:
+    """Whether a process with this pid exists (it may belong to another user)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(into: dict, rows) -> None:
+    for name, labels, value in rows:
+        into[(name, tuple(tuple(pair) for pair in labels))] += value
+
+
+def _compact(directory: Path) -> None:
+    """Fold the files of exited processes into the archive."""
+    if fcntl is None:
+        return
+    with open(directory / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = []
+        for path in directory.glob("*-*.json"):
+            try:
+                pid = int(path.stem.split("-", 1)[0])
+            except ValueError:
+                continue
+            if pid != os.getpid() and not process_alive(pid):
+                dead.append(path)
+        if not dead:
+            return
+        archive = defaultdict(float)
+        _merge(archive, _read(directory / ARCHIVE))
+        for path in dead:
+            _merge(archive, _read(path))
+        _write_json(directory / ARCHIVE, [[name, list(labels), value] for (name, labels), value in archive.items()])
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+
+def collect() -> dict:
+    """(name, labels) -> value summed over every process, live or archived."""
+    flush(force=True)
+    directory = metrics_dir()
+    _compact(directory)
+    totals = defaultdict(float)
+    for path in directory.glob("*.json"):
+        _merge(totals, _read(path))
+    return totals
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _family(name: str) -> str:
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+            return name[: -len(suffix)]
+    return name
+
+
+def render(totals: dict) -> str:
+    """Prometheus text exposition (format 0.0.4) of ``totals``."""
+    lookups = defaultdict(lambda: [0.0, 0.0])
+    for (name, labels), value in totals.items():
+        if name == "pixel_cache_lookups_total":
+            labels = dict(labels)
+            lookups[labels["cache"]][0] += value
+            if labels["result"] != "miss":
+                lookups[labels["cache"]][1] += value
+    totals = dict(totals)
+    for cache, (total, hits) in lookups.items():
+        totals[("pixel_cache_hit_ratio", (("cache", cache),))] = hits / total if total else 0.0
+
+    families = defaultdict(list)
+    for (name, labels), value in totals.items():
+        families[_family(name)].append((name, labels, value))
+
+    def sort_key(sample):
+        name, labels, _ = sample
+        # Buckets in increasing le order, as the format requires.
+        le = dict(labels).get("le")
+        return (name, [pair for pair in labels if pair[0] != "le"], float("inf") if le == "+Inf" else float(le or 0))
+
+    lines = []
+    for family in sorted(families):
+        kind, help_text = METRICS.get(family, ("untyped", ""))
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for name, labels, value in sorted(families[family], key=sort_key):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            value_text = repr(int(value)) if float(value).is_integer() else repr(value)
+            lines.append(f"{name}{{{label_text}}} {value_text}" if label_text else f"{name} {value_text}")
+    return "\n".join(lines) + "\n"
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _watch_queries(stack: ExitStack, counter) -> None:
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(counter))
+
+
+class MetricsMiddleware:
+    """Count requests, latency and queries per URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not enabled():
+            return self.get_response(request)
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            _watch_queries(stack, counter)
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, counter.count)
+        return response
+
+    async def __acall__(self, request):
+        if not enabled():
+            return await self.get_response(request)
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        # Connections are per thread: hook the ones of the thread the async ORM
+        # runs its queries on, which is the same for the whole request.
+        stack = ExitStack()
+        await sync_to_async(_watch_queries)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.record(request, response, time.perf_counter() - start, counter.count)
+        return response
+
+    def record(self, request, response, elapsed: float, queries: int) -> None:
+        match = getattr(request, "resolver_match", None)
+        # Unresolved paths share one label so 404 probes cannot blow up cardinality.
+        route = match.view_name if match else "unmatched"
+        inc("pixel_http_requests_total", route=route, method=request.method, status=str(response.status_code))
+        observe("pixel_http_request_duration_seconds", elapsed, route=route)
+        if queries:
+            inc("pixel_db_queries_total", queries, route=route)
+        page_cache = response.get("X-Page-Cache")
+        if page_cache:
+            inc("pixel_cache_lookups_total", cache="page_render", result=page_cache.lower())
+        flush()
+
+
+atexit.register(lambda: flush(force=True) if _values else None)
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_note_is_deleted'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-updated_at', '-id'], name='note_live_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runhistory',
+            index=models.Index(fields=['-created_at', '-id'], name='runhistory_recent_idx'),
+        ),
+    ]
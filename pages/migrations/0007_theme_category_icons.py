@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0006_note_runhistory_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theme',
+            name='category',
+            field=models.CharField(choices=[('Retro', 'Retro'), ('Modern', 'Modern'), ('Nostalgia', 'Nostalgia'), ('Art', 'Art')], default='Retro', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='theme',
+            name='icons',
+            field=models.JSONField(blank=True, default=list, help_text='Optional emoji row shown in the theme picker'),
+        ),
+    ]
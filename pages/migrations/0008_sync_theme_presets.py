@@ -0,0 +1,192 @@
+from django.db import migrations
+
+# Theme table that used to be hardcoded in pages/home.html; the database is
+# now the single source (see pages.theme_css for the per-theme CSS bundles).
+PRESETS = [
+	{
+		"key": "retro-98",
+		"name": "Retro 98",
+		"category": "Retro",
+		"variables": {
+			"--retro-bg": "#0a0a0a",
+			"--retro-desktop": "#000080",
+			"--retro-taskbar": "#c0c0c0",
+			"--retro-window": "#c0c0c0",
+			"--retro-border": "#808080",
+			"--retro-text": "#000000",
+			"--retro-highlight": "#ffffff",
+			"--retro-shadow": "#404040",
+			"--retro-info": "#0080ff"
+		},
+	},
+	{
+		"key": "retro-olive",
+		"name": "Retro Olive",
+		"category": "Retro",
+		"variables": {
+			"--retro-bg": "#10120f",
+			"--retro-desktop": "#3a3f2b",
+			"--retro-taskbar": "#798252",
+			"--retro-window": "#a7b074",
+			"--retro-border": "#5f6644",
+			"--retro-text": "#0b0b0b",
+			"--retro-highlight": "#f8f8e7",
+			"--retro-shadow": "#2f3323",
+			"--retro-info": "#4e6b2e"
+		},
+	},
+	{
+		"key": "retro-amber",
+		"name": "Retro Amber CRT",
+		"category": "Retro",
+		"variables": {
+			"--retro-bg": "#000000",
+			"--retro-desktop": "#1a1200",
+			"--retro-taskbar": "#4a3b00",
+			"--retro-window": "#2a2100",
+			"--retro-border": "#6b5200",
+			"--retro-text": "#ffbf00",
+			"--retro-highlight": "#ffc933",
+			"--retro-shadow": "#332600",
+			"--retro-info": "#ffbf00"
+		},
+	},
+	{
+		"key": "modern-mint",
+		"name": "Modern Mint",
+		"category": "Modern",
+		"variables": {
+			"--retro-bg": "#0d1117",
+			"--retro-desktop": "#0b3d3d",
+			"--retro-taskbar": "#1f6f6f",
+			"--retro-window": "#163a3a",
+			"--retro-border": "#2aa198",
+			"--retro-text": "#e6fffb",
+			"--retro-highlight": "#c2fff6",
+			"--retro-shadow": "#0a2a2a",
+			"--retro-info": "#2ec4b6",
+			"--window-background": "rgba(22,58,58,0.55)",
+			"--taskbar-background": "rgba(31,111,111,0.55)",
+			"--menu-background": "rgba(22,58,58,0.55)",
+			"--window-backdrop": "blur(10px) saturate(120%)",
+			"--panel-backdrop": "blur(10px) saturate(120%)"
+		},
+	},
+	{
+		"key": "modern-glass",
+		"name": "Modern Glass",
+		"category": "Modern",
+		"variables": {
+			"--retro-bg": "#0f141a",
+			"--retro-desktop": "#0b1222",
+			"--retro-taskbar": "rgba(17,24,39,0.5)",
+			"--retro-window": "rgba(17,24,39,0.5)",
+			"--retro-border": "#475569",
+			"--retro-text": "#e2e8f0",
+			"--retro-highlight": "#ffffff",
+			"--retro-shadow": "#0a0f16",
+			"--retro-info": "#60a5fa",
+			"--window-background": "rgba(17,24,39,0.55)",
+			"--taskbar-background": "rgba(17,24,39,0.55)",
+			"--menu-background": "rgba(17,24,39,0.55)",
+			"--window-backdrop": "blur(14px) saturate(140%)",
+			"--panel-backdrop": "blur(14px) saturate(140%)",
+			"--radius-window": "10px",
+			"--radius-button": "8px",
+			"--header-gradient": "linear-gradient(90deg,#60a5fa,#34d399)",
+			"--glow-color": "rgba(96,165,250,0.6)"
+		},
+	},
+	{
+		"key": "modern-neon",
+		"name": "Modern Neon",
+		"category": "Modern",
+		"variables": {
+			"--retro-bg": "#0b0f1a",
+			"--retro-desktop": "#0f172a",
+			"--retro-taskbar": "#111827",
+			"--retro-window": "#111827",
+			"--retro-border": "#374151",
+			"--retro-text": "#e5e7eb",
+			"--retro-highlight": "#93c5fd",
+			"--retro-shadow": "#0b1020",
+			"--retro-info": "#60a5fa",
+			"--window-background": "rgba(17,24,39,0.55)",
+			"--taskbar-background": "rgba(17,24,39,0.55)",
+			"--menu-background": "rgba(17,24,39,0.55)",
+			"--window-backdrop": "blur(12px) saturate(120%)",
+			"--panel-backdrop": "blur(12px) saturate(120%)",
+			"--radius-window": "12px",
+			"--radius-button": "10px",
+			"--header-gradient": "linear-gradient(90deg,#60a5fa,#a78bfa)",
+			"--glow-color": "rgba(167,139,250,0.6)"
+		},
+	},
+	{
+		"key": "nostalgia-memes",
+		"name": "Nostalgia Memes",
+		"category": "Nostalgia",
+		"variables": {
+			"--retro-bg": "#0a0a0a",
+			"--retro-desktop": "#003366",
+			"--retro-taskbar": "#c0d0ff",
+			"--retro-window": "#dfe8ff",
+			"--retro-border": "#5577aa",
+			"--retro-text": "#000000",
+			"--retro-highlight": "#ffffff",
+			"--retro-shadow": "#202a40",
+			"--retro-info": "#3066be"
+		},
+		"icons": ["😂", "😹", "🐸", "😎", "🔥", "💾", "📼", "📟"],
+	},
+	{
+		"key": "art-absurd",
+		"name": "Art – Absurd",
+		"category": "Art",
+		"variables": {
+			"--retro-bg": "#0b0b0b",
+			"--retro-desktop": "linear-gradient(135deg,#1b1b2f,#162447,#1f4068)",
+			"--retro-taskbar": "rgba(31,64,104,0.6)",
+			"--retro-window": "rgba(27,27,47,0.6)",
+			"--retro-border": "#e43f5a",
+			"--retro-text": "#f3f3f3",
+			"--retro-highlight": "#ffffff",
+			"--retro-shadow": "#0a0a1a",
+			"--retro-info": "#e43f5a",
+			"--window-background": "rgba(27,27,47,0.6)",
+			"--taskbar-background": "rgba(31,64,104,0.6)",
+			"--menu-background": "rgba(27,27,47,0.6)",
+			"--window-backdrop": "blur(16px) contrast(110%)",
+			"--panel-backdrop": "blur(16px) contrast(110%)",
+			"--radius-window": "16px",
+			"--radius-button": "12px",
+			"--header-gradient": "linear-gradient(90deg,#e43f5a,#ffd166)",
+			"--glow-color": "rgba(228,63,90,0.6)"
+		},
+	},
+]
+
+
+def sync_presets(apps, schema_editor):
+	Theme = apps.get_model('pages', 'Theme')
+	for preset in PRESETS:
+		theme = Theme.objects.filter(key=preset["key"]).first()
+		if theme is None:
+			Theme.objects.create(**preset)
+			continue
+		# Keep admin edits: only fill in what the stored row is missing.
+		theme.category = preset["category"]
+		theme.icons = theme.icons or preset.get("icons", [])
+		theme.variables = {**preset["variables"], **(theme.variables or {})}
+		theme.save()
+
+
+class Migration(migrations.Migration):
+
+	dependencies = [
+		('pages', '0007_theme_category_icons'),
+	]
+
+	operations = [
+		migrations.RunPython(sync_presets, migrations.RunPython.noop),
+	]
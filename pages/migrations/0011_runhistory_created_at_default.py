@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0010_sociallink_contactmessage_note_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='runhistory',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
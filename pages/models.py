@@ -1,9 +1,20 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 class Theme(models.Model):
 	"""A named theme with a set of CSS variable overrides."""
+	CATEGORY_CHOICES = [
+		("Retro", "Retro"),
+		("Modern", "Modern"),
+		("Nostalgia", "Nostalgia"),
+		("Art", "Art"),
+	]
+
 	key = models.SlugField(max_length=50, unique=True)
 	name = models.CharField(max_length=100)
+	category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default="Retro")
 	variables = models.JSONField(default=dict, blank=True)
+	icons = models.JSONField(default=list, blank=True, help_text="Optional emoji row shown in the theme picker")
 	is_default = models.BooleanField(default=False)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
@@ -32,7 +43,14 @@ class RunHistory(models.Model):
 	"""Stores commands executed via the Run dialog/command prompt."""
 	command = models.CharField(max_length=255)
 	result = models.TextField(blank=True, default="")
-	created_at = models.DateTimeField(auto_now_add=True)
+	# A default rather than auto_now_add: write-behind inserts keep the time the command ran.
+	created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+	class Meta:
+		indexes = [
+			# Keyset pagination of /api/run-history/ walks (created_at, id) newest first.
+			models.Index(fields=["-created_at", "-id"], name="runhistory_recent_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.command} @ {self.created_at:%Y-%m-%d %H:%M:%S}"
@@ -63,6 +81,8 @@ class Profile(models.Model):
 	full_name = models.CharField(max_length=120)
 	title = models.CharField(max_length=160, blank=True)
 	avatar = models.ImageField(upload_to="profile/", blank=True, null=True)
+	# Resized WebP/AVIF/JPEG copies of `avatar`, filled in by pages.images
+	avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
 	location = models.CharField(max_length=160, blank=True)
 	email = models.EmailField(blank=True)
 	phone = models.CharField(max_length=40, blank=True)
@@ -86,9 +106,15 @@ class SocialLink(models.Model):
 	icon = models.CharField(max_length=8, blank=True, help_text="Emoji or short icon text")
 	order = models.PositiveIntegerField(default=0)
 	visible = models.BooleanField(default=True)
+	updated_at = models.DateTimeField(auto_now=True)
 
 	class Meta:
 		ordering = ["order", "name"]
+		indexes = [
+			# About page: visible links in display order. Partial for the same reason
+			# as Note's indexes: ``visible=True`` compiles to a bare ``visible``.
+			models.Index(fields=["order", "name"], condition=models.Q(visible=True), name="sociallink_visible_order_idx"),
+		]
 
 	def __str__(self) -> str:
 		return self.name
@@ -105,6 +131,11 @@ class ContactMessage(models.Model):
 
 	class Meta:
 		ordering = ["-created_at"]
+		indexes = [
+			# Admin inbox: newest first, and the unread filter on top of that.
+			models.Index(fields=["-created_at"], name="contact_recent_idx"),
+			models.Index(fields=["-created_at"], condition=models.Q(is_read=False), name="contact_unread_recent_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.subject} from {self.name}"
@@ -120,6 +151,37 @@ class Note(models.Model):
 
 	class Meta:
 		ordering = ["-updated_at"]
+		indexes = [
+			# /api/notes/ pages through live notes on (updated_at, id). Django renders
+			# is_deleted=False as ``NOT is_deleted``, which SQLite only matches
+			# against a partial index with the same condition.
+			models.Index(fields=["-updated_at", "-id"], condition=models.Q(is_deleted=False), name="note_live_recent_idx"),
+			# Recycle Bin lists trashed notes newest first.
+			models.Index(fields=["-updated_at"], condition=models.Q(is_deleted=True), name="note_trash_recent_idx"),
+			# Covers the MAX(updated_at), COUNT(id) version aggregate behind the notes
+			# ETag; the planner will not use the partial index above for it.
+			models.Index(fields=["is_deleted", "updated_at"], name="note_version_idx"),
+		]
+
+	def __str__(self) -> str:
+		return self.title
+
+class ChangeEvent(models.Model):
+	"""Append-only log of note, desktop item and preference changes for /api/events/.
+
+	Every worker process tails it by primary key, so a change made through one
+	worker reaches stream clients connected to any other.
+	"""
+	ACTION_CHOICES = [
+		("upsert", "Created or updated"),
+		("delete", "Deleted"),
+	]
+
+	resource = models.CharField(max_length=20)
+	action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+	object_id = models.IntegerField()
+	data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+	created_at = models.DateTimeField(default=timezone.now, editable=False)
 
 	def __str__(self) -> str:
-		return self.title
\ No newline at end of file
+		return f"#{self.pk} {self.action} {self.resource}:{self.object_id}"
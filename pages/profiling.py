@@ -0,0 +1,224 @@
+"""Opt-in per-request profiling.
+
+:class:`ProfilingMiddleware` is always installed but does nothing unless a
+request is selected for profiling, which happens when
+
+- ``PROFILING_ENABLED`` is true (every request; meant for development),
+- a random draw falls under ``PROFILING_SAMPLE_RATE`` (0.0 - 1.0), or
+- the request carries the ``X-Profile`` header with the value of
+  ``PROFILING_TOKEN`` (or, while ``DEBUG`` is on, ``1`` or ``cprofile``).
+
+A profiled request records SQL query count and time, template render time,
+the thread's CPU time and (unless ``PROFILING_TRACEMALLOC`` is off) the
+tracemalloc peak, and reports them in a ``Server-Timing`` header, which
+browser devtools show next to the request.
+With ``PROFILING_DUMP`` it also runs under cProfile and writes a ``.prof``
+file to ``PROFILING_DIR``, keeping the newest ``PROFILING_MAX_FILES``; open
+them with ``python -m pstats`` or snakeviz. Under ASGI the CPU time and the
+dump cover the request's sync thread (ORM queries, sync views and
+templates), not the coroutine code of async views.
+
+Template timing wraps ``Template.render``; the wrapper is installed once, and
+only in processes where some request can be selected.
+"""
+import contextvars
+import cProfile
+import logging
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+HEADER = "HTTP_X_PROFILE"
+# Header values that select a request while DEBUG is on, without the token.
+DEBUG_VALUES = frozenset({"1", "cprofile"})
+
+_stats = contextvars.ContextVar("pages_profiling_stats", default=None)
+# cProfile can only follow one thread's profiler at a time in some Pythons,
+# and overlapping dumps are useless anyway.
+_profiler_lock = threading.Lock()
+_patch_lock = threading.Lock()
+_timer_installed = False
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.query_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_ms += (time.perf_counter() - start) * 1000
+
+
+def _install_template_timer() -> None:
+    """Wrap ``Template.render`` once so profiled requests can time rendering."""
+    global _timer_installed
+    if _timer_installed:
+        return
+    with _patch_lock:
+        if _timer_installed:
+            return
+        original = Template.render
+
+        def render(self, context):
+            stats = _stats.get()
+            if stats is None:
+                return original(self, context)
+            # Included/extended templates render inside their parent; time the outermost only.
+            stats.template_depth += 1
+            start = time.perf_counter()
+            try:
+                return original(self, context)
+            finally:
+                stats.template_depth -= 1
+                if stats.template_depth == 0:
+                    stats.template_ms += (time.perf_counter() - start) * 1000
+
+        Template.render = render
+        _timer_installed = True
+
+
+def can_profile() -> bool:
+    """Whether the settings let any request be selected for profiling."""
+    return bool(
+        getattr(settings, "PROFILING_ENABLED", False)
+        or getattr(settings, "PROFILING_SAMPLE_RATE", 0.0) > 0
+        or getattr(settings, "PROFILING_TOKEN", "")
+        or settings.DEBUG
+    )
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILING_DIR", settings.BASE_DIR / "var" / "profiles"))
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    dumps = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in dumps[keep:]:
+        old.unlink(missing_ok=True)
+
+
+def write_dump(profiler: cProfile.Profile, request, total_ms: float) -> Path:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = _SLUG.sub("-", request.path).strip("-") or "root"
+    path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{request.method}-{slug[:60]}-{total_ms:.0f}ms.prof"
+    profiler.dump_stats(path)
+    _rotate(directory, getattr(settings, "PROFILING_MAX_FILES", 100))
+    return path
+
+
+def server_timing(stats: RequestStats, cpu_ms: float, total_ms: float, peak_bytes) -> str:
+    parts = [
+        f'db;dur={stats.query_ms:.1f};desc="SQL ({stats.queries} queries)"',
+        f'tpl;dur={stats.template_ms:.1f};desc="Templates"',
+        f'cpu;dur={cpu_ms:.1f};desc="Python CPU"',
+    ]
+    if peak_bytes is not None:
+        parts.append(f'mem;desc="Peak alloc {peak_bytes / 1024:.0f} KiB"')
+    parts.append(f'total;dur={total_ms:.1f}')
+    return ", ".join(parts)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        if can_profile():
+            _install_template_timer()
+
+    def selected(self, request) -> bool:
+        if getattr(settings, "PROFILING_ENABLED", False):
+            return True
+        header = request.META.get(HEADER)
+        if header is not None:
+            token = getattr(settings, "PROFILING_TOKEN", "")
+            if (token and header == token) or (settings.DEBUG and header in DEBUG_VALUES):
+                return True
+        rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.selected(request):
+            return self.get_response(request)
+        return self.profile(request, self.get_response)
+
+    async def __acall__(self, request):
+        if not self.selected(request):
+            return await self.get_response(request)
+        # Profile from the request's sync thread, where the async ORM runs its
+        # queries; the view's coroutine itself runs on the event loop.
+        return await sync_to_async(self.profile)(request, async_to_sync(self.get_response))
+
+    def profile(self, request, get_response):
+        # Normally done in __init__; covers settings that enable profiling later.
+        _install_template_timer()
+        stats = RequestStats()
+        token = _stats.set(stats)
+        # tracemalloc slows allocation-heavy renders several times over; it can be turned off.
+        trace = getattr(settings, "PROFILING_TRACEMALLOC", True)
+        started_tracing = trace and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if trace:
+            tracemalloc.reset_peak()
+            base_bytes = tracemalloc.get_traced_memory()[0]
+        profiler = None
+        if getattr(settings, "PROFILING_DUMP", True) and _profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        response = None
+        cpu_start, start = time.thread_time(), time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats.record_query))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            cpu_ms = (time.thread_time() - cpu_start) * 1000
+            # tracemalloc is process-wide: under a threaded server the peak includes other requests.
+            peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - base_bytes) if trace else None
+            if started_tracing:
+                tracemalloc.stop()
+            _stats.reset(token)
+            if profiler is not None:
+                try:
+                    if response is not None:
+                        write_dump(profiler, request, total_ms)
+                except OSError:
+                    logger.exception("Could not write profile for %s", request.path)
+                finally:
+                    _profiler_lock.release()
+
+        response["Server-Timing"] = server_timing(stats, cpu_ms, total_ms, peak_bytes)
+        return response
@@ -0,0 +1,154 @@
+"""Whole-page render cache for read-mostly pages.
+
+A view decorated with :func:`cache_page_render` stores its final HTML bytes in
+the ``PAGE_CACHE_ALIAS`` cache under a key built from the view name and its
+URL arguments. Each entry records the generation of every model it depends
+on; saving or deleting one of those models bumps its generation (see
+``pages.signals``), which makes dependent entries stale.
+
+With ``PAGE_CACHE_STALE_WHILE_REVALIDATE`` a stale entry is still served and
+a background thread re-renders it, so only a completely cold cache makes a
+visitor wait for a render. An entry rendered more than
+``PAGE_CACHE_MAX_STALE_SECONDS`` ago is never served stale, and one whose
+re-render fails or is not a 200 (a deleted project's detail page) is evicted,
+so the next visitor gets the view's own response.
+"""
+import hashlib
+import logging
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "pages:render"
+
+# view name -> model labels ("app_label.ModelName") the rendered page depends on
+registry = {}
+
+
+def _cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def enabled() -> bool:
+    return getattr(settings, "PAGE_CACHE_ENABLED", True)
+
+
+def stale_while_revalidate() -> bool:
+    return getattr(settings, "PAGE_CACHE_STALE_WHILE_REVALIDATE", True)
+
+
+def max_stale_seconds() -> float:
+    return getattr(settings, "PAGE_CACHE_MAX_STALE_SECONDS", 300)
+
+
+def _generation_key(label: str) -> str:
+    return f"{KEY_PREFIX}:gen:{label.lower()}"
+
+
+def generations(labels) -> tuple:
+    """Current generation of each model label, in order (one cache round trip)."""
+    keys = [_generation_key(label) for label in labels]
+    found = _cache().get_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def bump(label: str) -> None:
+    """Mark every page depending on ``label`` as stale."""
+    key = _generation_key(label)
+    cache = _cache()
+    # Seed with the wall clock so a cleared cache never reuses an old generation.
+    if cache.add(key, int(time.time() * 1000), timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def page_key(name: str, args=(), kwargs=None) -> str:
+    raw = repr((name, tuple(args), sorted((kwargs or {}).items())))
+    return f"{KEY_PREFIX}:page:{name}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def _store(key: str, response, gens: tuple) -> None:
+    _cache().set(key, {
+        "body": response.content,
+        "content_type": response.get("Content-Type"),
+        "generations": gens,
+        "rendered_at": time.time(),
+    }, timeout=None)
+
+
+def _from_entry(entry: dict, state: str) -> HttpResponse:
+    response = HttpResponse(entry["body"], content_type=entry["content_type"])
+    response["X-Page-Cache"] = state
+    return response
+
+
+def _refresh_in_background(key, view, request, args, kwargs, labels) -> None:
+    # One refresher per page across threads and (with a shared cache) workers.
+    if not _cache().add(f"{key}:refreshing", 1, timeout=30):
+        return
+
+    def run():
+        try:
+            gens = generations(labels)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                _store(key, response, gens)
+            else:
+                _cache().delete(key)
+        except Http404:
+            _cache().delete(key)
+        except Exception:
+            _cache().delete(key)
+            logger.exception("Background re-render of %s failed", key)
+        finally:
+            _cache().delete(f"{key}:refreshing")
+            close_old_connections()
+
+    threading.Thread(target=run, name="page-cache-refresh", daemon=True).start()
+
+
+def cache_page_render(name: str, depends_on):
+    """Cache the rendered HTML of a GET-only, visitor-independent page."""
+    labels = tuple(depends_on)
+    registry[name] = labels
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not enabled() or request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            key = page_key(name, args, kwargs)
+            gens = generations(labels)
+            entry = _cache().get(key)
+            if entry is not None and entry["generations"] == gens:
+                return _from_entry(entry, "HIT")
+            if (entry is not None and stale_while_revalidate()
+                    and time.time() - entry["rendered_at"] <= max_stale_seconds()):
+                _refresh_in_background(key, view, request, args, kwargs, labels)
+                return _from_entry(entry, "STALE")
+
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                if entry is not None:
+                    _cache().delete(key)
+                raise
+            if response.status_code == 200 and not response.streaming:
+                _store(key, response, gens)
+            elif entry is not None:
+                _cache().delete(key)
+            response["X-Page-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
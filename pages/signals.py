@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from showcase.models import Education, Project, Skill
+
+from . import events, images, metrics, render_cache, theme_css
+from .cache import theme_catalog
+from .models import ContactMessage, DesktopItem, Note, Profile, RunHistory, SocialLink, Theme, UserPreference
+
+
+@receiver(post_migrate)
+def set_journal_mode(sender, using="default", **kwargs):
+	"""Switch a migrated SQLite database to SQLITE_JOURNAL_MODE; the file keeps it."""
+	mode = getattr(settings, "SQLITE_JOURNAL_MODE", None)
+	connection = connections[using]
+	if sender.name != "pages" or not mode or connection.vendor != "sqlite":
+		return
+	with connection.cursor() as cursor:
+		cursor.execute(f"PRAGMA journal_mode={mode}")
+
+
+@receiver(post_save, sender=Theme)
+def theme_saved(sender, instance, raw=False, **kwargs):
+	"""Rebuild the theme's CSS bundle, then drop the cached /api/themes/ body."""
+	if not raw and getattr(settings, "THEME_CSS_AUTOBUILD", True):
+		theme_css.write_theme(instance)
+	theme_catalog.invalidate()
+
+
+@receiver(post_delete, sender=Theme)
+def theme_deleted(sender, instance, **kwargs):
+	if getattr(settings, "THEME_CSS_AUTOBUILD", True):
+		theme_css.remove_theme(instance.key)
+	theme_catalog.invalidate()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=SocialLink)
+@receiver(post_delete, sender=SocialLink)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_rendered_pages(sender, **kwargs):
+	"""Mark cached About/Projects pages that read this model as stale."""
+	render_cache.bump(sender._meta.label)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Profile)
+def schedule_image_variants(sender, instance, raw=False, **kwargs):
+	"""Queue resized derivatives when an uploaded image is new or changed."""
+	if raw:
+		return
+	for label, image_field, variants_field in images.IMAGE_FIELDS:
+		if sender._meta.label == label and images.needs_variants(instance, image_field, variants_field):
+			images.schedule(instance, image_field, variants_field)
+
+
+@receiver(post_save, sender=RunHistory)
+@receiver(post_save, sender=ContactMessage)
+def count_model_write(sender, created=False, raw=False, **kwargs):
+	"""Feed pixel_model_writes_total for the write-rate panels."""
+	if created and not raw:
+		metrics.inc("pixel_model_writes_total", model=sender._meta.label)
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=DesktopItem)
+@receiver(post_save, sender=UserPreference)
+def publish_saved(sender, instance, raw=False, **kwargs):
+	"""Stream the new state to /api/events/ clients."""
+	if not raw:
+		events.publish(instance)
+
+
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=DesktopItem)
+@receiver(post_delete, sender=UserPreference)
+def publish_deleted(sender, instance, **kwargs):
+	events.publish(instance, "delete")
@@ -0,0 +1,133 @@
+"""Helpers for inspecting and measuring the SQLite connection tuning.
+
+``settings.SQLITE_PRAGMAS`` is applied to each new connection through the
+backend's ``init_command``, the busy timeout through ``OPTIONS["timeout"]``
+and ``SQLITE_JOURNAL_MODE`` by ``migrate``. ``optimize_db`` uses this module to show the
+pragmas a live connection actually runs with, to compare read/write
+throughput of SQLite's defaults against the configured pragmas on a scratch
+database, so the real data is never touched, and to read the query plans of
+the queries the views run.
+"""
+import os
+import re
+import sqlite3
+import tempfile
+import time
+
+from django.db import DatabaseError
+
+PRAGMA_NAMES = ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store")
+
+# What a bare sqlite3 connection runs with (rollback journal, full fsync).
+SQLITE_DEFAULTS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+# "SCAN pages_note" is a table scan; "SCAN pages_note USING [COVERING] INDEX ..."
+# walks an index and is fine.
+_TABLE_SCAN = re.compile(r"^SCAN (\S+)$")
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+# Below this many rows (per sqlite_stat1) the planner reads a table whole
+# whatever its indexes, so a scan says nothing about the indexes.
+SMALL_TABLE_ROWS = 100
+
+
+def configured_pragmas(settings) -> dict:
+    """Every tuned pragma as the settings configure it, wherever it is applied."""
+    pragmas = dict(getattr(settings, "SQLITE_PRAGMAS", {}))
+    if getattr(settings, "SQLITE_JOURNAL_MODE", None):
+        pragmas["journal_mode"] = settings.SQLITE_JOURNAL_MODE
+    timeout = settings.DATABASES["default"].get("OPTIONS", {}).get("timeout")
+    if timeout is not None:
+        pragmas["busy_timeout"] = int(timeout * 1000)
+    return pragmas
+
+
+def effective_pragmas(connection) -> dict:
+    """Current value of each tuned pragma on a Django connection."""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in PRAGMA_NAMES:
+            cursor.execute(f"PRAGMA {name}")
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
+
+
+def measure_throughput(pragmas: dict, writes: int = 500, reads: int = 5000) -> dict:
+    """Ops/second for single-row write transactions and point reads.
+
+    Writes commit one row per transaction, which mirrors the request path
+    (one ``create()`` per POST) and is where journal/sync settings matter.
+    """
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            for name, value in pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            conn.execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, command TEXT, result TEXT, created_at TEXT)")
+
+            start = time.perf_counter()
+            for i in range(writes):
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT INTO bench (command, result, created_at) VALUES (?, ?, datetime('now'))",
+                    (f"cmd-{i}", "ok"),
+                )
+                conn.execute("COMMIT")
+            write_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(reads):
+                conn.execute("SELECT command, result FROM bench WHERE id = ?", (i % writes + 1,)).fetchone()
+            read_elapsed = time.perf_counter() - start
+        finally:
+            conn.close()
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+    return {
+        "writes_per_sec": writes / write_elapsed if write_elapsed else float("inf"),
+        "reads_per_sec": reads / read_elapsed if read_elapsed else float("inf"),
+    }
+
+
+def explain_query_plan(connection, sql: str) -> list:
+    """Detail lines of ``EXPLAIN QUERY PLAN`` for ``sql`` (parameters already inlined)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def table_rows(connection) -> dict:
+    """Row count of each table as of the last ``ANALYZE`` (empty tables are not listed)."""
+    rows = {}
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+        except DatabaseError:  # never analyzed
+            return rows
+        for table, stat in cursor.fetchall():
+            count = int(stat.split()[0]) if stat else 0
+            rows[table] = max(rows.get(table, 0), count)
+    return rows
+
+
+def table_scans(sql: str, plan, rows=None, min_rows: int = SMALL_TABLE_ROWS) -> list:
+    """Tables ``plan`` scans row by row while ``sql`` filters them.
+
+    A query without a ``WHERE`` reads the whole table by design (the theme
+    catalogue, desktop items), so an index could not make it cheaper and it is
+    not reported. With ``rows`` (from :func:`table_rows`), tables with fewer
+    than ``min_rows`` rows are not reported either.
+    """
+    if not _WHERE.search(sql):
+        return []
+    scans = [m.group(1) for m in map(_TABLE_SCAN.match, plan) if m]
+    if rows is not None:
+        scans = [table for table in scans if rows.get(table, 0) >= min_rows]
+    return scans
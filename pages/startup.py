@@ -0,0 +1,186 @@
+"""Where a fresh process spends its time before it can answer a request.
+
+``manage.py startup_profile`` runs this module in new interpreters
+(``python -m pages.startup``), since the process running the command has
+already paid for everything being measured. :func:`probe` goes through the
+same steps a gunicorn worker does, timing each phase:
+
+``settings``        import the settings module
+``apps``            ``django.setup()``: import every app and its models, run ``ready()``
+``wsgi``            import ``WSGI_APPLICATION`` (builds the middleware chain)
+``urlconf``         import and populate the URLconf, which imports the views
+``first_request``   one request through the WSGI application
+``second_request``  the same request again, for contrast
+
+Phase names are written to stderr as they start, so the output of
+``python -X importtime`` can be attributed to a phase
+(:func:`parse_importtime`). Only the standard library is imported at module
+level, so that nothing is imported before it is measured.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from wsgiref.util import setup_testing_defaults
+
+PHASES = ("settings", "apps", "wsgi", "urlconf", "first_request", "second_request")
+# Phases a worker goes through before serving anything; deferring an import
+# made in one of these moves its cost out of startup.
+STARTUP_PHASES = ("settings", "apps", "wsgi", "urlconf")
+
+MARKER = "startup-profile phase: "
+RESULT = "startup-profile result: "
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$")
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def _phase(name: str) -> float:
+    print(f"{MARKER}{name}", file=sys.stderr, flush=True)
+    return time.perf_counter()
+
+
+def _request(application, path: str, host: str) -> int:
+    environ = {"PATH_INFO": path, "HTTP_HOST": host, "SERVER_NAME": host}
+    setup_testing_defaults(environ)
+    status = []
+    response = application(environ, lambda code, headers, exc_info=None: status.append(code))
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, "close"):
+            response.close()
+    return int(status[0].split()[0])
+
+
+def probe(path: str = "/", warm: bool = False) -> dict:
+    """Start Django the way a worker does and time every phase (ms)."""
+    phases, ready = {}, {}
+
+    started = _phase("settings")
+    from django.conf import settings
+    settings.INSTALLED_APPS
+    phases["settings"] = _ms(started)
+
+    started = _phase("apps")
+    import django
+    from django.apps import AppConfig
+
+    create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        config = create(cls, entry)
+
+        def timed_ready(_ready=config.ready, label=config.label):
+            t0 = time.perf_counter()
+            _ready()
+            ready[label] = _ms(t0)
+
+        config.ready = timed_ready
+        return config
+
+    AppConfig.create = classmethod(timed_create)
+    try:
+        django.setup(set_prefix=False)
+    finally:
+        AppConfig.create = classmethod(create)
+    phases["apps"] = _ms(started)
+
+    started = _phase("wsgi")
+    from django.utils.module_loading import import_string
+    application = import_string(settings.WSGI_APPLICATION)
+    phases["wsgi"] = _ms(started)
+
+    started = _phase("urlconf")
+    from django.urls import get_resolver
+    len(get_resolver().reverse_dict)
+    phases["urlconf"] = _ms(started)
+
+    if warm:
+        started = _phase("warmup")
+        from pages.warmup import warm_up
+        warm_up()
+        phases["warmup"] = _ms(started)
+
+    hosts = [h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"]
+    host = hosts[0] if hosts else "localhost"
+    started = _phase("first_request")
+    status = _request(application, path, host)
+    phases["first_request"] = _ms(started)
+
+    started = _phase("second_request")
+    _request(application, path, host)
+    phases["second_request"] = _ms(started)
+
+    return {"phases": phases, "ready": ready, "status": status}
+
+
+def parse_importtime(stderr: str) -> list:
+    """Entries of ``-X importtime`` output, in the order they finished.
+
+    Each is ``{"module", "self_us", "cumulative_us", "depth", "phase",
+    "parent"}``; ``parent`` is the module whose import triggered this one
+    (None when the phase code itself imported it).
+    """
+    entries, pending, phase = [], defaultdict(list), None
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            phase = line[len(MARKER):].strip()
+            continue
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        depth = (len(indent) - 1) // 2
+        entry = {"module": module, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                 "depth": depth, "phase": phase, "parent": None}
+        # A module is reported after everything it imported, one level deeper.
+        for child in pending.pop(depth + 1, []):
+            child["parent"] = module
+        pending[depth].append(entry)
+        entries.append(entry)
+    return entries
+
+
+def _top(module: str) -> str:
+    return module.split(".", 1)[0]
+
+
+def deferrable(entries: list, project: set, min_ms: float = 5.0) -> list:
+    """Imports the project's own modules make at module level during startup that cost at least ``min_ms``.
+
+    Moving one of these into the function that uses it takes its cost out
+    of startup, unless something else imports it before the first request;
+    ``imported by`` is only the first importer. Most expensive first.
+    """
+    found = [
+        {"module": e["module"], "imported_by": e["parent"], "phase": e["phase"],
+         "ms": e["cumulative_us"] / 1000}
+        for e in entries
+        if e["phase"] in STARTUP_PHASES and e["parent"] and _top(e["parent"]) in project
+        and _top(e["module"]) not in project and e["cumulative_us"] >= min_ms * 1000
+    ]
+    return sorted(found, key=lambda item: item["ms"], reverse=True)
+
+
+def by_package(entries: list) -> list:
+    """``(top-level package, self ms)`` summed over every module it imported, most expensive first."""
+    totals = defaultdict(int)
+    for entry in entries:
+        totals[_top(entry["module"])] += entry["self_us"]
+    return sorted(((name, us / 1000) for name, us in totals.items()), key=lambda item: item[1], reverse=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--warm", action="store_true")
+    args = parser.parse_args()
+    result = probe(args.path, args.warm)
+    print(RESULT + json.dumps(result), flush=True)
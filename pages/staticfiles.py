@@ -0,0 +1,86 @@
+"""Static file serving: WhiteNoise over the hashed, precompressed STATIC_ROOT.
+
+``collectstatic`` (with ``CompressedManifestStaticFilesStorage``) writes every
+asset under a content-hashed name plus ``.gz`` and, when ``brotli`` is
+installed, ``.br`` variants. WhiteNoise then serves the smallest variant the
+browser accepts, with ``Cache-Control: max-age=315360000, public, immutable``
+for hashed names.
+
+This subclass adds three things:
+
+- it is async-capable, so under ASGI it does not force Django to adapt the
+  rest of the middleware chain to sync;
+- theme bundles written after startup (an admin edit rebuilds one, see
+  ``theme_css``) are served from ``THEME_CSS_DIR`` without a restart;
+- theme bundles already carry their own content hash, so they count as
+  immutable as well.
+"""
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import theme_css
+
+# "<key>.<12 hex>.css", as written by theme_css.write_theme
+_THEME_BUNDLE = re.compile(r"^[A-Za-z0-9_-]+\.[0-9a-f]{12}\.css$")
+
+
+async def _aread(filelike, block_size: int):
+    read = sync_to_async(filelike.read, thread_sensitive=False)
+    while chunk := await read(block_size):
+        yield chunk
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @property
+    def theme_prefix(self) -> str:
+        return f"{self.static_prefix}{theme_css.STATIC_PREFIX}/"
+
+    def lookup(self, path: str):
+        if self.autorefresh:
+            return self.find_file(path)
+        static_file = self.files.get(path)
+        if static_file is None and path.startswith(self.theme_prefix):
+            static_file = self.add_theme_bundle(path)
+        return static_file
+
+    def add_theme_bundle(self, url: str):
+        """Serve a theme bundle that did not exist when the files were scanned."""
+        name = url[len(self.theme_prefix):]
+        path = theme_css.output_dir() / name
+        if not _THEME_BUNDLE.match(name) or not path.is_file():
+            return None
+        self.add_file_to_dictionary(url, str(path))
+        return self.files.get(url)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        static_file = self.lookup(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        static_file = self.lookup(request.path_info)
+        if static_file is not None:
+            response = self.serve(static_file, request)
+            if response.file_to_stream is not None:
+                # ASGIHandler would otherwise warn and drain the sync iterator itself.
+                response.streaming_content = _aread(response.file_to_stream, response.block_size)
+            return response
+        return await self.get_response(request)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.theme_prefix) and _THEME_BUNDLE.match(url[len(self.theme_prefix):]):
+            return True
+        return super().immutable_file_test(path, url)
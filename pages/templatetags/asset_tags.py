@@ -0,0 +1,52 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from pages import assets
+
+register = template.Library()
+
+TAGS = {
+    "css": '<link rel="stylesheet" href="{}">',
+    "js": '<script src="{}"></script>',
+}
+
+# Same, but without holding up the first paint: scripts run after parsing (in
+# order), stylesheets are preloaded and applied once fetched.
+DEFERRED_TAGS = {
+    "css": ('<link rel="preload" as="style" href="{0}" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            '<noscript><link rel="stylesheet" href="{0}"></noscript>'),
+    "js": '<script src="{}" defer></script>',
+}
+
+
+def _urls(name, kind):
+    """Static URLs to load for ``<name>.<kind>``: the built bundle, else its sources.
+
+    Sources are used while ``ASSET_BUNDLES_ENABLED`` is off (the default
+    under ``DEBUG``, so edits show up without a rebuild), until
+    ``build_assets`` has written the bundle, and when the staticfiles
+    manifest predates it.
+    """
+    bundle = assets.bundle_file(name, kind) if getattr(settings, "ASSET_BUNDLES_ENABLED", False) else None
+    if bundle:
+        try:
+            return [static(bundle)]
+        except ValueError:
+            # Built after the last collectstatic: not in its manifest yet.
+            pass
+    return [static(source) for source in assets.bundles().get(name, {}).get(kind) or []]
+
+
+@register.simple_tag
+def asset_bundle(name, kind, defer=False):
+    """Link the built ``<name>.<kind>`` bundle, or each of its sources."""
+    tag = (DEFERRED_TAGS if defer else TAGS)[kind]
+    return format_html_join("\n    ", tag, ((url,) for url in _urls(name, kind)))
+
+
+@register.simple_tag
+def asset_bundle_urls(*names, kind="js"):
+    """``{name: [url, ...]}`` for bundles a page loads itself, e.g. on demand."""
+    return {name: _urls(name, kind) for name in names}
@@ -0,0 +1,41 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(field_file, variants=None, sizes="100vw", **attrs):
+    """Render an uploaded image as ``<picture>`` with srcset per derivative format.
+
+    Falls back to a plain ``<img>`` of the original until derivatives exist.
+    Extra keyword arguments become attributes of the ``<img>``.
+    """
+    if not field_file:
+        return ""
+    attrs.setdefault("loading", "lazy")
+    img_attrs = format_html_join("", ' {}="{}"', sorted(attrs.items()))
+    formats = (variants or {}).get("formats") or {}
+    if not formats:
+        return format_html('<img src="{}"{}>', field_file.url, img_attrs)
+
+    storage = getattr(field_file, "storage", default_storage)
+
+    def srcset(files):
+        return ", ".join(f"{storage.url(f['name'])} {f['width']}w" for f in files)
+
+    sources = format_html_join(
+        "", '<source type="{}" srcset="{}" sizes="{}">',
+        ((fmt["type"], srcset(fmt["files"]), sizes) for ext, fmt in formats.items() if ext != "jpeg"),
+    )
+    fallback = formats.get("jpeg", {}).get("files") or []
+    if fallback:
+        img = format_html(
+            '<img src="{}" srcset="{}" sizes="{}"{}>',
+            storage.url(fallback[-1]["name"]), srcset(fallback), sizes, img_attrs,
+        )
+    else:
+        img = format_html('<img src="{}"{}>', field_file.url, img_attrs)
+    # display:contents keeps the <img> laid out as if it were the container's child.
+    return format_html('<picture style="display:contents">{}{}</picture>', sources, img)
@@ -0,0 +1,175 @@
+"""Query-count and latency budgets for every named route of a URLconf.
+
+``pages.tests`` and ``showcase.tests`` mix :class:`ViewBudgetMixin` into a
+``TestCase`` and give each route of their URLconf a :class:`Budget`. Every
+route is requested with the page and theme caches cold, so the numbers are
+the worst case a visitor can hit:
+
+- the number of queries must not exceed ``Budget.queries`` (this is what
+  catches an N+1 as the seeded tables grow);
+- the 95th percentile of ``PERF_TEST_RUNS`` requests must stay under
+  ``Budget.p95_ms``.
+
+Knobs, read from the environment so CI can turn them up:
+
+``PERF_TEST_SCALE``           ``populate_db --scale`` rows per table (default 1)
+``PERF_TEST_RUNS``            requests per route for the latency check (default 20)
+``PERF_TEST_LATENCY_FACTOR``  multiplier for every p95 budget on slow machines (default 1)
+"""
+import json
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from io import StringIO
+from typing import Callable, Optional, Union
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+
+from .cache import theme_catalog
+
+
+def _env_number(name: str, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+SCALE = _env_number("PERF_TEST_SCALE", 1)
+RUNS = _env_number("PERF_TEST_RUNS", 20)
+LATENCY_FACTOR = _env_number("PERF_TEST_LATENCY_FACTOR", 1.0, float)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Limits for one route. ``data`` may be a callable evaluated per request."""
+    queries: int
+    p95_ms: float
+    method: str = "get"
+    data: Union[dict, Callable[[], dict], None] = None
+    status: int = 200
+    headers: Optional[dict] = None
+
+
+def p95(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def named_routes(urlconf: str) -> dict:
+    """Route name -> URL parameter names for every named pattern in ``urlconf``."""
+    routes = {}
+    for name, entries in get_resolver(urlconf).reverse_dict.items():
+        if isinstance(name, str):
+            routes[name] = entries[0][0][1]
+    return routes
+
+
+def seed(scale: int = SCALE) -> None:
+    """Sample content plus ``populate_db --scale`` rows of each growing table."""
+    from .models import Profile, SocialLink
+
+    call_command("populate_db", scale=scale, seed=0, stdout=StringIO())
+    Profile.objects.create(full_name="Test Owner", title="Developer", bio="Bio")
+    SocialLink.objects.bulk_create(
+        SocialLink(name=f"Link {i}", url=f"https://example.com/{i}", order=i, visible=i % 3 != 0)
+        for i in range(6)
+    )
+
+
+# Caches go to an isolated locmem cache, theme CSS and metrics to temporary
+# directories, so the suite never touches var/ or static/themes.
+BUDGET_SETTINGS = dict(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "view-budgets"}},
+    THEME_CACHE_ALIAS="default",
+    PAGE_CACHE_ALIAS="default",
+    PAGE_CACHE_ENABLED=False,
+    PAGE_CACHE_STALE_WHILE_REVALIDATE=False,
+    THEME_CSS_AUTOBUILD=False,
+    THEME_CSS_DIR=os.path.join(tempfile.gettempdir(), "pixel-portfolio-test-themes"),
+    IMAGE_DERIVATIVES_SYNC=True,
+    METRICS_DIR=os.path.join(tempfile.gettempdir(), "pixel-portfolio-test-metrics"),
+    # Rows must be in the table when the request returns.
+    RUN_HISTORY_WRITE_BEHIND=False,
+)
+
+
+class ViewBudgetMixin:
+    """Mix into a ``TestCase``; set ``urlconf``, ``namespace`` and ``budgets``."""
+
+    urlconf: str
+    namespace: str
+    budgets: dict = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls._budget_settings = override_settings(**BUDGET_SETTINGS)
+        cls._budget_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._budget_settings.disable()
+
+    @classmethod
+    def setUpTestData(cls):
+        seed()
+
+    def route_kwargs(self, name: str, params) -> dict:
+        """URL arguments for a parameterised route; override for anything but ``pk``."""
+        raise NotImplementedError(f"No URL arguments for {self.namespace}:{name} ({params})")
+
+    def _request(self, name: str, params, budget: Budget):
+        kwargs = self.route_kwargs(name, params) if params else {}
+        url = reverse(f"{self.namespace}:{name}", kwargs=kwargs)
+        data = budget.data() if callable(budget.data) else budget.data
+        caches["default"].clear()
+        theme_catalog.invalidate()
+        send = getattr(self.client, budget.method)
+        headers = budget.headers or {}
+        if budget.method == "get":
+            return lambda: send(url, data or {}, headers=headers)
+        body = json.dumps(data or {})
+        return lambda: send(url, body, content_type="application/json", headers=headers)
+
+    def _routes(self):
+        for name, params in sorted(named_routes(self.urlconf).items()):
+            yield name, params, self.budgets[name]
+
+    def test_every_route_has_a_budget(self):
+        missing = sorted(set(named_routes(self.urlconf)) - set(self.budgets))
+        self.assertEqual(missing, [], f"Add a Budget for these {self.urlconf} routes")
+
+    def test_query_budgets(self):
+        for name, params, budget in self._routes():
+            with self.subTest(route=name):
+                send = self._request(name, params, budget)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = send()
+                self.assertEqual(response.status_code, budget.status)
+                self.assertLessEqual(
+                    len(ctx.captured_queries), budget.queries,
+                    f"{name} ran {len(ctx.captured_queries)} queries (budget {budget.queries}):\n"
+                    + "\n".join(q["sql"] for q in ctx.captured_queries),
+                )
+
+    def test_latency_budgets(self):
+        for name, params, budget in self._routes():
+            with self.subTest(route=name):
+                samples = []
+                for _ in range(RUNS):
+                    send = self._request(name, params, budget)
+                    start = time.perf_counter()
+                    response = send()
+                    samples.append((time.perf_counter() - start) * 1000)
+                    self.assertEqual(response.status_code, budget.status)
+                limit = budget.p95_ms * LATENCY_FACTOR
+                self.assertLessEqual(p95(samples), limit, f"{name} p95 {p95(samples):.1f}ms over {limit:.0f}ms")
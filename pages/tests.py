@@ -1,3 +1,864 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import pstats
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, get_commands
+from django.db import connection
+from django.http import HttpResponseNotFound
+from django.template import engines
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from showcase.models import Project
+from . import assets, benchmarking, events, metrics, profiling, render_cache, sqlite_tuning, startup, warmup, write_behind
+from .cache import ThemeCatalogCache, theme_catalog
+from .management.commands import export_static, optimize_db
+from .models import ChangeEvent, DesktopItem, Note, RunHistory, Theme
+from .pagination import DEFAULT_LIMIT, MAX_LIMIT, decode_cursor, keyset_page, parse_fields, parse_limit
+from .staticfiles import WhiteNoiseMiddleware
+from .templatetags import media_tags
+from .testing import Budget, ViewBudgetMixin
+from .views import NOTE_FIELDS
+
+# p95 budgets (ms) with cold caches; scale them with PERF_TEST_LATENCY_FACTOR.
+STATIC_MS = 20
+PAGE_MS = 50
+API_MS = 25
+
+
+def _move_first_desktop_item():
+    pk = DesktopItem.objects.order_by("pk").values_list("pk", flat=True).first()
+    return {"items": [{"id": pk, "pos_x": 10, "pos_y": 20}]}
+
+
+OPERATOR = {"Authorization": "Bearer operator"}
+
+
+@override_settings(METRICS_TOKEN="operator")
+class PagesViewBudgetTests(ViewBudgetMixin, TestCase):
+    """Every route in pages.urls stays within its query and p95 latency budget."""
+
+    urlconf = "pages.urls"
+    namespace = "pages"
+    budgets = {
+        # preferences, themes and desktop items: a version aggregate and a read each
+        "home": Budget(queries=6, p95_ms=PAGE_MS),
+        "about": Budget(queries=4, p95_ms=PAGE_MS),
+        "contact": Budget(queries=0, p95_ms=STATIC_MS),
+        "home_older": Budget(queries=0, p95_ms=STATIC_MS),
+        "notepad": Budget(queries=0, p95_ms=STATIC_MS),
+        "calculator": Budget(queries=0, p95_ms=STATIC_MS),
+        "mycomputer": Budget(queries=0, p95_ms=STATIC_MS),
+        "recycle": Budget(queries=1, p95_ms=PAGE_MS),
+        "projects": Budget(queries=2, p95_ms=PAGE_MS),
+        "project_detail": Budget(queries=1, p95_ms=API_MS),
+        "api_bootstrap": Budget(queries=6, p95_ms=API_MS),
+        "api_preferences": Budget(queries=2, p95_ms=API_MS),
+        "api_run_history": Budget(queries=2, p95_ms=API_MS),
+        "api_desktop_items": Budget(queries=2, p95_ms=API_MS),
+        # select_for_update read + bulk_update + change event, inside a savepoint pair
+        "api_desktop_items_sync": Budget(queries=5, p95_ms=API_MS, method="post", data=_move_first_desktop_item),
+        # the item and its change event
+        "api_desktop_items_template": Budget(queries=2, p95_ms=API_MS, method="post", data={"key": "house"}),
+        "api_themes": Budget(queries=1, p95_ms=API_MS),
+        "api_notes": Budget(queries=2, p95_ms=API_MS),
+        # 204 outside ASGI; the stream itself is covered by ChangeStreamTests
+        "api_events": Budget(queries=0, p95_ms=STATIC_MS, status=204),
+        "api_cache_stats": Budget(queries=0, p95_ms=API_MS, headers=OPERATOR),
+        "metrics": Budget(queries=0, p95_ms=API_MS, headers=OPERATOR),
+    }
+
+    def route_kwargs(self, name, params):
+        return {"pk": Project.objects.order_by("pk").values_list("pk", flat=True).first()}
+
+
+class ConditionalApiTests(TestCase):
+    def setUp(self):
+        Note.objects.create(title="first")
+        self.url = reverse("pages:api_notes")
+
+    def test_matching_etag_is_answered_with_304_before_the_payload_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(self.url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_if_modified_since_alone_never_gets_a_304(self):
+        response = self.client.get(self.url)
+        # Lands in the same second as the first note, so the HTTP date doesn't move.
+        Note.objects.create(title="second")
+        Note.objects.filter(title="second").update(updated_at=Note.objects.get(title="first").updated_at)
+        stale = self.client.get(self.url, headers={"if-modified-since": response["Last-Modified"]})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale["Last-Modified"], response["Last-Modified"])
+        self.assertEqual(len(stale.json()["results"]), 2)
+        current = self.client.get(self.url, headers={"if-modified-since": stale["Last-Modified"],
+                                                     "if-none-match": stale["ETag"]})
+        self.assertEqual(current.status_code, 304)
+
+    def test_a_change_or_another_query_string_gets_a_new_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertNotEqual(self.client.get(self.url, {"limit": 1})["ETag"], etag)
+        Note.objects.create(title="second")
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class OptimizeDbTests(TestCase):
+    def test_view_queries_use_indexes_on_scaled_data(self):
+        # The planner reads every table whole while it is tiny; plans only diverge once there is data.
+        call_command("populate_db", scale=1000, verbosity=0, stdout=StringIO())
+        out = StringIO()
+        call_command("optimize_db", stdout=out)
+        self.assertIn("use an index or read their table whole", out.getvalue())
+
+    def test_command_is_registered_by_pages_and_reports_pragmas(self):
+        # A commands package outside an installed app is never discovered.
+        self.assertEqual(get_commands()["optimize_db"], "pages")
+        out = StringIO()
+        call_command("optimize_db", stdout=out)
+        for name in ("synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store"):
+            self.assertRegex(out.getvalue(), rf"\n  {name} +\S+")
+        self.assertIn("busy_timeout  5000 (configured: 5000)", out.getvalue())
+
+    def test_post_only_views_are_not_requested(self):
+        names = {name for name, _ in optimize_db.view_routes()}
+        self.assertIn("pages:api_notes", names)
+        self.assertNotIn("pages:api_desktop_items_sync", names)
+        self.assertNotIn("pages:api_desktop_items_template", names)
+
+    def test_scans_of_near_empty_tables_are_not_reported(self):
+        DesktopItem.objects.create(label="Only", item_type="folder")
+        out = StringIO()
+        call_command("optimize_db", stdout=out)
+        self.assertIn("use an index or read their table whole", out.getvalue())
+        sql = 'SELECT "id" FROM "pages_desktopitem" WHERE "id" > 0'
+        plan = ["SCAN pages_desktopitem"]
+        self.assertEqual(sqlite_tuning.table_scans(sql, plan, {"pages_desktopitem": 1}), [])
+        self.assertEqual(sqlite_tuning.table_scans(sql, plan, {"pages_desktopitem": 5000}), ["pages_desktopitem"])
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.notes = [Note.objects.create(title=f"n{i}", content=f"body {i}") for i in range(5)]
+        # Two rows share a timestamp so the id tie-breaker is exercised.
+        Note.objects.filter(pk__in=[self.notes[1].pk, self.notes[2].pk]).update(updated_at=self.notes[1].updated_at)
+
+    def test_cursor_walks_every_row_once_in_order(self):
+        live = Note.objects.filter(is_deleted=False)
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(live, "updated_at", ["id", "updated_at"], 2, cursor)
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+            self.assertEqual(decode_cursor(cursor)[1], seen[-1])
+        expected = list(live.order_by("-updated_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_bad_cursor_and_limit_are_400(self):
+        url = reverse("pages:api_notes")
+        for query in ({"cursor": "not-a-cursor"}, {"cursor": "bm9waXBl"}, {"limit": "ten"}, {"fields": "title,secret"}):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(url, query).status_code, 400)
+
+    def test_limit_is_clamped(self):
+        for raw, expected in (("0", 1), ("-5", 1), ("7", 7), ("100000", MAX_LIMIT), ("", DEFAULT_LIMIT)):
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_limit(self.factory.get("/", {"limit": raw})), expected)
+
+    def test_required_fields_are_always_selected(self):
+        request = self.factory.get("/", {"fields": "title"})
+        self.assertEqual(parse_fields(request, NOTE_FIELDS, required=("id", "updated_at")), ["id", "title", "updated_at"])
+        self.assertEqual(parse_fields(self.factory.get("/"), NOTE_FIELDS), list(NOTE_FIELDS))
+        rows = self.client.get(reverse("pages:api_notes"), {"fields": "title", "limit": 1}).json()["results"]
+        self.assertEqual(set(rows[0]), {"id", "title", "updated_at"})
+
+    def test_single_note_lookup_reaches_past_the_first_page(self):
+        oldest = self.notes[0]
+        Note.objects.bulk_create(Note(title=f"newer {i}") for i in range(MAX_LIMIT))
+        url = reverse("pages:api_notes")
+        note = self.client.get(url, {"id": oldest.pk, "fields": "content"}).json()
+        self.assertEqual((set(note), note["id"], note["content"]), ({"id", "content", "updated_at"}, oldest.pk, "body 0"))
+        Note.objects.filter(pk=oldest.pk).update(is_deleted=True)
+        self.assertEqual(self.client.get(url, {"id": oldest.pk}).status_code, 404)
+        self.assertEqual(self.client.get(url, {"id": "x"}).status_code, 400)
+
+
+class DesktopBootstrapTests(TestCase):
+    @override_settings(DESKTOP_ITEMS_PAGE_SIZE=3)
+    def test_bootstrap_inlines_one_page_and_the_api_serves_the_rest(self):
+        DesktopItem.objects.bulk_create(DesktopItem(label=f"item {i}") for i in range(7))
+        ids = list(DesktopItem.objects.order_by("id").values_list("id", flat=True))
+        boot = self.client.get(reverse("pages:api_bootstrap")).json()
+        self.assertEqual([row["id"] for row in boot["desktop_items"]], ids[:3])
+
+        seen, after = [], boot["desktop_items_next"]
+        while after:
+            page = self.client.get(reverse("pages:api_desktop_items"), {"after": after}).json()
+            seen += [row["id"] for row in page["results"]]
+            after = page["next_after"]
+        self.assertEqual(seen, ids[3:])
+        self.assertEqual(self.client.get(reverse("pages:api_desktop_items"), {"after": "x"}).status_code, 400)
+
+
+class RunHistoryWriteBehindTests(TestCase):
+    def setUp(self):
+        spool = tempfile.mkdtemp(prefix="pixel-spool-")
+        self.addCleanup(shutil.rmtree, spool, ignore_errors=True)
+        # Flush by hand: the background thread's connection cannot see this test's transaction.
+        overrides = override_settings(RUN_HISTORY_WRITE_BEHIND=True, RUN_HISTORY_SPOOL_DIR=spool,
+                                      RUN_HISTORY_BATCH_SIZE=1000, RUN_HISTORY_FLUSH_INTERVAL=3600)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_post_returns_the_stored_id_without_write_behind(self):
+        with override_settings(RUN_HISTORY_WRITE_BEHIND=False):
+            response = self.client.post(reverse("pages:api_run_history"), {"command": "dir"},
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RunHistory.objects.get().pk, response.json()["id"])
+        self.assertNotIn("queued", response.json())
+
+    def test_post_is_acknowledged_then_written_in_a_batch(self):
+        for command in ("dir", "ver"):
+            response = self.client.post(reverse("pages:api_run_history"), {"command": command},
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 202)
+        self.assertFalse(RunHistory.objects.exists())
+        self.assertEqual(write_behind.run_history.flush(), 2)
+        self.assertEqual(sorted(RunHistory.objects.values_list("command", flat=True)), ["dir", "ver"])
+
+    def test_spools_of_dead_processes_are_replayed(self):
+        exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                capture_output=True, text=True, check=True)
+        directory = write_behind.spool_dir()
+        row = {"result": "", "created_at": timezone.now().isoformat()}
+        # A crashed worker, and an earlier process whose pid this one has reused.
+        (directory / f"{exited.stdout.strip()}-1.jsonl").write_text(json.dumps(dict(row, command="dead")) + "\n")
+        (directory / f"{os.getpid()}-1.jsonl").write_text(json.dumps(dict(row, command="reused")) + "\n")
+        self.assertEqual(write_behind.replay_orphaned_spools(own=directory / f"{os.getpid()}-2.jsonl"), 2)
+        self.assertEqual(sorted(RunHistory.objects.values_list("command", flat=True)), ["dead", "reused"])
+        self.assertEqual(list(directory.glob("*.jsonl")), [])
+
+    def test_compact_applies_retention_and_row_cap(self):
+        now = timezone.now()
+        RunHistory.objects.bulk_create(
+            RunHistory(command=f"c{i}", created_at=now - timedelta(days=i)) for i in range(10)
+        )
+        with override_settings(RUN_HISTORY_RETENTION_DAYS=7, RUN_HISTORY_MAX_ROWS=5):
+            self.assertEqual(write_behind.compact(now), 5)
+        self.assertEqual(sorted(RunHistory.objects.values_list("command", flat=True)), [f"c{i}" for i in range(5)])
+
+
+class DesktopItemSyncTests(TestCase):
+    def setUp(self):
+        self.first = DesktopItem.objects.create(label="Docs", pos_x=1, pos_y=1)
+        self.second = DesktopItem.objects.create(label="Games", pos_x=2, pos_y=2)
+
+    def sync(self, items):
+        return self.client.post(reverse("pages:api_desktop_items_sync"), {"items": items},
+                                content_type="application/json")
+
+    def test_batched_moves_are_coalesced_and_applied(self):
+        response = self.sync([
+            {"id": self.first.pk, "pos_x": 10, "pos_y": 10},
+            {"id": self.second.pk, "pos_x": 30, "pos_y": 40},
+            {"id": self.first.pk, "pos_x": 50, "pos_y": 60},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["conflicts"], [])
+        self.assertEqual(sorted(row["id"] for row in response.json()["results"]), [self.first.pk, self.second.pk])
+        self.assertEqual(
+            list(DesktopItem.objects.order_by("pk").values_list("pos_x", "pos_y")), [(50, 60), (30, 40)]
+        )
+
+    def test_stale_version_is_a_conflict_and_left_untouched(self):
+        seen = self.first.updated_at - timedelta(seconds=5)
+        response = self.sync([{"id": self.first.pk, "pos_x": 99, "updated_at": seen.isoformat()}])
+        conflict, = response.json()["conflicts"]
+        self.assertEqual((conflict["id"], conflict["reason"]), (self.first.pk, "stale"))
+        self.assertEqual(conflict["current"]["pos_x"], 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.pos_x, 1)
+
+        current = self.sync([{"id": self.first.pk, "pos_x": 99, "updated_at": self.first.updated_at.isoformat()}])
+        self.assertEqual(current.json()["conflicts"], [])
+
+    def test_listed_version_round_trips_through_sync(self):
+        # What the desktop sees on load and echoes with each move.
+        listed = {row["id"]: row for row in self.client.get(reverse("pages:api_desktop_items")).json()["results"]}
+        seen = listed[self.first.pk]["updated_at"]
+        moved = self.sync([{"id": self.first.pk, "pos_x": 5, "updated_at": seen}]).json()
+        self.assertEqual(moved["conflicts"], [])
+        # A second tab still holding the listed version is refused.
+        again = self.sync([{"id": self.first.pk, "pos_x": 6, "updated_at": seen}]).json()
+        self.assertEqual(again["conflicts"][0]["reason"], "stale")
+        newer = self.sync([{"id": self.first.pk, "pos_x": 6, "updated_at": moved["results"][0]["updated_at"]}])
+        self.assertEqual(newer.json()["conflicts"], [])
+
+    def test_unknown_and_invalid_ids_do_not_fail_the_batch(self):
+        response = self.sync([{"id": 999999, "pos_x": 1}, {"id": "x"}, {"id": self.second.pk, "pos_x": 7}])
+        self.assertEqual(response.status_code, 200)
+        reasons = sorted((str(c["id"]), c["reason"]) for c in response.json()["conflicts"])
+        self.assertEqual(reasons, [("999999", "not_found"), ("x", "invalid")])
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.pos_x, 7)
+
+    def test_malformed_body_is_rejected(self):
+        url = reverse("pages:api_desktop_items_sync")
+        for body in ("not json", json.dumps({"items": {"id": 1}}), json.dumps([1])):
+            with self.subTest(body=body):
+                response = self.client.post(url, body, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+
+    def test_beacon_form_body_is_accepted(self):
+        # What navigator.sendBeacon posts on pagehide
+        response = self.client.post(reverse("pages:api_desktop_items_sync"),
+                                    {"items": json.dumps([{"id": self.first.pk, "pos_y": 80}])})
+        self.assertEqual(response.status_code, 200)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.pos_y, 80)
+
+
+# The background re-render runs on its own connection, so rows must be committed.
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "render-cache-tests"}},
+    PAGE_CACHE_ALIAS="default", PAGE_CACHE_ENABLED=True, PAGE_CACHE_STALE_WHILE_REVALIDATE=True,
+)
+class RenderCacheTests(TransactionTestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title="Quest", objective="o", description="d", reward="r")
+        self.detail = reverse("showcase:project_detail", kwargs={"pk": self.project.pk})
+
+    def get(self, url):
+        response = self.client.get(url)
+        for thread in threading.enumerate():
+            if thread.name == "page-cache-refresh":
+                thread.join(5)
+        return response
+
+    def test_saving_a_dependency_invalidates_the_page(self):
+        self.assertEqual(self.get(self.detail)["X-Page-Cache"], "MISS")
+        self.assertEqual(self.get(self.detail)["X-Page-Cache"], "HIT")
+        self.project.title = "Renamed"
+        self.project.save()
+        with override_settings(PAGE_CACHE_STALE_WHILE_REVALIDATE=False):
+            response = self.get(self.detail)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "RENAMED")
+
+    def test_stale_page_is_served_then_refreshed(self):
+        self.get(self.detail)
+        Project.objects.filter(pk=self.project.pk).update(title="Renamed")
+        render_cache.bump("showcase.Project")
+        stale = self.get(self.detail)
+        self.assertEqual(stale["X-Page-Cache"], "STALE")
+        self.assertNotContains(stale, "RENAMED")
+        fresh = self.get(self.detail)
+        self.assertEqual(fresh["X-Page-Cache"], "HIT")
+        self.assertContains(fresh, "RENAMED")
+
+    def test_deleted_page_is_evicted_then_404(self):
+        self.get(self.detail)
+        self.project.delete()
+        self.assertEqual(self.get(self.detail)["X-Page-Cache"], "STALE")
+        self.assertEqual(self.get(self.detail).status_code, 404)
+        self.assertEqual(self.get(self.detail).status_code, 404)
+
+    def test_entry_past_the_max_stale_age_is_rendered_inline(self):
+        self.get(self.detail)
+        Project.objects.filter(pk=self.project.pk).update(title="Renamed")
+        render_cache.bump("showcase.Project")
+        with override_settings(PAGE_CACHE_MAX_STALE_SECONDS=0):
+            response = self.get(self.detail)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "RENAMED")
+
+
+class AsyncApiTests(TestCase):
+    async def test_json_apis_are_served_by_async_views(self):
+        for name in ("api_preferences", "api_themes", "api_desktop_items", "api_notes", "api_run_history"):
+            with self.subTest(name=name):
+                self.assertTrue(iscoroutinefunction(resolve(reverse(f"pages:{name}")).func))
+                response = await self.async_client.get(reverse(f"pages:{name}"))
+                self.assertEqual(response.status_code, 200)
+
+    async def test_async_write_then_read(self):
+        created = await self.async_client.post(reverse("pages:api_notes"), {"title": "todo"},
+                                               content_type="application/json")
+        response = await self.async_client.get(reverse("pages:api_notes"))
+        self.assertEqual([row["id"] for row in response.json()["results"]], [created.json()["id"]])
+
+
+@override_settings(EVENTS_POLL_INTERVAL=0.05)
+class ChangeStreamTests(TestCase):
+    async def test_saved_note_is_streamed(self):
+        frames = events.stream()
+        try:
+            self.assertTrue((await anext(frames)).startswith(b"retry:"))
+            self.assertIn(b"event: ready", await anext(frames))
+            note = await Note.objects.acreate(title="hello")
+            frame = await asyncio.wait_for(anext(frames), 5)
+        finally:
+            await frames.aclose()
+        self.assertIn(b"event: change", frame)
+        self.assertIn(f'"resource": "notes", "action": "upsert", "id": {note.pk}'.encode(), frame)
+
+    async def test_reconnect_replays_missed_events(self):
+        await Note.objects.acreate(title="seen")
+        seen = await ChangeEvent.objects.order_by("-id").values_list("id", flat=True).afirst()
+        missed = await Note.objects.acreate(title="missed")
+        frames = events.stream(last_event_id=str(seen))
+        try:
+            await anext(frames)
+            replayed = await anext(frames)
+            ready = await anext(frames)
+        finally:
+            await frames.aclose()
+        self.assertIn(f'"id": {missed.pk}'.encode(), replayed)
+        self.assertIn(b"event: ready", ready)
+
+
+class ChangeEventPruningTests(TestCase):
+    @override_settings(EVENTS_RETAIN=3, EVENTS_PRUNE_INTERVAL=0)
+    def test_writes_prune_to_the_newest_rows_whatever_their_ids(self):
+        # bulk_create ids never land on a multiple of any step
+        DesktopItem.objects.bulk_create(DesktopItem(label=f"i{i}") for i in range(7))
+        events.publish_many(DesktopItem.objects.all())
+        Note.objects.create(title="last")
+        self.assertEqual(ChangeEvent.objects.count(), 3)
+        self.assertEqual(ChangeEvent.objects.order_by("-id").first().resource, "notes")
+
+    @override_settings(EVENTS_RETAIN=0, EVENTS_MAX_AGE=60)
+    def test_prune_drops_events_past_the_max_age(self):
+        Note.objects.create(title="old")
+        Note.objects.create(title="new")
+        ChangeEvent.objects.filter(data__title="old").update(created_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(events.prune(), 1)
+        self.assertEqual(list(ChangeEvent.objects.values_list("data__title", flat=True)), ["new"])
+
+    @override_settings(EVENTS_ENABLED=False)
+    def test_nothing_is_recorded_when_the_stream_is_off(self):
+        Note.objects.create(title="quiet")
+        events.publish_many(DesktopItem.objects.bulk_create([DesktopItem(label="x")]))
+        self.assertFalse(ChangeEvent.objects.exists())
+        self.assertEqual(self.client.get(reverse("pages:api_events")).status_code, 204)
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=media, IMAGE_DERIVATIVES_SYNC=True,
+                                      IMAGE_DERIVATIVE_WIDTHS=(100, 200))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.media = Path(media)
+
+    def upload(self, width=150, height=75):
+        buf = BytesIO()
+        Image.new("RGB", (width, height), (200, 40, 40)).save(buf, format="PNG")
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                title="Quest", objective="o", description="d", reward="r",
+                image=SimpleUploadedFile("quest.png", buf.getvalue(), content_type="image/png"),
+            )
+        project.refresh_from_db()
+        return project
+
+    def test_derivatives_are_written_per_format_without_upscaling(self):
+        project = self.upload()
+        variants = project.image_variants
+        self.assertEqual(variants["source"], project.image.name)
+        self.assertEqual(variants["width"], 150)
+        self.assertIn("jpeg", variants["formats"])
+        for fmt in variants["formats"].values():
+            self.assertEqual([f["width"] for f in fmt["files"]], [100, 150])
+            for entry in fmt["files"]:
+                self.assertTrue((self.media / entry["name"]).is_file())
+                self.assertIn(f".{variants['hash']}.{entry['width']}w.", entry["name"])
+        with Image.open(self.media / variants["formats"]["jpeg"]["files"][0]["name"]) as img:
+            self.assertEqual(img.size, (100, 50))
+
+    def test_picture_lists_every_derivative_in_srcset(self):
+        project = self.upload()
+        html = media_tags.picture(project.image, project.image_variants, sizes="50vw", alt="Quest")
+        jpeg = project.image_variants["formats"]["jpeg"]["files"]
+        self.assertIn(f'srcset="/media/{jpeg[0]["name"]} 100w, /media/{jpeg[1]["name"]} 150w"', html)
+        self.assertIn(f'<img src="/media/{jpeg[1]["name"]}"', html)
+        self.assertIn('sizes="50vw"', html)
+        self.assertIn('alt="Quest"', html)
+        for ext, fmt in project.image_variants["formats"].items():
+            if ext != "jpeg":
+                self.assertIn(f'<source type="{fmt["type"]}"', html)
+
+    def test_picture_falls_back_to_the_original_until_derivatives_exist(self):
+        project = self.upload()
+        html = media_tags.picture(project.image, {})
+        self.assertEqual(html, f'<img src="/media/{project.image.name}" loading="lazy">')
+
+
+class StaticAssetTests(TestCase):
+    def test_theme_bundle_written_after_startup_is_served_immutable(self):
+        root = tempfile.mkdtemp(prefix="pixel-static-")
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        themes = Path(root) / "themes"
+        themes.mkdir()
+        with override_settings(STATIC_ROOT=root, THEME_CSS_DIR=themes):
+            middleware = WhiteNoiseMiddleware(lambda request: HttpResponseNotFound())
+            (themes / "retro.0123456789ab.css").write_text(":root{--bg:#000}\n")
+            (themes / "retro.css").write_text(":root{--bg:#000}\n")
+            bundle = middleware(RequestFactory().get("/static/themes/retro.0123456789ab.css"))
+            unhashed = middleware(RequestFactory().get("/static/themes/retro.css"))
+        self.assertEqual(bundle.status_code, 200)
+        self.assertIn("immutable", bundle["Cache-Control"])
+        bundle.close()
+        self.assertEqual(unhashed.status_code, 404)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "theme-catalog-tests"}},
+    THEME_CACHE_ALIAS="default", THEME_CSS_AUTOBUILD=False,
+)
+class ThemeCatalogTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.theme = Theme.objects.create(key="amber", name="Amber", variables={"--bg": "#000"})
+
+    def names(self, catalog):
+        return [row["name"] for row in json.loads(catalog.get().body)["results"]]
+
+    def test_saving_a_theme_invalidates_this_process_at_once(self):
+        self.assertIn("Amber", self.names(theme_catalog))
+        self.theme.name = "Amber CRT"
+        self.theme.save()
+        self.assertIn("Amber CRT", self.names(theme_catalog))
+        self.theme.delete()
+        self.assertNotIn("Amber CRT", self.names(theme_catalog))
+
+    def test_other_processes_pick_up_the_new_generation_after_their_local_ttl(self):
+        # Another worker: its own local LRU in front of the same shared cache.
+        other = ThemeCatalogCache()
+        with override_settings(THEME_CACHE_LOCAL_TTL=3600):
+            before = other.get()
+            self.theme.name = "Amber CRT"
+            self.theme.save()
+            self.assertIs(other.get(), before)
+        with override_settings(THEME_CACHE_LOCAL_TTL=0):
+            self.assertIn("Amber CRT", self.names(other))
+            self.assertEqual(other.stats()["misses"], 2)
+
+
+class ThemeCssTests(TestCase):
+    def test_home_links_the_hashed_bundle_of_the_saved_theme(self):
+        themes = tempfile.mkdtemp(prefix="pixel-themes-")
+        self.addCleanup(shutil.rmtree, themes, ignore_errors=True)
+        with override_settings(THEME_CSS_DIR=themes, THEME_CSS_AUTOBUILD=True):
+            theme, _ = Theme.objects.update_or_create(key="retro-98", defaults={"name": "Retro", "variables": {"--bg": "#000"}})
+            first = re.search(r'id="theme-css" href="([^"]+)"', self.client.get(reverse("pages:home")).content.decode())
+            theme.variables = {"--bg": "#fff"}
+            theme.save()
+            second = re.search(r'id="theme-css" href="([^"]+)"', self.client.get(reverse("pages:home")).content.decode())
+        self.assertRegex(first.group(1), r"/themes/retro-98\.[0-9a-f]{12}\.css$")
+        self.assertRegex(second.group(1), r"/themes/retro-98\.[0-9a-f]{12}\.css$")
+        self.assertNotEqual(first.group(1), second.group(1))
+        self.assertEqual((Path(themes) / Path(second.group(1)).name).read_text(), ":root{--bg:#fff}\n")
+
+
+class AssetBundleTests(TestCase):
+    def test_js_minifier_keeps_statement_breaks_and_drops_logging(self):
+        source = "// setup\nlet a = 1\nlet b = a\n/* note */\nconsole.log(`a=${a}`, {b})\nreturn /x\\/y/g.test(s) ? 'a // b' : b\n"
+        self.assertEqual(assets.minify_js(source), "let a=1\nlet b=a\nvoid 0\nreturn/x\\/y/g.test(s)?'a // b':b\n")
+
+    def test_css_pruning_drops_rules_nothing_refers_to(self):
+        used = assets.UsedNames(['<div class="window theme-x">', "el.classList.add('is-' + state)"])
+        css = """
+            .window, .ghost { color: red; }
+            .ghost:hover { color: blue; }
+            @media (max-width: 768px) { .ghost { display: none } .is-open > a:not(.ghost) { animation: spin 1s } }
+            @keyframes spin { from { opacity: 0 } }
+            @keyframes unused { to { opacity: 1 } }
+        """
+        stats = {}
+        self.assertEqual(
+            assets.minify_css(css, used, stats),
+            ".window{color:red}@media (max-width:768px){.is-open>a:not(.ghost){animation:spin 1s}}"
+            "@keyframes spin{from{opacity:0}}",
+        )
+        self.assertEqual(stats, {"rules": 4, "removed": 3})
+
+    @override_settings(ASSET_BUNDLES_ENABLED=False)
+    def test_home_defers_its_code_and_lists_the_desktop_apps_to_load_on_demand(self):
+        html = self.client.get(reverse("pages:home")).content.decode()
+        self.assertIn('<script src="/static/js/desktop/core.js" defer></script>', html)
+        self.assertIn('<link rel="preload" as="style" href="/static/css/desktop.css"', html)
+        self.assertNotIn("function openWindow", html)
+        modules = json.loads(re.search(r'<script id="desktop-modules"[^>]*>(.*?)</script>', html).group(1))
+        self.assertEqual(set(modules), {"desktop-notepad", "desktop-calculator", "desktop-wallpapers",
+                                        "desktop-run", "desktop-windows"})
+        self.assertEqual(modules["desktop-run"], ["/static/js/desktop/run.js"])
+
+
+class ExportFingerprintTests(TestCase):
+    def test_fingerprint_follows_extends_includes_and_bundle_sources(self):
+        root = Path(tempfile.mkdtemp(prefix="pixel-export-"))
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        (root / "templates").mkdir()
+        (root / "static" / "js").mkdir(parents=True)
+        (root / "templates" / "base.html").write_text("{% load asset_tags %}{% asset_bundle 'page' 'js' %}{% block body %}{% endblock %}")
+        (root / "templates" / "page.html").write_text('{% extends "base.html" %}{% block body %}{% include "part.html" %}{% endblock %}')
+        (root / "templates" / "part.html").write_text("<p>one</p>")
+        (root / "static" / "js" / "page.js").write_text("var a = 1;")
+        template_settings = [{"BACKEND": "django.template.backends.django.DjangoTemplates",
+                              "DIRS": [root / "templates"], "APP_DIRS": True}]
+
+        def fingerprint():
+            # A fresh engine each time, so its cached loader reads the edited files.
+            with override_settings(TEMPLATES=template_settings, STATICFILES_DIRS=[root / "static"],
+                                   ASSET_BUNDLES={"page": {"js": ["js/page.js"]}}, ASSET_BUNDLES_ENABLED=False):
+                return export_static.template_fingerprint("page.html")
+
+        first = fingerprint()
+        self.assertEqual(fingerprint(), first)
+        (root / "templates" / "part.html").write_text("<p>two</p>")
+        second = fingerprint()
+        self.assertNotEqual(second, first)
+        (root / "static" / "js" / "page.js").write_text("var a = 2;")
+        self.assertNotEqual(fingerprint(), second)
+
+    def test_recycle_fingerprint_only_follows_deleted_notes(self):
+        live = Note.objects.create(title="live", content="x")
+        binned = Note.objects.create(title="binned", content="x", is_deleted=True)
+        first = export_static.model_fingerprint("pages.Note", {"is_deleted": True})
+        live.content = "edited"
+        live.save()
+        self.assertEqual(export_static.model_fingerprint("pages.Note", {"is_deleted": True}), first)
+        binned.content = "edited"
+        binned.save()
+        self.assertNotEqual(export_static.model_fingerprint("pages.Note", {"is_deleted": True}), first)
+
+
+class WarmUpTests(TestCase):
+    def test_warm_up_fills_the_cached_loader_and_connects(self):
+        loader = engines["django"].engine.template_loaders[0]
+        loader.reset()
+        summary = warmup.warm_up()
+        self.assertEqual(summary["failed"], [])
+        self.assertIn("pages/home.html", loader.get_template_cache)
+        self.assertIn("showcase/projects.html", loader.get_template_cache)
+        self.assertEqual(summary["databases"], ["default"])
+        self.assertIsNotNone(connection.connection)
+
+
+class BenchmarkTests(TestCase):
+    def benchmark(self, *args):
+        # In a child process: the command creates and destroys its own database.
+        return subprocess.run(
+            [sys.executable, "manage.py", "benchmark", "--scales", "5,20", "--only", "home", "api_notes",
+             "--requests", "5", "--warmup", "1", *args],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+
+    def test_compare_flags_regressions_beyond_threshold_and_noise_floor(self):
+        baseline = {"100": {"home": {"p95_ms": 10.0, "rps": 200.0, "alloc_kib": 100.0},
+                            "gone": {"p95_ms": 1.0}}}
+        current = {"100": {"home": {"p95_ms": 20.0, "rps": 190.0, "alloc_kib": 150.0},
+                           "new": {"p95_ms": 99.0}},
+                   "1000": {"home": {"p95_ms": 99.0}}}
+        found = {(name, metric) for _, name, metric, *_ in benchmarking.compare(baseline, current, 0.15)}
+        self.assertEqual(found, {("home", "p95_ms"), ("home", "alloc_kib")})
+        # 10 -> 10.5 ms is 5% but under the 1 ms floor either way.
+        quiet = {"100": {"home": {"p95_ms": 10.5, "rps": 200.0, "alloc_kib": 100.0}}}
+        self.assertEqual(benchmarking.compare(baseline, quiet, 0.01), [])
+
+    def test_saved_baseline_gates_a_later_run(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        path = os.path.join(tmp, "baseline.json")
+        run = self.benchmark("--save", path)
+        self.assertEqual(run.returncode, 0, run.stderr)
+        with open(path, encoding="utf-8") as fh:
+            saved = json.load(fh)
+        self.assertEqual(sorted(saved["results"]), ["20", "5"])
+        self.assertEqual(sorted(saved["results"]["20"]), ["api_notes", "home"])
+        self.assertEqual(saved["meta"]["requests"], 5)
+
+        def doctored(factor):
+            results = {scale: {name: {metric: value * (factor if metric != "rps" else 1 / factor)
+                                      for metric, value in values.items() if value is not None}
+                               for name, values in benchmarks.items()}
+                       for scale, benchmarks in saved["results"].items()}
+            doctored_path = os.path.join(tmp, f"x{factor}.json")
+            with open(doctored_path, "w", encoding="utf-8") as fh:
+                json.dump({"results": results}, fh)
+            return doctored_path
+
+        slower = self.benchmark("--compare", doctored(10))
+        self.assertEqual(slower.returncode, 0, slower.stderr)
+        self.assertIn("No regressions", slower.stdout)
+        faster = self.benchmark("--compare", doctored(0.1))
+        self.assertNotEqual(faster.returncode, 0)
+        self.assertIn("regression(s) beyond 15%", faster.stderr)
+        self.assertIn("scale 20 home: p95_ms", faster.stdout)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        Project.objects.create(title="Quest", objective="o", description="d", reward="r")
+        dumps = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dumps, ignore_errors=True)
+        overrides = override_settings(PROFILING_TOKEN="secret", PROFILING_DIR=dumps, PROFILING_MAX_FILES=2,
+                                      PAGE_CACHE_ENABLED=False, DEBUG=False)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.dumps = Path(dumps)
+        self.url = reverse("showcase:projects")
+
+    def test_requests_are_not_profiled_unless_selected(self):
+        self.assertNotIn("Server-Timing", self.client.get(self.url))
+        self.assertNotIn("Server-Timing", self.client.get(self.url, HTTP_X_PROFILE="guess"))
+        self.assertEqual(list(self.dumps.glob("*.prof")), [])
+
+    def test_debug_only_accepts_an_explicit_header_value(self):
+        with override_settings(DEBUG=True, PROFILING_DUMP=False):
+            self.assertNotIn("Server-Timing", self.client.get(self.url, HTTP_X_PROFILE="guess"))
+            self.assertNotIn("Server-Timing", self.client.get(self.url, HTTP_X_PROFILE=""))
+            self.assertIn("Server-Timing", self.client.get(self.url, HTTP_X_PROFILE="1"))
+            self.assertIn("Server-Timing", self.client.get(self.url, HTTP_X_PROFILE="cprofile"))
+
+    def test_template_timer_is_only_installed_when_profiling_is_possible(self):
+        with override_settings(PROFILING_TOKEN=""):
+            self.assertFalse(profiling.can_profile())
+        self.assertTrue(profiling.can_profile())
+        with override_settings(PROFILING_TOKEN="", DEBUG=True):
+            self.assertTrue(profiling.can_profile())
+
+    def test_selected_request_reports_server_timing_and_writes_a_dump(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE="secret")
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        queries = int(re.search(r'desc="SQL \((\d+) queries\)"', timing).group(1))
+        self.assertGreater(queries, 0)
+        self.assertGreater(float(re.search(r"tpl;dur=([\d.]+)", timing).group(1)), 0)
+        self.assertIn('mem;desc="Peak alloc', timing)
+        [dump] = self.dumps.glob("*.prof")
+        self.assertIn("-GET-showcase-projects-", dump.name)
+        stats = pstats.Stats(str(dump), stream=StringIO())
+        self.assertTrue(any(func == "render" for _, _, func in stats.stats))
+
+    def test_dumps_are_rotated(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_TRACEMALLOC=False):
+            for _ in range(3):
+                response = self.client.get(self.url)
+        self.assertNotIn("mem;", response["Server-Timing"])
+        self.assertEqual(len(list(self.dumps.glob("*.prof"))), 2)
+
+
+class MetricsAggregationTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        overrides = override_settings(METRICS_DIR=directory, METRICS_TOKEN="operator")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.directory = Path(directory)
+
+    def write(self, name, requests, hits=0, misses=0):
+        rows = [["pixel_http_requests_total", [["method", "GET"], ["route", "other:worker"], ["status", "200"]],
+                 requests]]
+        for result, value in (("hit", hits), ("miss", misses)):
+            rows.append(["pixel_cache_lookups_total", [["cache", "worker_test"], ["result", result]], value])
+        (self.directory / name).write_text(json.dumps(rows))
+
+    def scrape(self):
+        response = self.client.get(reverse("pages:metrics"), headers=OPERATOR)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def test_scrape_sums_live_exited_and_archived_workers(self):
+        exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                capture_output=True, text=True, check=True)
+        live = f"{os.getppid()}-1.json"
+        dead = f"{exited.stdout.strip()}-1.json"
+        self.write(live, 3, hits=3, misses=1)
+        self.write(dead, 4, hits=1, misses=3)
+        self.write(metrics.ARCHIVE, 5)
+        series = 'pixel_http_requests_total{method="GET",route="other:worker",status="200"} 12'
+
+        text = self.scrape()
+        self.assertIn(series, text)
+        self.assertIn('pixel_cache_hit_ratio{cache="worker_test"} 0.5', text)
+        self.assertIn("# TYPE pixel_http_requests_total counter", text)
+        # This process's own file is written by the scrape too.
+        self.assertIn('route="pages:metrics"', self.scrape())
+        # The exited worker was folded into the archive once, not counted twice.
+        self.assertFalse((self.directory / dead).exists())
+        self.assertTrue((self.directory / live).exists())
+        self.assertIn(series, self.scrape())
+
+    def test_token_is_required_when_set(self):
+        for name in ("pages:metrics", "pages:api_cache_stats"):
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 401)
+                self.assertEqual(self.client.get(reverse(name), headers={"Authorization": "Bearer guess"}).status_code, 401)
+                self.assertEqual(self.client.get(reverse(name), headers=OPERATOR).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_without_a_token_only_debug_serves_them(self):
+        for name in ("pages:metrics", "pages:api_cache_stats"):
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 403)
+                with override_settings(DEBUG=True):
+                    self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+
+class StartupProfileTests(TestCase):
+    IMPORTTIME = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "startup-profile phase: apps",
+        "import time:      3000 |       3000 |     PIL.ExifTags",
+        "import time:     20000 |      23000 |   PIL.Image",
+        "import time:       100 |        100 |   django.db.models.signals",
+        "import time:       400 |      23500 | pages.images",
+        "startup-profile phase: first_request",
+        "import time:      9000 |       9000 |   markdown",
+        "import time:       200 |       9200 | pages.views_extra",
+    ])
+
+    def test_importtime_entries_get_their_phase_and_importer(self):
+        entries = {e["module"]: e for e in startup.parse_importtime(self.IMPORTTIME)}
+        self.assertEqual(entries["PIL.ExifTags"]["parent"], "PIL.Image")
+        self.assertEqual(entries["PIL.Image"]["parent"], "pages.images")
+        self.assertIsNone(entries["pages.images"]["parent"])
+        self.assertEqual(entries["markdown"]["phase"], "first_request")
+
+    def test_only_costly_startup_imports_by_project_code_are_deferrable(self):
+        entries = startup.parse_importtime(self.IMPORTTIME)
+        found = startup.deferrable(entries, {"pages"}, min_ms=5)
+        self.assertEqual([(f["imported_by"], f["module"]) for f in found], [("pages.images", "PIL.Image")])
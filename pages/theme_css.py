@@ -0,0 +1,122 @@
+"""Render each Theme into a minified, content-hashed CSS file under static.
+
+Clients switch themes by pointing ``<link id="theme-css">`` at the file listed
+for the theme in ``manifest.json``. Because the filename changes whenever the
+content does, the files can be served with far-future cache headers.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.templatetags.static import PrefixNode
+
+
+MANIFEST_NAME = "manifest.json"
+# Static-relative prefix under which theme files are published.
+STATIC_PREFIX = "themes"
+
+_VAR_NAME = re.compile(r"^--[A-Za-z0-9_-]+$")
+# Values end up inside a declaration block; refuse anything that could escape it.
+_UNSAFE_VALUE = re.compile(r"[{};<>\\]|/\*|\*/")
+
+_manifest_lock = threading.Lock()
+_manifest_cache = {"stamp": None, "data": {}}
+
+
+def output_dir() -> Path:
+    return Path(getattr(settings, "THEME_CSS_DIR", settings.BASE_DIR / "static" / STATIC_PREFIX))
+
+
+def render_css(variables: dict) -> str:
+    """Minified ``:root{--a:b;...}`` for the valid entries of ``variables``."""
+    decls = []
+    for name, value in sorted((variables or {}).items()):
+        value = " ".join(str(value).split())
+        if not _VAR_NAME.match(str(name)) or not value or _UNSAFE_VALUE.search(value):
+            continue
+        decls.append(f"{name}:{value}")
+    return ":root{" + ";".join(decls) + "}\n"
+
+
+def _read_manifest(directory: Path) -> dict:
+    try:
+        return json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(directory: Path, data: dict) -> None:
+    tmp = directory / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, directory / MANIFEST_NAME)
+
+
+def _remove_stale(directory: Path, key: str, keep: Optional[str] = None) -> None:
+    for path in directory.glob(f"{key}.*.css"):
+        # Slugs carry no dots, so a bundle of this key is exactly "<key>.<hash>.css".
+        if path.name != keep and path.name.count(".") == 2:
+            path.unlink(missing_ok=True)
+
+
+def write_theme(theme, directory: Optional[Path] = None) -> str:
+    """Write ``theme``'s CSS bundle and record it in the manifest; returns the filename."""
+    directory = directory or output_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    css = render_css(theme.variables)
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    filename = f"{theme.key}.{digest}.css"
+    path = directory / filename
+    if not path.exists():
+        path.write_text(css, encoding="utf-8")
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        manifest[theme.key] = filename
+        _write_manifest(directory, manifest)
+    _remove_stale(directory, theme.key, keep=filename)
+    return filename
+
+
+def remove_theme(key: str, directory: Optional[Path] = None) -> None:
+    directory = directory or output_dir()
+    if not directory.exists():
+        return
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        if manifest.pop(key, None) is not None:
+            _write_manifest(directory, manifest)
+    _remove_stale(directory, key)
+
+
+def build_all(themes: Iterable, directory: Optional[Path] = None, prune: bool = False) -> dict:
+    """Write every theme; with ``prune`` drop manifest entries for themes that no longer exist."""
+    directory = directory or output_dir()
+    built = {theme.key: write_theme(theme, directory) for theme in themes}
+    if prune:
+        for key in set(_read_manifest(directory)) - set(built):
+            remove_theme(key, directory)
+    return built
+
+
+def css_url(key: str) -> Optional[str]:
+    """Static URL of the current bundle for ``key`` (None until it is built)."""
+    path = output_dir() / MANIFEST_NAME
+    try:
+        stamp = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return None
+    with _manifest_lock:
+        if _manifest_cache["stamp"] != stamp:
+            _manifest_cache["data"] = _read_manifest(path.parent)
+            _manifest_cache["stamp"] = stamp
+        filename = _manifest_cache["data"].get(key)
+    if not filename:
+        return None
+    # Bundles carry their own content hash. Link them directly rather than
+    # through the staticfiles manifest, which only lists the bundles that
+    # existed at collectstatic time.
+    return f"{PrefixNode.handle_simple('STATIC_URL')}{STATIC_PREFIX}/{filename}"
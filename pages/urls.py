@@ -19,10 +19,17 @@ urlpatterns = [
     path("project/<int:pk>/", showcase_views.project_detail, name="project_detail"),
 
     # JSON API endpoints for desktop functionality
+    path('api/bootstrap/', views.api_bootstrap, name='api_bootstrap'),
     path('api/preferences/', views.api_preferences, name='api_preferences'),
     path('api/run-history/', views.api_run_history, name='api_run_history'),
     path('api/desktop-items/', views.api_desktop_items, name='api_desktop_items'),
+    path('api/desktop-items/sync/', views.api_desktop_items_sync, name='api_desktop_items_sync'),
     path('api/desktop-items/template/', views.api_desktop_items_template, name='api_desktop_items_template'),
     path('api/themes/', views.api_themes, name='api_themes'),
     path('api/notes/', views.api_notes, name='api_notes'),
+    path('api/cache-stats/', views.api_cache_stats, name='api_cache_stats'),
+    path('api/events/', views.api_events, name='api_events'),
+
+    # Prometheus scrape target
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -0,0 +1,106 @@
+"""Cheap resource versions and conditional (ETag / 304) JSON responses.
+
+Each JSON collection exposes a version made of ``max(<timestamp>)`` plus the
+row count, computed with one aggregate query. The version becomes a strong
+ETag and a Last-Modified header; requests whose If-None-Match still matches
+are answered with 304 before the payload queryset is ever evaluated.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """Version stamp of a collection: newest timestamp and number of rows."""
+    name: str
+    last_modified: Optional[datetime]
+    count: int
+
+    @property
+    def token(self) -> str:
+        stamp = self.last_modified.isoformat() if self.last_modified else "-"
+        return f"{self.name}:{self.count}:{stamp}"
+
+    @property
+    def digest(self) -> str:
+        """Short opaque form of :attr:`token` for embedding in payloads."""
+        return hashlib.sha1(self.token.encode("utf-8")).hexdigest()[:16]
+
+
+def resource_version(name: str, queryset, field: str = "updated_at") -> ResourceVersion:
+    """Compute ``max(field)`` and ``count(*)`` for ``queryset`` in one query."""
+    agg = queryset.order_by().aggregate(last=Max(field), count=Count("pk"))
+    return ResourceVersion(name=name, last_modified=agg["last"], count=agg["count"])
+
+
+async def aresource_version(name: str, queryset, field: str = "updated_at") -> ResourceVersion:
+    """Async :func:`resource_version`."""
+    agg = await queryset.order_by().aaggregate(last=Max(field), count=Count("pk"))
+    return ResourceVersion(name=name, last_modified=agg["last"], count=agg["count"])
+
+
+def combine_versions(name: str, *versions: ResourceVersion) -> ResourceVersion:
+    """Fold several versions into one (newest timestamp, total count)."""
+    stamps = [v.last_modified for v in versions if v.last_modified is not None]
+    return ResourceVersion(
+        name=name + "|" + "|".join(v.token for v in versions),
+        last_modified=max(stamps) if stamps else None,
+        count=sum(v.count for v in versions),
+    )
+
+
+def make_etag(request, version: ResourceVersion) -> str:
+    """Strong ETag for ``version`` as seen through the request's query string.
+
+    The query string takes part so paginated/projected views of the same
+    collection never share a validator.
+    """
+    query = "&".join(sorted(request.GET.urlencode().split("&")))
+    digest = hashlib.sha1(f"{version.token}?{query}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _validators(request, version: ResourceVersion):
+    etag = make_etag(request, version)
+    # HTTP dates have whole seconds; a fractional stamp would always look newer.
+    last_modified = int(version.last_modified.timestamp()) if version.last_modified else None
+    # Only the ETag decides on a 304. A second-resolution date misses a second
+    # change within the same second, and a delete leaves max(updated_at) alone,
+    # so If-Modified-Since on its own would answer 304 to a stale client.
+    return etag, last_modified, get_conditional_response(request, etag=etag)
+
+
+def _finish(response, etag: str, last_modified):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    # Let browsers keep the body but always revalidate with the validators above.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_json(request, version: ResourceVersion, build_payload: Callable[[], dict], **kwargs):
+    """Return a JsonResponse for ``build_payload()`` or a 304 if the client is current.
+
+    ``build_payload`` is only called when the client's validators are stale,
+    so the queryset behind it is never materialized for a matching poll.
+    """
+    etag, last_modified, response = _validators(request, version)
+    if response is None:
+        response = JsonResponse(build_payload(), **kwargs)
+    return _finish(response, etag, last_modified)
+
+
+async def aconditional_json(request, version: ResourceVersion, build_payload: Callable[[], Awaitable[dict]], **kwargs):
+    """Async :func:`conditional_json`; ``build_payload`` is a coroutine function."""
+    etag, last_modified, response = _validators(request, version)
+    if response is None:
+        response = JsonResponse(await build_payload(), **kwargs)
+    return _finish(response, etag, last_modified)
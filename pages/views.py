@@ -1,38 +1,82 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponseNotAllowed
+from django.http import HttpResponse, JsonResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.utils.decorators import method_decorator
 from django.forms.models import model_to_dict
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
 import json
+from functools import wraps
+from hmac import compare_digest
 
 from showcase.models import Project, Education, Skill
 from .models import UserPreference, RunHistory, DesktopItem, Theme, Profile, SocialLink, ContactMessage, Note
+from .versioning import resource_version, combine_versions, conditional_json, aresource_version, aconditional_json
+from .cache import theme_catalog, theme_rows
+from .theme_css import css_url
+from .render_cache import cache_page_render
+from . import metrics as metrics_store
+from . import events, write_behind
+from .pagination import PaginationError, akeyset_page, parse_fields, parse_limit
 from django.views.decorators.http import require_POST
 
 @ensure_csrf_cookie
 def home(request):
     """Landing page - Start Screen"""
-    return render(request, 'pages/home.html')
+    context = {}
+    if getattr(settings, "DESKTOP_INLINE_BOOTSTRAP", True):
+        # Inline the desktop's initial state so first paint needs no XHRs.
+        context["bootstrap"] = bootstrap_payload()
+        context["theme_css_url"] = css_url(context["bootstrap"]["preferences"]["theme"])
+    return render(request, 'pages/home.html', context)
 
 def home_older(request):
     """Older version (debug)"""
     return render(request, "pages/home_older.html")
 
+@cache_page_render("pages:about", depends_on=["showcase.Skill", "showcase.Education", "pages.Profile", "pages.SocialLink"])
 def about(request):
     """About Me - Player Profile"""
-    skills = Skill.objects.all()
     education = Education.objects.all()
     profile = Profile.objects.first()
     social_links = SocialLink.objects.filter(visible=True).order_by("order", "name")
     context = {
-        'skills': skills,
+        'skill_groups': group_skills(Skill.objects.order_by("pk")),
         'education': education,
         'profile': profile,
         'social_links': social_links,
     }
     return render(request, 'pages/about.html', context)
 
+# About page headings, where they differ from the category's choice label.
+SKILL_GROUP_HEADINGS = {"database": "Databases"}
+
+
+def group_skills(skills):
+    """Bucket skills by category in one pass, in ``Skill.SKILL_CATEGORIES`` order.
+
+    Every declared category gets a group (possibly empty); categories found in
+    the data but not declared are appended after them.
+    """
+    groups = {
+        key: {"key": key, "label": SKILL_GROUP_HEADINGS.get(key, label), "skills": []}
+        for key, label in Skill.SKILL_CATEGORIES
+    }
+    for skill in skills:
+        group = groups.get(skill.category)
+        if group is None:
+            label = skill.category.replace("_", " ").title()
+            group = groups[skill.category] = {"key": skill.category, "label": label, "skills": []}
+        group["skills"].append(skill)
+    return list(groups.values())
+
+
 def contact(request):
     """Contact - NPC Dialogue"""
     if request.method == "POST":
@@ -71,42 +115,164 @@ def recycle_page(request):
 
 # ----- JSON API -----
 
+PREFERENCE_DEFAULTS = {
+    "theme": "retro-98",
+    "wallpaper": "default",
+    "sound_enabled": True,
+    "volume": 50,
+}
+
+
 def get_or_create_preferences() -> UserPreference:
-    obj, _ = UserPreference.objects.get_or_create(pk=1, defaults={
-        "theme": "retro-98",
-        "wallpaper": "default",
-        "sound_enabled": True,
-        "volume": 50,
-    })
+    obj, _ = UserPreference.objects.get_or_create(pk=1, defaults=PREFERENCE_DEFAULTS)
+    return obj
+
+
+async def aget_or_create_preferences() -> UserPreference:
+    obj, _ = await UserPreference.objects.aget_or_create(pk=1, defaults=PREFERENCE_DEFAULTS)
     return obj
 
 
+def preferences_version():
+    version = resource_version("preferences", UserPreference.objects.filter(pk=1))
+    if not version.count:
+        # First visit: create the row, then version it like any other poll.
+        get_or_create_preferences()
+        version = resource_version("preferences", UserPreference.objects.filter(pk=1))
+    return version
+
+
+async def apreferences_version():
+    version = await aresource_version("preferences", UserPreference.objects.filter(pk=1))
+    if not version.count:
+        await aget_or_create_preferences()
+        version = await aresource_version("preferences", UserPreference.objects.filter(pk=1))
+    return version
+
+
+def themes_version():
+    return resource_version("themes", Theme.objects.all())
+
+
+def desktop_items_version():
+    return resource_version("desktop-items", DesktopItem.objects.all())
+
+
+async def adesktop_items_version():
+    return await aresource_version("desktop-items", DesktopItem.objects.all())
+
+
+# updated_at is echoed back by the sync endpoint to detect moves of a stale copy.
+DESKTOP_ITEM_FIELDS = ("id", "label", "item_type", "pos_x", "pos_y", "updated_at")
+
+
+def preferences_payload() -> dict:
+    return model_to_dict(get_or_create_preferences())
+
+
+async def apreferences_payload() -> dict:
+    return model_to_dict(await aget_or_create_preferences())
+
+
+def themes_payload() -> dict:
+    return {"results": theme_rows()}
+
+
+# Desktop items are paged by id; the page after ``next_after`` is ``?after=<id>``.
+def desktop_items_page_size() -> int:
+    return getattr(settings, "DESKTOP_ITEMS_PAGE_SIZE", 200)
+
+
+def _desktop_items_queryset(after: int, limit: int):
+    # One extra row tells whether another page exists.
+    return DesktopItem.objects.filter(id__gt=after).order_by("id").values(*DESKTOP_ITEM_FIELDS)[:limit + 1]
+
+
+def _desktop_items_page(rows: list, limit: int) -> dict:
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {"results": rows, "next_after": rows[-1]["id"] if more else None}
+
+
+def desktop_items_payload(after: int = 0, limit: int = None) -> dict:
+    limit = limit or desktop_items_page_size()
+    return _desktop_items_page(list(_desktop_items_queryset(after, limit)), limit)
+
+
+async def adesktop_items_payload(after: int = 0, limit: int = None) -> dict:
+    limit = limit or desktop_items_page_size()
+    return _desktop_items_page([row async for row in _desktop_items_queryset(after, limit)], limit)
+
+
+def bootstrap_version():
+    return combine_versions("bootstrap", preferences_version(), themes_version(), desktop_items_version())
+
+
+def bootstrap_payload(version=None) -> dict:
+    """Everything the desktop needs on load: preferences, themes and desktop items.
+
+    Only the first page of desktop items is included; ``desktop_items_next``
+    is the ``after`` id of the next one, fetched from /api/desktop-items/.
+    """
+    version = version or bootstrap_version()
+    items = desktop_items_payload()
+    return {
+        "version": version.digest,
+        "preferences": preferences_payload(),
+        "themes": themes_payload()["results"],
+        "desktop_items": items["results"],
+        "desktop_items_next": items["next_after"],
+    }
+
+
+# The JSON APIs the desktop polls are async so an ASGI server can hold many of
+# them open without a worker thread each; the ORM calls still hop to Django's
+# sync thread, but only for the query itself.
+
 @require_http_methods(["GET", "POST"])
-def api_preferences(request):
+async def api_preferences(request):
     if request.method == "GET":
-        prefs = get_or_create_preferences()
-        return JsonResponse(model_to_dict(prefs))
+        return await aconditional_json(request, await apreferences_version(), apreferences_payload)
 
     try:
         data = json.loads(request.body.decode("utf-8"))
     except Exception:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
 
-    prefs = get_or_create_preferences()
+    prefs = await aget_or_create_preferences()
     prefs.theme = data.get("theme", prefs.theme)
     prefs.wallpaper = data.get("wallpaper", prefs.wallpaper)
     prefs.sound_enabled = bool(data.get("sound_enabled", prefs.sound_enabled))
     if isinstance(data.get("volume"), int):
         prefs.volume = max(0, min(100, int(data.get("volume"))))
-    prefs.save()
+    await prefs.asave()
     return JsonResponse(model_to_dict(prefs))
 
 
+# Columns list views may project with ?fields= (blobs like result/content are opt-out).
+RUN_HISTORY_FIELDS = ("id", "command", "result", "created_at")
+NOTE_FIELDS = ("id", "title", "content", "is_deleted", "updated_at", "created_at")
+
+
 @require_http_methods(["GET", "POST"]) 
-def api_run_history(request):
+async def api_run_history(request):
+    """List run history (keyset-paginated), or record a command.
+
+    A POST answers 200 with the stored row, ``id`` included, unless
+    ``RUN_HISTORY_WRITE_BEHIND`` is on: then it answers 202 with
+    ``"queued": true`` and no ``id``, as the row is inserted later.
+    """
     if request.method == "GET":
-        items = list(RunHistory.objects.order_by("-created_at").values("id", "command", "result", "created_at"))
-        return JsonResponse({"results": items})
+        try:
+            fields = parse_fields(request, RUN_HISTORY_FIELDS, required=("id", "created_at"))
+            limit = parse_limit(request)
+            cursor = request.GET.get("cursor")
+            version = await aresource_version("run-history", RunHistory.objects.all(), field="created_at")
+            return await aconditional_json(request, version, lambda: akeyset_page(
+                RunHistory.objects.all(), "created_at", fields, limit, cursor,
+            ))
+        except PaginationError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
 
     try:
         data = json.loads(request.body.decode("utf-8"))
@@ -117,15 +283,27 @@ def api_run_history(request):
     result = (data.get("result") or "").strip()
     if not command:
         return JsonResponse({"error": "command is required"}, status=400)
-    rh = RunHistory.objects.create(command=command, result=result)
+    if write_behind.enabled():
+        # Acknowledge now; the row reaches the table with the next batch.
+        # add() may start the flusher and replay spools, which touches the database.
+        row = await sync_to_async(write_behind.run_history.add)(command, result)
+        return JsonResponse(dict(row, queued=True), status=202)
+    rh = await RunHistory.objects.acreate(command=command, result=result)
     return JsonResponse({"id": rh.id, "command": rh.command, "result": rh.result, "created_at": rh.created_at})
 
 
 @require_http_methods(["GET", "POST", "PATCH", "DELETE"]) 
-def api_desktop_items(request):
+async def api_desktop_items(request):
     if request.method == "GET":
-        items = list(DesktopItem.objects.order_by("id").values("id", "label", "item_type", "pos_x", "pos_y"))
-        return JsonResponse({"results": items})
+        try:
+            limit = parse_limit(request, default=desktop_items_page_size())
+            after = int(request.GET.get("after") or 0)
+        except PaginationError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        except ValueError:
+            return JsonResponse({"error": "after must be an integer"}, status=400)
+        return await aconditional_json(request, await adesktop_items_version(),
+                                       lambda: adesktop_items_payload(after, limit))
 
     if request.method == "POST":
         try:
@@ -136,8 +314,8 @@ def api_desktop_items(request):
         item_type = data.get("item_type", "folder")
         pos_x = int(data.get("pos_x", 100))
         pos_y = int(data.get("pos_y", 100))
-        item = DesktopItem.objects.create(label=label, item_type=item_type, pos_x=pos_x, pos_y=pos_y)
-        return JsonResponse({"id": item.id, "label": item.label, "item_type": item.item_type, "pos_x": item.pos_x, "pos_y": item.pos_y})
+        item = await DesktopItem.objects.acreate(label=label, item_type=item_type, pos_x=pos_x, pos_y=pos_y)
+        return JsonResponse(_desktop_item_dict(item))
 
     if request.method == "PATCH":
         try:
@@ -145,7 +323,7 @@ def api_desktop_items(request):
         except Exception:
             return JsonResponse({"error": "Invalid JSON"}, status=400)
         try:
-            item = DesktopItem.objects.get(pk=int(data.get("id")))
+            item = await DesktopItem.objects.aget(pk=int(data.get("id")))
         except (DesktopItem.DoesNotExist, TypeError, ValueError):
             return JsonResponse({"error": "Invalid id"}, status=404)
         if "label" in data:
@@ -154,13 +332,13 @@ def api_desktop_items(request):
             item.pos_x = int(data.get("pos_x"))
         if "pos_y" in data:
             item.pos_y = int(data.get("pos_y"))
-        item.save()
-        return JsonResponse({"id": item.id, "label": item.label, "item_type": item.item_type, "pos_x": item.pos_x, "pos_y": item.pos_y})
+        await item.asave()
+        return JsonResponse(_desktop_item_dict(item))
 
     if request.method == "DELETE":
         try:
             data = json.loads(request.body.decode("utf-8"))
-            DesktopItem.objects.filter(pk=int(data.get("id"))).delete()
+            await DesktopItem.objects.filter(pk=int(data.get("id"))).adelete()
             return JsonResponse({"ok": True})
         except Exception:
             return JsonResponse({"error": "Invalid request"}, status=400)
@@ -168,6 +346,106 @@ def api_desktop_items(request):
     return HttpResponseNotAllowed(["GET", "POST", "PATCH", "DELETE"])
 
 
+# Upper bound on deltas accepted by one sync call (one drag session rarely exceeds a few).
+DESKTOP_SYNC_MAX_ITEMS = 200
+
+
+@require_POST
+def api_desktop_items_sync(request):
+    """Apply a batch of desktop item moves/renames in a single transaction.
+
+    Body: ``{"items": [{"id", "pos_x", "pos_y", "label", "updated_at"?}, ...]}``,
+    or a form whose ``items`` field holds that list as JSON (what
+    ``navigator.sendBeacon`` posts on pagehide, with ``csrfmiddlewaretoken``).
+    Deltas for the same id are coalesced (last one wins). When ``updated_at`` is
+    sent it must match the stored value, otherwise the item is reported as a
+    ``stale`` conflict and left untouched so the client can refetch it.
+    """
+    try:
+        if request.content_type in ("multipart/form-data", "application/x-www-form-urlencoded"):
+            data = {"items": json.loads(request.POST.get("items", ""))}
+        else:
+            data = json.loads(request.body.decode("utf-8"))
+    except Exception:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    deltas = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(deltas, list):
+        return JsonResponse({"error": "items must be a list"}, status=400)
+    if len(deltas) > DESKTOP_SYNC_MAX_ITEMS:
+        return JsonResponse({"error": f"At most {DESKTOP_SYNC_MAX_ITEMS} items per sync"}, status=400)
+
+    conflicts = []
+    coalesced = {}
+    for delta in deltas:
+        try:
+            item_id = int(delta.get("id"))
+        except (AttributeError, TypeError, ValueError):
+            conflicts.append({"id": delta.get("id") if isinstance(delta, dict) else None, "reason": "invalid"})
+            continue
+        coalesced.setdefault(item_id, {}).update(delta)
+
+    with transaction.atomic():
+        existing = DesktopItem.objects.select_for_update().in_bulk(list(coalesced))
+        now = timezone.now()
+        changed = []
+        for item_id, delta in coalesced.items():
+            item = existing.get(item_id)
+            if item is None:
+                conflicts.append({"id": item_id, "reason": "not_found"})
+                continue
+            seen = delta.get("updated_at")
+            if seen is not None and not _same_version(seen, item.updated_at):
+                conflicts.append({"id": item_id, "reason": "stale", "current": _desktop_item_dict(item)})
+                continue
+            try:
+                if "pos_x" in delta:
+                    item.pos_x = int(delta["pos_x"])
+                if "pos_y" in delta:
+                    item.pos_y = int(delta["pos_y"])
+            except (TypeError, ValueError):
+                conflicts.append({"id": item_id, "reason": "invalid"})
+                continue
+            if "label" in delta:
+                item.label = (str(delta["label"] or "").strip() or item.label)[:100]
+            # bulk_update() bypasses auto_now, so stamp the row version ourselves.
+            item.updated_at = now
+            changed.append(item)
+        if changed:
+            DesktopItem.objects.bulk_update(changed, ["label", "pos_x", "pos_y", "updated_at"])
+            # bulk_update sends no post_save, so stream the moves here.
+            events.publish_many(changed)
+
+    return JsonResponse({
+        "results": [_desktop_item_dict(item) for item in changed],
+        "conflicts": conflicts,
+    })
+
+
+def _same_version(seen, updated_at) -> bool:
+    """Compare a client-echoed timestamp with the stored one.
+
+    Timestamps reach the client through DjangoJSONEncoder, which keeps only
+    millisecond precision, so compare at that resolution.
+    """
+    parsed = parse_datetime(str(seen))
+    if parsed is None:
+        return False
+    return parsed.replace(microsecond=parsed.microsecond // 1000 * 1000) == \
+        updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)
+
+
+def _desktop_item_dict(item: DesktopItem) -> dict:
+    return {
+        "id": item.id,
+        "label": item.label,
+        "item_type": item.item_type,
+        "pos_x": item.pos_x,
+        "pos_y": item.pos_y,
+        "updated_at": item.updated_at,
+    }
+
+
 @require_POST
 def api_desktop_items_template(request):
     """Create a desktop item from a preset template key."""
@@ -209,22 +487,93 @@ def api_desktop_items_template(request):
         return JsonResponse({"error": "Unknown template key"}, status=400)
 
     item = DesktopItem.objects.create(**preset)
-    return JsonResponse({"id": item.id, "label": item.label, "item_type": item.item_type, "pos_x": item.pos_x, "pos_y": item.pos_y})
+    return JsonResponse(_desktop_item_dict(item))
+
+
+def operator_only(view):
+    """Serve ``view`` only with ``Authorization: Bearer <METRICS_TOKEN>``.
+
+    Without a token the view is served only while DEBUG is on, so per-view
+    timings and counters are never public by omission.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        if token:
+            if not compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+                return HttpResponse(status=401)
+        elif not settings.DEBUG:
+            return HttpResponse("Set METRICS_TOKEN to serve this endpoint.", status=403, content_type="text/plain")
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@require_http_methods(["GET"])
+@operator_only
+def metrics(request):
+    """Prometheus text exposition of the counters from every worker process."""
+    return HttpResponse(
+        metrics_store.render(metrics_store.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 @require_http_methods(["GET"]) 
-def api_themes(request):
-    """Return available themes (key, name, and variables)."""
-    qs = Theme.objects.order_by("name").values("key", "name", "variables", "is_default")
-    return JsonResponse({"results": list(qs)})
+async def api_themes(request):
+    """Return available themes (key, name, and variables) from the catalog cache."""
+    entry = await theme_catalog.aget()
+    response = get_conditional_response(request, etag=entry.etag)
+    if response is None:
+        response = HttpResponse(entry.body, content_type="application/json")
+    response.headers["ETag"] = entry.etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@require_http_methods(["GET"])
+@operator_only
+def api_cache_stats(request):
+    """Hit/miss counters of this worker's caches."""
+    return JsonResponse({"theme_catalog": theme_catalog.stats()})
+
+
+@ensure_csrf_cookie
+@require_http_methods(["GET"])
+def api_bootstrap(request):
+    """Preferences, themes and desktop items in one response under one version tag.
+
+    Also sets the CSRF cookie, so a pre-rendered home page served without
+    Django can still make write calls afterwards.
+    """
+    version = bootstrap_version()
+    return conditional_json(request, version, lambda: bootstrap_payload(version))
 
 
 @require_http_methods(["GET", "POST", "PATCH", "DELETE"]) 
-def api_notes(request):
-    """Lightweight JSON API to back the Notepad app (admin-managed too)."""
+async def api_notes(request):
+    """Lightweight JSON API to back the Notepad app (admin-managed too).
+
+    ``GET ?id=<pk>`` returns that one live note instead of a page.
+    """
     if request.method == "GET":
-        items = list(Note.objects.filter(is_deleted=False).order_by("-updated_at").values("id", "title", "content", "is_deleted", "updated_at", "created_at"))
-        return JsonResponse({"results": items})
+        try:
+            fields = parse_fields(request, NOTE_FIELDS, required=("id", "updated_at"))
+            live = Note.objects.filter(is_deleted=False)
+            if "id" in request.GET:
+                try:
+                    pk = int(request.GET["id"])
+                except ValueError:
+                    return JsonResponse({"error": "Invalid id"}, status=400)
+                note = await live.filter(pk=pk).values(*fields).afirst()
+                if note is None:
+                    return JsonResponse({"error": "Not found"}, status=404)
+                return JsonResponse(note)
+            limit = parse_limit(request)
+            cursor = request.GET.get("cursor")
+            version = await aresource_version("notes", live)
+            return await aconditional_json(request, version, lambda: akeyset_page(live, "updated_at", fields, limit, cursor))
+        except PaginationError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
 
     try:
         data = json.loads(request.body.decode("utf-8"))
@@ -234,12 +583,12 @@ def api_notes(request):
     if request.method == "POST":
         title = (data.get("title") or "Untitled").strip() or "Untitled"
         content = data.get("content") or ""
-        note = Note.objects.create(title=title, content=content)
+        note = await Note.objects.acreate(title=title, content=content)
         return JsonResponse({"id": note.id, "title": note.title, "content": note.content, "created_at": note.created_at, "updated_at": note.updated_at})
 
     if request.method == "PATCH":
         try:
-            note = Note.objects.get(pk=int(data.get("id")))
+            note = await Note.objects.aget(pk=int(data.get("id")))
         except (Note.DoesNotExist, TypeError, ValueError):
             return JsonResponse({"error": "Invalid id"}, status=404)
         if "title" in data:
@@ -248,14 +597,32 @@ def api_notes(request):
             note.content = data.get("content") or note.content
         if "is_deleted" in data:
             note.is_deleted = bool(data.get("is_deleted"))
-        note.save()
+        await note.asave()
         return JsonResponse({"id": note.id, "title": note.title, "content": note.content, "is_deleted": note.is_deleted, "updated_at": note.updated_at})
 
     if request.method == "DELETE":
         try:
-            Note.objects.filter(pk=int(data.get("id"))).delete()
+            await Note.objects.filter(pk=int(data.get("id"))).adelete()
             return JsonResponse({"ok": True})
         except Exception:
             return JsonResponse({"error": "Invalid request"}, status=400)
 
-    return HttpResponseNotAllowed(["GET", "POST", "PATCH", "DELETE"])
\ No newline at end of file
+    return HttpResponseNotAllowed(["GET", "POST", "PATCH", "DELETE"])
+
+
+@require_http_methods(["GET"])
+async def api_events(request):
+    """Server-Sent Events stream of note, desktop item and preference changes.
+
+    Only served under ASGI with ``EVENTS_ENABLED``: a WSGI worker would be held
+    for the life of the connection. Elsewhere the answer is 204, which tells
+    EventSource not to reconnect, and the pages fall back to refetching their lists.
+    """
+    if not isinstance(request, ASGIRequest) or not events.enabled():
+        return HttpResponse(status=204)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    response = StreamingHttpResponse(events.stream(last_event_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
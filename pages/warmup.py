@@ -0,0 +1,127 @@
+"""Get a server process ready before it takes traffic.
+
+Without this, the first request a gunicorn worker serves imports the views,
+compiles the templates it renders and opens the database connection, running
+the SQLite pragmas. :func:`warm_up` does all of that up front:
+
+- every app's ``views`` module is imported and the URLconf populated;
+- every template any loader can find is compiled, which fills the cached
+  loader (``settings_production`` enables it explicitly);
+- each database connection is opened (``CONN_MAX_AGE`` keeps it for later
+  requests on the same thread).
+
+``gunicorn.conf.py`` runs the first two once in the master after the app is
+preloaded, so workers inherit them when they fork, and opens connections in each
+worker, as a connection must never cross a fork.
+"""
+import importlib
+import logging
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+def import_views() -> int:
+    """Import each installed app's ``views`` module and the URLconf; returns the number of views modules."""
+    count = 0
+    for config in apps.get_app_configs():
+        module = f"{config.name}.views"
+        try:
+            importlib.import_module(module)
+        except ModuleNotFoundError as exc:
+            if exc.name != module:
+                raise
+            continue
+        count += 1
+    # Populating the resolver imports whatever else the URLconf routes to.
+    len(get_resolver().reverse_dict)
+    return count
+
+
+def template_names():
+    """``(engine, name)`` for every template file the Django engines' loaders can find.
+
+    A name found in several directories is listed once; ``get_template``
+    resolves it to the same file a render would.
+    """
+    for engine in engines.all():
+        loaders = getattr(getattr(engine, "engine", None), "template_loaders", [])
+        seen = set()
+        for loader in loaders:
+            for directory in loader.get_dirs() if hasattr(loader, "get_dirs") else []:
+                root = Path(directory)
+                if not root.is_dir():
+                    continue
+                for path in sorted(root.rglob("*")):
+                    name = path.relative_to(root).as_posix()
+                    if path.suffix in TEMPLATE_SUFFIXES and name not in seen and path.is_file():
+                        seen.add(name)
+                        yield engine, name
+
+
+def compile_templates() -> tuple:
+    """Compile every template; returns ``(compiled, failed names)``.
+
+    A template that does not compile is logged and skipped: it would fail
+    the same way when rendered, and should not keep a worker from starting.
+    """
+    compiled, failed = 0, []
+    for engine, name in template_names():
+        try:
+            engine.get_template(name)
+        except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+            logger.warning("Template %s does not compile: %s", name, exc)
+            failed.append(name)
+        else:
+            compiled += 1
+    return compiled, failed
+
+
+def connect_databases() -> list:
+    """Open a connection for every configured database alias; returns the aliases."""
+    aliases = []
+    for connection in connections.all():
+        connection.ensure_connection()
+        aliases.append(connection.alias)
+    return aliases
+
+
+def warm_up(databases: bool = True) -> dict:
+    """Run every warm-up step and return what each did and how long it took (ms).
+
+    With ``databases=False`` (a process that is about to fork) connections
+    are closed instead, including any an import opened.
+    """
+    summary, timings = {}, {}
+    started = time.perf_counter()
+    summary["views"] = import_views()
+    timings["views"] = (time.perf_counter() - started) * 1000
+
+    step = time.perf_counter()
+    summary["templates"], summary["failed"] = compile_templates()
+    timings["templates"] = (time.perf_counter() - step) * 1000
+
+    step = time.perf_counter()
+    if databases:
+        summary["databases"] = connect_databases()
+    else:
+        connections.close_all()
+        summary["databases"] = []
+    timings["databases"] = (time.perf_counter() - step) * 1000
+
+    timings["total"] = (time.perf_counter() - started) * 1000
+    summary["ms"] = {name: round(value, 1) for name, value in timings.items()}
+    logger.info(
+        "Warm-up: %d views modules, %d templates (%d failed), databases %s in %.0f ms",
+        summary["views"], summary["templates"], len(summary["failed"]),
+        ", ".join(summary["databases"]) or "closed", timings["total"],
+    )
+    return summary
@@ -0,0 +1,223 @@
+"""Write-behind buffer for RunHistory rows.
+
+``api_run_history`` hands new rows to :data:`run_history` and answers at
+once. A background thread inserts them with one ``bulk_create`` when
+``RUN_HISTORY_BATCH_SIZE`` rows are waiting or ``RUN_HISTORY_FLUSH_INTERVAL``
+seconds have passed, so the SQLite write lock is taken once per batch and
+never on the request path.
+
+Every row is also appended to a per-process spool file
+(``RUN_HISTORY_SPOOL_DIR/<pid>-<start>.jsonl``, like the metrics files) before
+it is acknowledged, and the spool is truncated once the rows are in the
+database. The start time keeps a worker that reuses a dead worker's pid from
+adopting, and truncating, its spool. Spools left behind by a crashed worker
+are replayed by the next buffer that starts, or by
+``manage.py compact_run_history``.
+
+Retention: rows older than ``RUN_HISTORY_RETENTION_DAYS`` and everything
+beyond the newest ``RUN_HISTORY_MAX_ROWS`` are deleted every
+``RUN_HISTORY_COMPACT_INTERVAL`` seconds by the flusher thread (see
+:func:`compact`).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import metrics
+from .metrics import process_alive
+from .models import RunHistory
+
+try:
+    import fcntl
+except ImportError:  # Windows: spools are replayed without cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    return getattr(settings, "RUN_HISTORY_WRITE_BEHIND", False)
+
+
+def spool_dir() -> Path:
+    return Path(getattr(settings, "RUN_HISTORY_SPOOL_DIR", settings.BASE_DIR / "var" / "spool"))
+
+
+def _insert(rows) -> int:
+    """bulk_create ``rows`` (dicts with command/result/created_at) in one transaction."""
+    objs = [
+        RunHistory(command=row["command"], result=row["result"], created_at=parse_datetime(row["created_at"]))
+        for row in rows
+    ]
+    with transaction.atomic():
+        RunHistory.objects.bulk_create(objs)
+    metrics.inc("pixel_model_writes_total", len(objs), model=RunHistory._meta.label)
+    return len(objs)
+
+
+def _read_spool(path: Path) -> list:
+    rows = []
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-write; everything before it is intact.
+                    break
+    except OSError:
+        pass
+    return rows
+
+
+def replay_orphaned_spools(own: Path = None) -> int:
+    """Insert the rows of spools whose process is gone; returns how many.
+
+    ``own`` is the calling buffer's spool. Any other spool carrying this
+    process's pid was left by an earlier process that had the same pid.
+    """
+    directory = spool_dir()
+    if not directory.exists():
+        return 0
+    replayed = 0
+    with open(directory / ".lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        for path in directory.glob("*.jsonl"):
+            try:
+                pid = int(path.stem.split("-", 1)[0])
+            except ValueError:
+                continue
+            if path == own or (pid != os.getpid() and process_alive(pid)):
+                continue
+            rows = _read_spool(path)
+            if rows:
+                replayed += _insert(rows)
+            path.unlink(missing_ok=True)
+    return replayed
+
+
+def compact(now=None) -> int:
+    """Apply the retention policy; returns the number of rows deleted."""
+    now = now or timezone.now()
+    deleted = 0
+    days = getattr(settings, "RUN_HISTORY_RETENTION_DAYS", 90)
+    if days:
+        deleted += RunHistory.objects.filter(created_at__lt=now - timedelta(days=days)).delete()[0]
+    max_rows = getattr(settings, "RUN_HISTORY_MAX_ROWS", 10000)
+    if max_rows:
+        # Walks runhistory_recent_idx to the first row past the limit.
+        boundary = RunHistory.objects.order_by("-created_at", "-id").values("created_at", "id")[max_rows:max_rows + 1].first()
+        if boundary:
+            older = RunHistory.objects.filter(created_at__lt=boundary["created_at"])
+            tie = RunHistory.objects.filter(created_at=boundary["created_at"], id__lte=boundary["id"])
+            deleted += older.delete()[0] + tie.delete()[0]
+    return deleted
+
+
+class RunHistoryBuffer:
+    def __init__(self):
+        self._rows = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._spool = None
+        self._pid = None
+        self._last_compact = time.monotonic()
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, "RUN_HISTORY_BATCH_SIZE", 50)
+
+    @property
+    def interval(self) -> float:
+        return getattr(settings, "RUN_HISTORY_FLUSH_INTERVAL", 1.0)
+
+    def _start(self) -> None:
+        directory = spool_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._pid = os.getpid()
+        path = directory / f"{self._pid}-{int(time.time() * 1000)}.jsonl"
+        self._spool = open(path, "a", encoding="utf-8")
+        try:
+            replay_orphaned_spools(own=path)
+        except Exception:
+            logger.exception("Replaying RunHistory spools failed")
+        self._thread = threading.Thread(target=self._run, name="run-history-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, command: str, result: str = "") -> dict:
+        """Queue one row and return it as it will be stored (without an id)."""
+        row = {"command": command, "result": result, "created_at": timezone.now().isoformat()}
+        with self._lock:
+            # gunicorn forks after import, so the thread and spool are per worker.
+            if (self._thread is None or not self._thread.is_alive() or self._pid != os.getpid()
+                    or Path(self._spool.name).parent != spool_dir()):
+                self._start()
+            self._spool.write(json.dumps(row) + "\n")
+            self._spool.flush()
+            self._rows.append(row)
+            if len(self._rows) >= self.batch_size:
+                self._wake.set()
+        return row
+
+    def flush(self) -> int:
+        """Insert everything queued so far; returns the number of rows written."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            written = _insert(rows)
+        except Exception:
+            logger.exception("Writing %d RunHistory rows failed; will retry", len(rows))
+            with self._lock:
+                self._rows[:0] = rows
+            return 0
+        with self._lock:
+            if self._spool is not None:
+                # Rewrite the spool with whatever arrived during the insert.
+                self._spool.seek(0)
+                self._spool.truncate()
+                for row in self._rows:
+                    self._spool.write(json.dumps(row) + "\n")
+                self._spool.flush()
+        return written
+
+    def _run(self) -> None:
+        compact_every = getattr(settings, "RUN_HISTORY_COMPACT_INTERVAL", 3600)
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if compact_every and time.monotonic() - self._last_compact >= compact_every:
+                    self._last_compact = time.monotonic()
+                    compact()
+            except Exception:
+                logger.exception("RunHistory write-behind cycle failed")
+            finally:
+                connection.close()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+run_history = RunHistoryBuffer()
+
+
+@atexit.register
+def _flush_at_exit():
+    if run_history.pending():
+        run_history.flush()
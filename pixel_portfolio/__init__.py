@@ -0,0 +1,16 @@
+from decouple import config
+
+# DJANGO_ENV -> settings module; an explicit DJANGO_SETTINGS_MODULE still wins.
+SETTINGS_MODULES = {
+    'development': 'pixel_portfolio.settings',
+    'production': 'pixel_portfolio.settings_production',
+}
+
+
+def settings_module() -> str:
+    """Settings module for DJANGO_ENV, read from the environment or .env."""
+    env = config('DJANGO_ENV', default='development')
+    try:
+        return SETTINGS_MODULES[env]
+    except KeyError:
+        raise ValueError(f"DJANGO_ENV must be one of {', '.join(SETTINGS_MODULES)}, not {env!r}") from None
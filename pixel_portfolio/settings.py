@@ -45,6 +45,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Hashed, precompressed assets from STATIC_ROOT; answers before the rest
+    # of the stack runs (pages.staticfiles)
+    'pages.staticfiles.WhiteNoiseMiddleware',
+    # Request/latency/query counters for /metrics (pages.metrics)
+    'pages.metrics.MetricsMiddleware',
+    # No-op unless a request is selected for profiling (see PROFILING_* below)
+    'pages.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,14 +84,68 @@ WSGI_APPLICATION = 'pixel_portfolio.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Applied to every new SQLite connection (see OPTIONS["init_command"] below).
+# These last only as long as the connection does.
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,  # bytes
+    'cache_size': -20000,           # negative = KiB, i.e. ~20 MB page cache
+    'temp_store': 'MEMORY',
+}
+# WAL lets readers run alongside the single writer. The journal mode is stored
+# in the database file, so `migrate` sets it once (pages.signals.set_journal_mode)
+# instead of every connection rewriting the checked-in db.sqlite3 on first use.
+SQLITE_JOURNAL_MODE = 'WAL'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests so the pragmas are paid once per
+        # worker thread. Only the sync views benefit: under ASGI each request's
+        # ORM calls run on a sync thread of its own, which opens a new connection.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # Take the write lock at BEGIN so concurrent writers wait on the busy
+            # timeout instead of failing when a read transaction tries to upgrade.
+            'transaction_mode': 'IMMEDIATE',
+            # Seconds a writer waits for the lock before "database is locked"
+            # (this is SQLite's busy_timeout).
+            'timeout': 5,
+        },
     }
 }
 
 
+# Cache
+# "default" is per-process; "shared" lives on disk so every gunicorn worker
+# sees the same entries (used for cross-worker invalidation).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'cache',
+    },
+}
+
+THEME_CACHE_ALIAS = 'shared'
+# Seconds a worker trusts its in-process copy before re-checking the shared generation
+THEME_CACHE_LOCAL_TTL = 2.0
+
+# Rendered HTML of About/Projects pages (see pages.render_cache)
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_ALIAS = 'shared'
+# Serve a stale page while a background thread re-renders it
+PAGE_CACHE_STALE_WHILE_REVALIDATE = True
+# Older entries are re-rendered inline rather than served stale
+PAGE_CACHE_MAX_STALE_SECONDS = 300
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -131,7 +192,109 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# collectstatic writes content-hashed copies plus .gz (and .br with the
+# whitenoise[brotli] extra) siblings; WhiteNoise serves them with
+# far-future immutable caching. DEBUG keeps plain names so templates work
+# without a collectstatic run.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG
+            else "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
+
+# Per-page CSS/JS bundles (pages.assets): `manage.py build_assets` writes
+# minified, pruned <bundle>.css/.js files to static/dist, and
+# {% asset_bundle %} links them when ASSET_BUNDLES_ENABLED (sources otherwise).
+# ASSET_BUDGETS caps each bundle's gzipped size in bytes, per kind or per
+# "<bundle>.<kind>"; `build_assets --check` fails when one is over.
+ASSET_BUNDLES = {
+    'home': {'css': ['css/desktop.css'], 'js': ['js/changes.js', 'js/desktop/core.js']},
+    # Desktop apps the home page loads on first use (PixelApps in core.js)
+    'desktop-notepad': {'js': ['js/desktop/notepad.js']},
+    'desktop-calculator': {'js': ['js/desktop/calculator.js']},
+    'desktop-wallpapers': {'js': ['js/desktop/wallpapers.js']},
+    'desktop-run': {'js': ['js/desktop/run.js']},
+    'desktop-windows': {'js': ['js/desktop/windows.js']},
+    'notepad': {'css': ['css/style.css'], 'js': ['js/changes.js']},
+    'calculator': {'css': ['css/style.css']},
+    'recycle': {'js': ['js/changes.js']},
+}
+ASSET_BUNDLES_ENABLED = not DEBUG
+ASSET_BUDGETS = {
+    'css': 6 * 1024,
+    'js': 6 * 1024,
+    # The desktop core: window manager, menus, themes and startup
+    'home.js': 10 * 1024,
+}
+
+# `manage.py startup_profile --check` fails when a fresh process takes longer
+# than this (ms) from importing settings to its first response.
+STARTUP_BUDGET_MS = 1000
 
 # Add media files for project images
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / "media"
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / "media"
+
+# Inline preferences/themes/desktop items into the home page so the desktop
+# can paint without the /api/bootstrap/ round trip.
+DESKTOP_INLINE_BOOTSTRAP = True
+# Desktop items per page of /api/desktop-items/, and how many the home page inlines
+DESKTOP_ITEMS_PAGE_SIZE = 200
+
+# Resized derivatives of Project.image / Profile.avatar (see pages.images)
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+IMAGE_DERIVATIVE_WORKERS = 2
+
+# Per-request profiling (pages.profiling): Server-Timing header plus cProfile
+# dumps in PROFILING_DIR. Off unless enabled, sampled, or requested with
+# "X-Profile: <PROFILING_TOKEN>" ("X-Profile: 1" also works while DEBUG is on).
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_TOKEN = ''
+PROFILING_TRACEMALLOC = True
+PROFILING_DUMP = True
+PROFILING_DIR = BASE_DIR / 'var' / 'profiles'
+PROFILING_MAX_FILES = 100
+
+# Prometheus metrics (pages.metrics): each worker flushes its counters to
+# METRICS_DIR at most every METRICS_FLUSH_INTERVAL seconds and /metrics sums
+# them. /metrics and /api/cache-stats/ require "Authorization: Bearer
+# <METRICS_TOKEN>"; with no token they are only served while DEBUG is on.
+METRICS_ENABLED = True
+METRICS_DIR = BASE_DIR / 'var' / 'metrics'
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_TOKEN = ''
+
+# Run-dialog history can be written behind (pages.write_behind): POSTs are
+# spooled to RUN_HISTORY_SPOOL_DIR, answered 202 without an id, and inserted
+# in batches of RUN_HISTORY_BATCH_SIZE or every RUN_HISTORY_FLUSH_INTERVAL
+# seconds. Off here, so POSTs insert and return the row's id; production turns
+# it on. Rows older than the retention period or beyond RUN_HISTORY_MAX_ROWS
+# are pruned every RUN_HISTORY_COMPACT_INTERVAL seconds (0 disables each limit).
+RUN_HISTORY_WRITE_BEHIND = False
+RUN_HISTORY_BATCH_SIZE = 50
+RUN_HISTORY_FLUSH_INTERVAL = 1.0
+RUN_HISTORY_SPOOL_DIR = BASE_DIR / 'var' / 'spool'
+RUN_HISTORY_RETENTION_DAYS = 90
+RUN_HISTORY_MAX_ROWS = 10000
+RUN_HISTORY_COMPACT_INTERVAL = 3600
+
+# Change stream (pages.events, /api/events/, ASGI only): each process polls the
+# ChangeEvent log every EVENTS_POLL_INTERVAL seconds (sooner after a local
+# write) and keeps the newest EVENTS_RETAIN rows, none older than
+# EVENTS_MAX_AGE seconds, for reconnecting clients. Writers prune at most every
+# EVENTS_PRUNE_INTERVAL seconds. Off, no events are recorded at all.
+EVENTS_ENABLED = True
+EVENTS_POLL_INTERVAL = 0.5
+EVENTS_KEEPALIVE = 15.0
+EVENTS_RETAIN = 1000
+EVENTS_MAX_AGE = 24 * 3600
+EVENTS_PRUNE_INTERVAL = 60
@@ -0,0 +1,63 @@
+"""
+Production settings for pixel_portfolio.
+
+Selected with DJANGO_ENV=production (in the environment or a .env file, see
+pixel_portfolio.settings_module); everything not overridden here comes from
+settings.py. Values are read with python-decouple, so they can be set in the
+environment or in .env next to manage.py.
+"""
+
+from decouple import Csv, config
+
+from .settings import *  # noqa: F401,F403
+from .settings import STORAGES, TEMPLATES
+
+SECRET_KEY = config('SECRET_KEY')
+
+DEBUG = config('DEBUG', default=False, cast=bool)
+
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
+CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', default='', cast=Csv())
+
+# Compile each template once per process and keep it. Explicit loaders make
+# this unconditional (APP_DIRS must be off when loaders are given); gunicorn's
+# warm-up hook fills the cache before a worker takes traffic (gunicorn.conf.py).
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Hashed, precompressed static files and the build_assets bundles; settings.py
+# only switches these on when DEBUG is off at import time.
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+ASSET_BUNDLES_ENABLED = True
+
+SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=True, cast=bool)
+CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=True, cast=bool)
+
+# gunicorn.conf.py serves the WSGI application, where /api/events/ cannot
+# stream, so change events are not recorded. Turn on when serving ASGI.
+EVENTS_ENABLED = config('EVENTS_ENABLED', default=False, cast=bool)
+
+# Batch Run-dialog inserts (pages.write_behind); POST /api/run-history/ then
+# answers 202 without the row's id.
+RUN_HISTORY_WRITE_BEHIND = config('RUN_HISTORY_WRITE_BEHIND', default=True, cast=bool)
+
+# Bearer token for /metrics and /api/cache-stats/; unset, both answer 403.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
@@ -1,12 +1,146 @@
-from django.core.management.base import BaseCommand
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from showcase.models import Project, Education, Skill
-from django.utils import timezone
-from datetime import date
+from pages import render_cache
+from pages.models import ContactMessage, DesktopItem, Note, RunHistory
+
+# Synthetic rows are spread over the year before this instant, so the same
+# --seed always produces the same table contents.
+SYNTHETIC_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+SYNTHETIC_SPAN = timedelta(days=365).total_seconds()
+
+WORDS = (
+    'pixel retro arcade sprite quest dungeon window desktop folder notepad terminal '
+    'engine shader palette cartridge joystick boss level score render cache index'
+).split()
+STATUSES = [key for key, _ in Project.STATUS_CHOICES]
+CATEGORIES = [key for key, _ in Skill.SKILL_CATEGORIES]
+COMMANDS = ('dir', 'help', 'cls', 'echo {w}', 'open {w}', 'ping {w}.local', 'cd {w}', 'type {w}.txt')
+
+
+def _words(rng, count):
+    return ' '.join(rng.choices(WORDS, k=count))
+
+
+def _stamp(rng):
+    return SYNTHETIC_EPOCH - timedelta(seconds=rng.random() * SYNTHETIC_SPAN)
+
+
+def _project(rng, i):
+    project = Project(
+        title=f'{_words(rng, 2).title()} #{i}',
+        objective=_words(rng, 12),
+        description=_words(rng, 40),
+        status=rng.choice(STATUSES),
+        reward=' • '.join(_words(rng, 2).title() for _ in range(3)),
+        github_link=f'https://github.com/example/project-{i}',
+        created_date=_stamp(rng),
+    )
+    project.updated_at = project.created_date
+    return project
+
+
+def _skill(rng, i):
+    return Skill(name=f'{_words(rng, 1).title()} {i}', category=rng.choice(CATEGORIES),
+                 proficiency=rng.randint(1, 100), icon='⭐', updated_at=SYNTHETIC_EPOCH)
+
+
+def _note(rng, i):
+    stamp = _stamp(rng)
+    return Note(title=_words(rng, 3).capitalize(), content=_words(rng, rng.randint(10, 120)),
+                is_deleted=rng.random() < 0.1, created_at=stamp, updated_at=stamp)
+
+
+def _run_history(rng, i):
+    command = rng.choice(COMMANDS).format(w=rng.choice(WORDS))
+    return RunHistory(command=command, result=_words(rng, 6), created_at=_stamp(rng))
+
+
+def _desktop_item(rng, i):
+    stamp = _stamp(rng)
+    return DesktopItem(label=_words(rng, 1).title(), item_type=rng.choice(('folder', 'shortcut')),
+                       pos_x=rng.randrange(0, 1600, 8), pos_y=rng.randrange(0, 900, 8),
+                       created_at=stamp, updated_at=stamp)
+
+
+def _contact_message(rng, i):
+    return ContactMessage(name=f'Visitor {i}', email=f'visitor{i}@example.com', subject=_words(rng, 4).capitalize(),
+                          message=_words(rng, 30), is_read=rng.random() < 0.7, created_at=_stamp(rng))
+
+
+# model -> row factory for --scale
+GENERATORS = {
+    Project: _project,
+    Skill: _skill,
+    Note: _note,
+    RunHistory: _run_history,
+    DesktopItem: _desktop_item,
+    ContactMessage: _contact_message,
+}
+
+
+def insert_as_generated(model, rows, batch_size):
+    """Insert ``rows`` keeping the created/updated stamps they were generated with.
+
+    bulk_create() runs each field's pre_save(), which replaces auto_now and
+    auto_now_add values with now(). A raw insert, as loaddata does, stores
+    every field as set, without touching the model's shared field objects.
+    """
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    size = max(1, min(batch_size, connection.ops.bulk_batch_size(fields, rows)))
+    for start in range(0, len(rows), size):
+        model._base_manager._insert(rows[start:start + size], fields=fields, raw=True)
+
 
 class Command(BaseCommand):
-    help = 'Populate the database with sample data'
+    help = 'Populate the database with sample data, or with --scale N synthetic rows per table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=0,
+                            help='Also bulk-generate N synthetic rows of each growing table')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for --scale (same seed, same rows)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT batch and transaction')
+        parser.add_argument('--models', nargs='+', metavar='MODEL', choices=[m.__name__ for m in GENERATORS],
+                            help='Limit --scale to these models')
 
     def handle(self, *args, **options):
+        if options['scale'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--scale must be >= 0 and --batch-size >= 1')
+        self.create_sample_data()
+        if options['scale']:
+            self.generate(options['scale'], options['seed'], options['batch_size'], options['models'])
+
+    def generate(self, scale, seed, batch_size, only=None):
+        self.stdout.write(f'Generating {scale} rows per table (seed {seed}, batches of {batch_size})...')
+        total_rows, started = 0, time.perf_counter()
+        for model, factory in GENERATORS.items():
+            if only and model.__name__ not in only:
+                continue
+            # One generator per model, so --models does not change the others' rows.
+            rng = random.Random(f'{seed}:{model._meta.label}')
+            rows = (factory(rng, i) for i in range(scale))
+            model_started = time.perf_counter()
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                with transaction.atomic():
+                    insert_as_generated(model, batch, batch_size)
+            elapsed = time.perf_counter() - model_started
+            render_cache.bump(model._meta.label)
+            total_rows += scale
+            self.stdout.write(f'  {model._meta.label:<22} {scale:>10} rows  {scale / elapsed if elapsed else 0:>10.0f} rows/s')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {total_rows} rows in {elapsed:.1f}s ({total_rows / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
+
+    def create_sample_data(self):
         self.stdout.write('Creating sample data...')
         
         # Create sample projects
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:19
+
+from django.db import migrations, models
+
+# Created with raw SQL by earlier versions of optimize_db; superseded by the
+# declared indexes below (or unused by any query).
+LEGACY_INDEXES = (
+    'idx_project_status',
+    'idx_project_created',
+    'idx_skill_category',
+    'idx_skill_proficiency',
+    'idx_education_years',
+)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('showcase', '0002_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [f'DROP INDEX IF EXISTS {name}' for name in LEGACY_INDEXES],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['-end_year'], name='education_end_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_date'], name='project_recent_idx'),
+        ),
+    ]
@@ -14,15 +14,21 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed')
     reward = models.CharField(max_length=300)  # Skills/technologies learned
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
+    # Resized WebP/AVIF/JPEG copies of `image`, filled in by pages.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     github_link = models.URLField(blank=True, null=True)
     live_demo = models.URLField(blank=True, null=True)
     created_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.title
     
     class Meta:
         ordering = ['-created_date']
+        indexes = [
+            models.Index(fields=['-created_date'], name='project_recent_idx'),
+        ]
 
 class Education(models.Model):
     degree = models.CharField(max_length=200)
@@ -31,12 +37,16 @@ class Education(models.Model):
     end_year = models.IntegerField()
     percentage = models.FloatField(help_text="For XP bar display")
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.degree} - {self.institution}"
     
     class Meta:
         ordering = ['-end_year']
+        indexes = [
+            models.Index(fields=['-end_year'], name='education_end_year_idx'),
+        ]
 
 class Skill(models.Model):
     SKILL_CATEGORIES = [
@@ -50,6 +60,7 @@ class Skill(models.Model):
     category = models.CharField(max_length=20, choices=SKILL_CATEGORIES)
     proficiency = models.IntegerField(help_text="1-100 for progress bar")
     icon = models.CharField(max_length=100, help_text="CSS class or emoji")
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
\ No newline at end of file
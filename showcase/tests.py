@@ -1,3 +1,76 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 
-# Create your tests here.
+from pages.models import Note
+from pages.testing import Budget, ViewBudgetMixin
+from .management.commands.populate_db import GENERATORS, SYNTHETIC_EPOCH
+from .models import Project, Skill
+
+
+class ShowcaseViewBudgetTests(ViewBudgetMixin, TestCase):
+    """Every route in showcase.urls stays within its query and p95 latency budget."""
+
+    urlconf = "showcase.urls"
+    namespace = "showcase"
+    budgets = {
+        "projects": Budget(queries=2, p95_ms=50),
+        "project_detail": Budget(queries=1, p95_ms=25),
+    }
+
+    def route_kwargs(self, name, params):
+        return {"pk": Project.objects.order_by("pk").values_list("pk", flat=True).first()}
+
+
+class PopulateDbScaleTests(TestCase):
+    """populate_db --scale writes the same rows for the same seed."""
+
+    def populate(self, **options):
+        for model in GENERATORS:
+            model.objects.all().delete()
+        call_command("populate_db", scale=40, batch_size=15, verbosity=0, stdout=StringIO(), **options)
+        return self.snapshot()
+
+    def snapshot(self):
+        rows = {}
+        for model in GENERATORS:
+            fields = [f.attname for f in model._meta.concrete_fields if not f.primary_key]
+            queryset = model.objects.order_by("pk")
+            if model in (Project, Skill):
+                # The sample rows are stamped with now(); only the synthetic ones are seeded.
+                queryset = queryset.filter(updated_at__lte=SYNTHETIC_EPOCH)
+            rows[model._meta.label] = list(queryset.values_list(*fields))
+        return rows
+
+    def test_same_seed_same_rows(self):
+        first = self.populate(seed=7)
+        self.assertEqual(len(first["pages.Note"]), 40)
+        self.assertEqual(len(first["showcase.Project"]), 40)
+        self.assertEqual(self.populate(seed=7), first)
+
+    def test_other_seed_other_rows(self):
+        first = self.populate(seed=7)
+        second = self.populate(seed=8)
+        for label in first:
+            self.assertNotEqual(second[label], first[label], label)
+
+    def test_models_filter_leaves_the_other_tables_rows_unchanged(self):
+        full = self.populate(seed=7)
+        only_notes = self.populate(seed=7, models=["Note"])
+        self.assertEqual(only_notes["pages.Note"], full["pages.Note"])
+        self.assertEqual(only_notes["pages.RunHistory"], [])
+
+    def test_bad_arguments_write_nothing(self):
+        for options in ({"scale": -1}, {"scale": 10, "batch_size": 0}):
+            with self.subTest(**options), self.assertRaises(CommandError):
+                call_command("populate_db", verbosity=0, stdout=StringIO(), **options)
+        self.assertFalse(Project.objects.exists())
+
+    def test_generated_stamps_are_kept_and_auto_now_is_left_alone(self):
+        self.populate(seed=7, models=["Note"])
+        self.assertFalse(Note.objects.filter(updated_at__gt=SYNTHETIC_EPOCH).exists())
+        field = Note._meta.get_field("updated_at")
+        self.assertTrue(field.auto_now)
+        note = Note.objects.create(title="t", content="c")
+        self.assertGreater(note.updated_at, SYNTHETIC_EPOCH)
@@ -1,6 +1,8 @@
 from django.shortcuts import render, get_object_or_404
+from pages.render_cache import cache_page_render
 from .models import Project, Education, Skill
 
+@cache_page_render("showcase:projects", depends_on=["showcase.Project"])
 def projects(request):
     """Projects - Quest Log"""
     projects = Project.objects.all().order_by('-created_date')
@@ -9,6 +11,7 @@ def projects(request):
     }
     return render(request, 'showcase/projects.html', context)
 
+@cache_page_render("showcase:project_detail", depends_on=["showcase.Project"])
 def project_detail(request, pk):
     """Individual project detail"""
     project = get_object_or_404(Project, pk=pk)
@@ -0,0 +1,42 @@
+// 📡 Live changes for Pixel Portfolio
+// Subscribes to /api/events/ (Server-Sent Events) so pages can apply note,
+// desktop item and preference deltas instead of refetching whole lists.
+// Outside ASGI the endpoint answers 204, EventSource gives up, and
+// PixelChanges.live stays false: callers then refetch as before.
+const PixelChanges = (() => {
+    const handlers = {};
+    let source = null;
+    let live = false;
+
+    function emit(name, payload) {
+        (handlers[name] || []).forEach(handler => {
+            try { handler(payload); } catch (e) { console.error('PixelChanges handler failed', e); }
+        });
+    }
+
+    function connect() {
+        if (source || !window.EventSource) return;
+        source = new EventSource('/api/events/');
+        source.addEventListener('ready', () => { live = true; });
+        source.addEventListener('change', event => {
+            const change = JSON.parse(event.data);
+            emit(change.resource, change);
+        });
+        // Missed events were pruned (or the stream fell behind): refetch once.
+        source.addEventListener('reset', () => { live = true; emit('reset'); });
+        source.onerror = () => {
+            live = false;
+            // CONNECTING means the browser retries by itself with Last-Event-ID.
+            if (source.readyState === EventSource.CLOSED) source = null;
+        };
+    }
+
+    return {
+        // resource: 'notes' | 'desktop-items' | 'preferences' | 'reset'
+        on(resource, handler) {
+            (handlers[resource] = handlers[resource] || []).push(handler);
+            connect();
+        },
+        get live() { return live; },
+    };
+})();
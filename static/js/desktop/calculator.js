@@ -0,0 +1,71 @@
+// 🧮 Calculator app for the desktop (loaded on demand by core.js)
+
+let calcCurrentInput = '0';
+let calcOperator = null;
+let calcPreviousInput = null;
+let calcWaitingForOperand = false;
+
+function calcInput(value) {
+    playSound('click');
+    const display = document.getElementById('calcDisplay');
+
+    if (calcWaitingForOperand) {
+        calcCurrentInput = value;
+        calcWaitingForOperand = false;
+    } else {
+        calcCurrentInput = calcCurrentInput === '0' ? value : calcCurrentInput + value;
+    }
+
+    display.textContent = calcCurrentInput;
+}
+
+function calcClear() {
+    playSound('click');
+    calcCurrentInput = '0';
+    calcOperator = null;
+    calcPreviousInput = null;
+    calcWaitingForOperand = false;
+    document.getElementById('calcDisplay').textContent = calcCurrentInput;
+}
+
+function calcBackspace() {
+    playSound('click');
+    calcCurrentInput = calcCurrentInput.slice(0, -1) || '0';
+    document.getElementById('calcDisplay').textContent = calcCurrentInput;
+}
+
+function calcEquals() {
+    playSound('click');
+    if (calcOperator && calcPreviousInput !== null && !calcWaitingForOperand) {
+        const prev = parseFloat(calcPreviousInput);
+        const current = parseFloat(calcCurrentInput);
+        let result;
+
+        switch (calcOperator) {
+            case '+': result = prev + current; break;
+            case '-': result = prev - current; break;
+            case '*': result = prev * current; break;
+            case '/': result = current !== 0 ? prev / current : 'Error'; break;
+            default: return;
+        }
+
+        calcCurrentInput = result.toString();
+        document.getElementById('calcDisplay').textContent = calcCurrentInput;
+        calcOperator = null;
+        calcPreviousInput = null;
+        calcWaitingForOperand = true;
+    }
+}
+
+// Enhanced Calculator Functions
+function initializeCalculator() {
+    updateCalculatorDisplay();
+}
+
+function updateCalculatorDisplay() {
+    const memory = document.getElementById('calcMemory');
+    const history = document.getElementById('calcHistory');
+
+    if (memory) memory.textContent = '0';
+    if (history) history.textContent = '0';
+}
@@ -0,0 +1,1405 @@
+// 🖥️ Pixel Portfolio desktop
+// Window manager, start menu, taskbar, context menu, themes and startup.
+// The desktop apps below live in their own scripts and are only fetched the
+// first time one of their functions is called (see PixelApps.lazy).
+
+// Desktop apps: script URLs per module from #desktop-modules (versioned
+// static URLs, so a module is downloaded once and then served from cache)
+const PixelApps = (function(){
+    const node = document.getElementById('desktop-modules');
+    const urls = node ? JSON.parse(node.textContent) : {};
+    const loading = {};
+
+    function inject(src){
+        return new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = src;
+            script.onload = resolve;
+            script.onerror = () => reject(new Error(`Failed to load ${src}`));
+            document.head.appendChild(script);
+        });
+    }
+
+    function load(name){
+        if (!loading[name]) {
+            // A module's scripts run in order, as their <script> tags would
+            loading[name] = (urls[name] || []).reduce((ready, src) => ready.then(() => inject(src)), Promise.resolve())
+                .catch(error => { delete loading[name]; throw error; });
+        }
+        return loading[name];
+    }
+
+    // Define each function as a stub that loads the module, whose own
+    // function declarations then replace the stubs, and calls through
+    function lazy(name, functions){
+        functions.forEach(fn => {
+            const stub = (...args) => load(name).then(() => {
+                if (window[fn] === stub) throw new Error(`${name} does not define ${fn}`);
+                return window[fn](...args);
+            }).catch(error => {
+                updateDebug(`Module error: ${error.message}`, null, true);
+                showNotification(`Failed to load ${name}`, 'error');
+            });
+            window[fn] = stub;
+        });
+    }
+
+    return { load, lazy };
+})();
+
+PixelApps.lazy('desktop-notepad', ['initializeNotepad', 'updateNotepadStats', 'notepadSave', 'notepadOpen',
+    'notepadNew', 'notepadClear', 'notepadPrint']);
+PixelApps.lazy('desktop-calculator', ['calcInput', 'calcClear', 'calcBackspace', 'calcEquals',
+    'initializeCalculator', 'updateCalculatorDisplay']);
+PixelApps.lazy('desktop-wallpapers', ['openWallpaperPanel', 'closeWallpaperPanel', 'setWallpaper',
+    'applyCustomWallpaper', 'setAnimationSpeed', 'toggleScanlines', 'addScanlinesEffect', 'removeScanlinesEffect',
+    'setParticleDensity', 'applyParticleEffect', 'createParticle', 'saveWallpaperSettings',
+    'resetWallpaperSettings', 'loadWallpaperSettings', 'toggleWallpaper']);
+PixelApps.lazy('desktop-run', ['showRunDialog', 'executeRunCommand']);
+PixelApps.lazy('desktop-windows', ['loadWindowContent', 'recycleEmpty', 'recycleRestore', 'recycleProperties',
+    'testDragging', 'showContactForm', 'hideContactForm', 'showContactInfo', 'hideContactInfo',
+    'showSocialLinks', 'hideSocialLinks', 'sendMessage']);
+
+// Modules whose functions the fetched page of a window calls
+const WINDOW_MODULES = {
+    notepad: 'desktop-notepad',
+    calculator: 'desktop-calculator'
+};
+
+let debugState = {
+    progress: 0,
+    errors: 0,
+    initialized: false,
+    elements: {},
+    timeouts: [],
+    sounds: true,
+    windowZIndex: 100
+};
+
+function playSound(type = 'click') {
+    if (!debugState.sounds) return;
+
+    const soundIndicator = document.getElementById('soundIndicator');
+    if (soundIndicator) {
+        soundIndicator.style.display = 'block';
+        setTimeout(() => {
+            soundIndicator.style.display = 'none';
+        }, 200);
+    }
+
+    // Create audio context for retro beeps
+    try {
+        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        const oscillator = audioContext.createOscillator();
+        const gainNode = audioContext.createGain();
+
+        oscillator.connect(gainNode);
+        gainNode.connect(audioContext.destination);
+
+        const frequencies = {
+            click: 800,
+            open: 1000,
+            close: 600,
+            error: 400,
+            startup: 1200
+        };
+
+        oscillator.frequency.setValueAtTime(frequencies[type] || 800, audioContext.currentTime);
+        oscillator.type = 'square';
+
+        gainNode.gain.setValueAtTime(0.1, audioContext.currentTime);
+        gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.1);
+
+        oscillator.start(audioContext.currentTime);
+        oscillator.stop(audioContext.currentTime + 0.1);
+    } catch (error) {
+        console.log('Audio not supported');
+    }
+}
+
+// Enhanced utility functions
+function safeTimeout(callback, delay, description = 'Anonymous timeout') {
+    try {
+        const timeoutId = setTimeout(() => {
+            try {
+                callback();
+                debugState.timeouts = debugState.timeouts.filter(id => id !== timeoutId);
+            } catch (error) {
+                updateDebug(`Timeout callback error (${description}): ${error.message}`, null, true);
+            }
+        }, delay);
+
+        debugState.timeouts.push(timeoutId);
+        return timeoutId;
+    } catch (error) {
+        updateDebug(`Timeout creation error: ${error.message}`, null, true);
+        return null;
+    }
+}
+
+function checkElement(id, required = true) {
+    try {
+        const element = document.getElementById(id);
+        if (!element && required) {
+            updateDebug(`Required element missing: ${id}`, null, true);
+            debugState.errors++;
+        }
+        return element;
+    } catch (error) {
+        updateDebug(`Element check error for ${id}: ${error.message}`, null, true);
+        return null;
+    }
+}
+
+function updateDebug(message, progress = null, isError = false) {
+    try {
+        if (progress !== null) {
+            debugState.progress = Math.max(0, Math.min(100, progress));
+        }
+
+        if (isError) {
+            debugState.errors++;
+        }
+
+        const debugContent = document.getElementById('debugContent');
+        if (debugContent) {
+            const entry = document.createElement('div');
+            entry.className = `debug-entry ${isError ? 'error' : ''}`;
+            entry.textContent = `[${new Date().toLocaleTimeString()}] ${message}`;
+            debugContent.appendChild(entry);
+            debugContent.scrollTop = debugContent.scrollHeight;
+
+            // Keep only last 50 entries
+            while (debugContent.children.length > 50) {
+                debugContent.removeChild(debugContent.firstChild);
+            }
+        }
+
+        console.log(`[v0] ${message}`);
+    } catch (error) {
+        console.error('[v0] Debug update failed:', error);
+    }
+}
+
+let windowCounter = 0;
+let windows = new Map();
+let activeWindow = null;
+let isResizing = true;
+let resizeData = {};
+
+// Helper function to check if a position overlaps with existing windows
+function isPositionOverlapping(x, y, width, height) {
+    for (const [id, windowData] of windows) {
+        const element = windowData.element;
+        const rect = element.getBoundingClientRect();
+
+        // Check if rectangles overlap
+        if (x < rect.right && x + width > rect.left &&
+            y < rect.bottom && y + height > rect.top) {
+            return true;
+        }
+    }
+    return false;
+}
+function openWindow(type) {
+    try {
+        playSound('open');
+        const windowId = `window_${++windowCounter}`;
+        const window = createWindow(type, windowId);
+
+        windows.set(windowId, {
+            element: window,
+            type: type,
+            minimized: false,
+            maximized: false
+        });
+
+        setActiveWindow(windowId);
+        updateTaskbar();
+
+        // Opening animation
+        window.style.opacity = '0';
+        window.style.transform = 'scale(0.8) translateY(20px)';
+        setTimeout(() => {
+            window.style.transition = 'opacity 0.2s ease, transform 0.2s ease';
+            window.style.opacity = '1';
+            window.style.transform = 'none';
+        }, 10);
+
+        // Window content
+        const content = window.querySelector('.window-content');
+        if (!content) return;
+
+        // Try dynamic fetch from Django (map logical type to route)
+        content.innerHTML = "<p>Loading...</p>";
+        const routeMap = {
+            home: '/',
+            projects: '/projects/',
+            about: '/about/',
+            contact: '/contact/',
+            notepad: '/notepad/',
+            calculator: '/calculator/',
+            mycomputer: '/mycomputer/',
+            recycle: '/recycle/'
+        };
+        const path = routeMap[type] || `/${type}/`;
+        if (WINDOW_MODULES[type]) {
+            PixelApps.load(WINDOW_MODULES[type]).catch(() => {});
+        }
+        fetch(path)
+            .then(res => {
+                if (!res.ok) throw new Error("No Django route");
+                return res.text();
+            })
+            .then(html => {
+                content.innerHTML = html;
+            })
+            .catch(err => {
+                console.warn(`Falling back to static for ${type}:`, err.message);
+                // Use your old preload function as fallback
+                loadWindowContent(window, type);
+            });
+
+        updateDebug(`Window opened: ${type}`);
+    } catch (error) {
+        updateDebug(`Window open error: ${error.message}`, null, true);
+        showNotification(`Failed to open ${type} window`, 'error');
+    }
+}
+
+function createWindow(type, id) {
+    const window = document.createElement('div');
+    window.className = 'window';
+    window.id = id;
+
+    // Smart positioning - avoid overlapping with existing windows
+    let x, y;
+    const windowWidth = 600;
+    const windowHeight = 400;
+
+    // Try to find a good position that doesn't overlap
+    let attempts = 0;
+    do {
+        x = 50 + (attempts * 30) % (window.innerWidth - windowWidth - 100);
+        y = 50 + (attempts * 20) % (window.innerHeight - windowHeight - 100);
+        attempts++;
+    } while (isPositionOverlapping(x, y, windowWidth, windowHeight) && attempts < 20);
+
+    // Ensure window stays within bounds
+    x = Math.max(20, Math.min(x, window.innerWidth - windowWidth - 20));
+    y = Math.max(20, Math.min(y, window.innerHeight - windowHeight - 60));
+
+    window.style.cssText = `
+        top: ${y}px;
+        left: ${x}px;
+        width: ${windowWidth}px;
+        height: ${windowHeight}px;
+        z-index: ${++debugState.windowZIndex};
+        position: absolute;
+    `;
+
+    const header = document.createElement('div');
+    header.className = 'window-header';
+    header.innerHTML = `
+        <span>${type.toUpperCase()}</span>
+        <div class="window-controls">
+            <div class="window-control minimize">_</div>
+            <div class="window-control maximize">□</div>
+            <div class="window-control close">×</div>
+        </div>
+    `;
+
+    const content = document.createElement('div');
+    content.className = 'window-content';
+
+    window.appendChild(header);
+    window.appendChild(content);
+
+    // Add resize handles
+    addResizeHandles(window);
+
+    document.body.appendChild(window);
+
+    // Make window draggable and add controls
+    console.log('=== CREATING WINDOW ===');
+    console.log('Window element:', window);
+    console.log('Window style before makeWindowDraggable:', window.style.cssText);
+
+    makeWindowDraggable(window, header);
+    addWindowControls(window);
+
+    console.log('Window style after makeWindowDraggable:', window.style.cssText);
+    console.log('=== WINDOW CREATED ===');
+
+    // Click to focus
+    window.addEventListener('mousedown', () => {
+        setActiveWindow(id);
+    });
+
+    return window;
+}
+
+function addResizeHandles(windowElement) {
+    const handles = ['n', 's', 'e', 'w', 'ne', 'nw', 'se', 'sw'];
+
+    handles.forEach(direction => {
+        const handle = document.createElement('div');
+        handle.className = `window-resize-handle ${direction}`;
+        handle.addEventListener('mousedown', (e) => startResize(e, windowElement, direction));
+        windowElement.appendChild(handle);
+    });
+}
+
+function startResize(e, windowElement, direction) {
+    if (windows.get(windowElement.id)?.maximized) return;
+
+    e.preventDefault();
+    e.stopPropagation();
+
+    isResizing = true;
+    resizeData = {
+        windowElement: windowElement,
+        direction: direction,
+        startX: e.clientX,
+        startY: e.clientY,
+        startWidth: parseInt(windowElement.style.width),
+        startHeight: parseInt(windowElement.style.height),
+        startLeft: parseInt(windowElement.style.left),
+        startTop: parseInt(windowElement.style.top)
+    };
+
+    document.addEventListener('mousemove', handleResize);
+    document.addEventListener('mouseup', stopResize);
+}
+
+function handleResize(e) {
+    if (!isResizing) return;
+
+    const { windowElement, direction, startX, startY, startWidth, startHeight, startLeft, startTop } = resizeData;
+    const deltaX = e.clientX - startX;
+    const deltaY = e.clientY - startY;
+
+    let newWidth = startWidth;
+    let newHeight = startHeight;
+    let newLeft = startLeft;
+    let newTop = startTop;
+
+    // Handle different resize directions
+    if (direction.includes('e')) {
+        newWidth = Math.max(300, startWidth + deltaX);
+    }
+    if (direction.includes('w')) {
+        newWidth = Math.max(300, startWidth - deltaX);
+        newLeft = startLeft + (startWidth - newWidth);
+    }
+    if (direction.includes('s')) {
+        newHeight = Math.max(200, startHeight + deltaY);
+    }
+    if (direction.includes('n')) {
+        newHeight = Math.max(200, startHeight - deltaY);
+        newTop = startTop + (startHeight - newHeight);
+    }
+
+    // Apply constraints
+    const maxX = window.innerWidth - newWidth;
+    const maxY = window.innerHeight - newHeight - 40;
+
+    newLeft = Math.max(0, Math.min(newLeft, maxX));
+    newTop = Math.max(0, Math.min(newTop, maxY));
+
+    windowElement.style.width = newWidth + 'px';
+    windowElement.style.height = newHeight + 'px';
+    windowElement.style.left = newLeft + 'px';
+    windowElement.style.top = newTop + 'px';
+}
+
+function stopResize() {
+    isResizing = false;
+    resizeData = {};
+    document.removeEventListener('mousemove', handleResize);
+    document.removeEventListener('mouseup', stopResize);
+}
+
+function setActiveWindow(windowId) {
+    // Remove active class from all windows
+    document.querySelectorAll('.window').forEach(window => {
+        window.classList.remove('active');
+    });
+
+    // Add active class to current window
+    const currentWindow = document.getElementById(windowId);
+    if (currentWindow) {
+        currentWindow.classList.add('active');
+        currentWindow.style.zIndex = getHighestZIndex() + 1;
+    }
+
+    // Track active window for taskbar highlighting
+    activeWindow = windowId;
+
+    // Update taskbar
+    updateTaskbar();
+}
+
+function updateTaskbar() {
+    const tabs = document.getElementById('taskbarTabs');
+    if (!tabs) {
+        updateDebug('updateTaskbar: taskbarTabs element not found', null, true);
+        return;
+    }
+
+    // Clear only the tabs region, keep START and clock
+    tabs.innerHTML = "";
+
+    // Iterate Map of windows and render tabs
+    windows.forEach((windowData, windowId) => {
+        const label = windowData.title || (windowData.type ? String(windowData.type).toUpperCase() : windowId);
+        const tab = document.createElement('div');
+        tab.className = 'taskbar-tab' + (windowId === activeWindow ? ' active' : '');
+        tab.textContent = label;
+        tab.onclick = () => {
+            if (windowData.minimized) {
+                restoreWindow(windowId);
+            } else {
+                setActiveWindow(windowId);
+            }
+        };
+        tabs.appendChild(tab);
+    });
+}
+
+
+function makeWindowDraggable(windowElement, header) {
+    let isDragging = false;
+    let offsetX, offsetY;
+
+    // Mouse down event
+    header.addEventListener('mousedown', function(e) {
+        // Don't drag if clicking on window controls
+        if (e.target.classList.contains('window-control')) {
+            return;
+        }
+
+        // Don't drag if window is maximized
+        if (windows.get(windowElement.id)?.maximized) {
+            return;
+        }
+
+        console.log('=== DRAG START ===');
+        console.log('Window element:', windowElement);
+        console.log('Window style:', windowElement.style.cssText);
+
+        isDragging = true;
+
+        // Calculate offset from mouse to window top-left corner
+        const rect = windowElement.getBoundingClientRect();
+        offsetX = e.clientX - rect.left;
+        offsetY = e.clientY - rect.top;
+
+        console.log('Mouse position:', e.clientX, e.clientY);
+        console.log('Window rect:', rect);
+        console.log('Offset calculated:', offsetX, offsetY);
+
+        // Set active window
+        setActiveWindow(windowElement.id);
+
+        // Visual feedback
+        windowElement.style.cursor = 'move';
+        windowElement.style.opacity = '0.8';
+
+        // Prevent default behavior
+        e.preventDefault();
+        e.stopPropagation();
+
+        console.log('Drag started successfully');
+    });
+
+    // Mouse move event
+    document.addEventListener('mousemove', function(e) {
+        if (!isDragging) return;
+
+        console.log('=== DRAG MOVE ===');
+        console.log('Mouse position:', e.clientX, e.clientY);
+
+        // Calculate new position
+        let newLeft = e.clientX - offsetX;
+        let newTop = e.clientY - offsetY;
+
+        // Keep window within bounds
+        const maxLeft = window.innerWidth - windowElement.offsetWidth;
+        const maxTop = window.innerHeight - windowElement.offsetHeight;
+
+        newLeft = Math.max(0, Math.min(newLeft, maxLeft));
+        newTop = Math.max(0, Math.min(newTop, maxTop));
+
+        console.log('New position calculated:', newLeft, newTop);
+
+        // Apply new position
+        windowElement.style.left = newLeft + 'px';
+        windowElement.style.top = newTop + 'px';
+
+        console.log('Position applied. New style:', windowElement.style.cssText);
+    });
+
+    // Mouse up event
+    document.addEventListener('mouseup', function() {
+        if (isDragging) {
+            console.log('=== DRAG END ===');
+
+            isDragging = false;
+
+            // Reset visual feedback
+            windowElement.style.cursor = 'default';
+            windowElement.style.opacity = '1';
+
+            console.log('Drag ended successfully');
+        }
+    });
+
+    // Mouse leave event (safety)
+    document.addEventListener('mouseleave', function() {
+        if (isDragging) {
+            console.log('=== MOUSE LEAVE - STOPPING DRAG ===');
+            isDragging = false;
+            windowElement.style.cursor = 'default';
+            windowElement.style.opacity = '1';
+        }
+    });
+}
+
+function addWindowControls(windowElement) {
+    const controls = windowElement.querySelectorAll('.window-control');
+
+    controls.forEach(control => {
+        control.addEventListener('click', (e) => {
+            e.stopPropagation();
+            playSound('click');
+            const action = control.textContent;
+            handleWindowControl(windowElement, action);
+        });
+    });
+}
+
+function handleWindowControl(windowElement, action) {
+    try {
+        const windowData = windows.get(windowElement.id);
+        if (!windowData) return;
+
+        switch(action) {
+            case '_': // Minimize
+                windowData.minimized = true;
+                windowElement.style.display = 'none';
+                playSound('close');
+                break;
+
+            case '□': // Maximize/Restore
+                if (windowData.maximized) {
+                    // Restore
+                    windowElement.style.cssText = windowData.originalStyle || '';
+                    windowElement.classList.remove('maximized');
+                    windowData.maximized = false;
+                } else {
+                    // Maximize
+                    windowData.originalStyle = windowElement.style.cssText;
+                    windowElement.style.cssText = `
+                        top: 0 !important;
+                        left: 0 !important;
+                        width: 100vw !important;
+                        height: calc(100vh - 40px) !important;
+                        z-index: ${++debugState.windowZIndex} !important;
+                    `;
+                    windowElement.classList.add('maximized');
+                    windowData.maximized = true;
+                }
+                break;
+
+            case '×': // Close
+                playSound('close');
+                windowElement.remove();
+                windows.delete(windowElement.id);
+                if (activeWindow === windowElement.id) {
+                    activeWindow = null;
+                }
+                updateTaskbar();
+                break;
+        }
+    } catch (error) {
+        updateDebug(`Window control error: ${error.message}`, null, true);
+    }
+}
+
+function getCSRFToken() {
+    const match = document.cookie.match(/csrftoken=([^;]+)/);
+    return match ? match[1] : '';
+}
+
+// Wallpaper state (shared with wallpapers.js, read by Desktop Properties)
+let currentWallpaper = 'default';
+let wallpaperSettings = {
+    animationSpeed: 1,
+    scanlines: false,
+    particleDensity: 50
+};
+
+// Initial desktop state: inlined by the home view, or one /api/bootstrap/ call
+// when the page is served pre-rendered (that call also sets the CSRF cookie)
+const desktopBootstrap = (async function(){
+    const inline = document.getElementById('desktop-bootstrap');
+    if(inline){
+        try { return JSON.parse(inline.textContent); } catch (_) {}
+    }
+    const res = await fetch('/api/bootstrap/', { headers: { 'Accept': 'application/json' } });
+    return res.ok ? res.json() : {};
+})().catch(() => ({}));
+
+// Theme catalog (key -> theme) from the bootstrap state
+const CP_THEMES = {};
+
+async function ensureCpThemes(){
+    if(Object.keys(CP_THEMES).length) return;
+    ((await desktopBootstrap).themes || []).forEach(t => { CP_THEMES[t.key] = t; });
+}
+
+function applyThemeVars(vars){ Object.entries(vars).forEach(([k,v])=>document.documentElement.style.setProperty(k,v)); }
+
+// Prefer swapping the precompiled theme stylesheet; fall back to inline variables
+function applyCpTheme(theme){
+    const link = document.getElementById('theme-css');
+    if(theme.css_url && link){
+        Object.keys(theme.variables || {}).forEach(k => document.documentElement.style.removeProperty(k));
+        if(link.getAttribute('href') !== theme.css_url) link.setAttribute('href', theme.css_url);
+        link.disabled = false;
+    } else {
+        applyThemeVars(theme.variables || {});
+    }
+}
+
+function openControlPanel(){
+    const win = createWindow('control', `control_${Date.now()}`);
+    const content = win.querySelector('.window-content');
+    content.innerHTML = `
+        <h1 style="margin:0;">⚙️ CONTROL PANEL</h1>
+        <h2>🎨 Themes</h2>
+        <div style="margin:10px 0;">
+            <button class="btn" onclick="renderCpThemes('All')">All</button>
+            <button class="btn" onclick="renderCpThemes('Retro')">Retro</button>
+            <button class="btn" onclick="renderCpThemes('Modern')">Modern</button>
+            <button class="btn" onclick="renderCpThemes('Nostalgia')">Nostalgia</button>
+            <button class="btn" onclick="renderCpThemes('Art')">Art</button>
+        </div>
+        <div id="cpThemeList" style="display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:10px;"></div>
+    `;
+    windows.set(win.id, { element: win, title: 'Control Panel', minimized:false, maximized:false });
+    updateTaskbar();
+    ensureCpThemes().then(() => renderCpThemes('All'));
+}
+
+function renderCpThemes(filter){
+    const list = document.getElementById('cpThemeList');
+    const active = localStorage.getItem('pp_theme_key') || 'retro-98';
+    const items = Object.entries(CP_THEMES).filter(([k,t])=> filter==='All' || t.category===filter).map(([key,t])=>{
+        const isActive = key===active ? ' (Active)' : '';
+        const iconRow = (t.icons && t.icons.length) ? `<div style="margin-top:6px; font-size:18px;">${t.icons.join(' ')}</div>` : '';
+        return `<div style="border:2px inset var(--retro-highlight);background:var(--retro-window);padding:10px;">
+            <div style="font-weight:bold;">${t.name}${isActive}</div>
+            <div style="margin:8px 0; font-size:12px;opacity:0.8;">${t.category}</div>
+            <button class="btn" onclick="selectCpTheme('${key}')">Apply</button>
+            ${iconRow}
+        </div>`;
+    }).join('');
+    list.innerHTML = items || 'No themes';
+}
+
+function selectCpTheme(key){
+    const theme = CP_THEMES[key];
+    if(!theme) return;
+    applyCpTheme(theme);
+    localStorage.setItem('pp_theme_key', key);
+    if(key.startsWith('modern')) document.body.classList.add('dark'); else document.body.classList.remove('dark');
+    showNotification(`Theme applied: ${theme.name}`, 'success');
+    renderCpThemes('All');
+}
+
+// Apply saved theme on startup
+(function(){
+    const k = localStorage.getItem('pp_theme_key') || 'retro-98';
+    ensureCpThemes().then(() => { if(CP_THEMES[k]) applyCpTheme(CP_THEMES[k]); }).catch(() => {});
+})();
+
+function hideContextMenu() {
+    const contextMenu = document.getElementById('contextMenu');
+    if (contextMenu) {
+        contextMenu.style.display = 'none';
+    }
+}
+
+function showContextMenu(e) {
+    e.preventDefault();
+    const contextMenu = document.getElementById('contextMenu');
+    if (contextMenu) {
+        contextMenu.style.display = 'block';
+        contextMenu.style.left = e.clientX + 'px';
+        contextMenu.style.top = e.clientY + 'px';
+        playSound('click');
+    }
+}
+
+function handleContextMenuAction(action) {
+    hideContextMenu();
+
+    switch(action) {
+        case 'refresh':
+            location.reload();
+            break;
+        case 'wallpaper':
+            openWallpaperPanel();
+            break;
+        case 'properties':
+            openDesktopProperties();
+            break;
+        case 'new-folder':
+            createNewFolder();
+            break;
+        case 'arrange':
+            arrangeDesktopIcons();
+            break;
+    }
+}
+
+function openDesktopProperties(){
+    const dialog = document.createElement('div');
+    dialog.className = 'system-dialog';
+    dialog.innerHTML = `
+        <div class="dialog-header">
+            <span>Desktop Properties</span>
+            <span class="dialog-close" onclick="this.parentElement.parentElement.remove()">×</span>
+        </div>
+        <div class="dialog-content">
+            <p><strong>Wallpaper:</strong> ${currentWallpaper}</p>
+            <p><strong>Theme:</strong> ${localStorage.getItem('pp_theme_key') || 'retro-98'}</p>
+            <p><strong>Windows Open:</strong> ${document.querySelectorAll('.window').length}</p>
+        </div>
+    `;
+    document.body.appendChild(dialog);
+}
+
+async function createNewFolder(){
+    try {
+        const csrftoken = (document.cookie.match(/csrftoken=([^;]+)/)||[])[1]||'';
+        const res = await fetch('/api/desktop-items/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrftoken },
+            body: JSON.stringify({ label: 'New Folder', item_type: 'folder', pos_x: 80, pos_y: 320 })
+        });
+        const data = await res.json();
+        if(res.ok){
+            renderDesktopItem(data);
+            showNotification('New folder created!', 'success');
+        } else {
+            showNotification('Failed to create folder', 'error');
+        }
+    } catch (e) {
+        showNotification('Failed to create folder', 'error');
+    }
+}
+
+function renderDesktopItem(item){
+    const desktop = document.getElementById('desktop');
+    // A streamed change may have drawn it before its page arrived
+    if(!desktop || desktop.querySelector(`.desktop-icon[data-item-id="${item.id}"]`)) return;
+    const icon = document.createElement('div');
+    icon.className = 'desktop-icon';
+    icon.style.top = (item.pos_y||100) + 'px';
+    icon.style.left = (item.pos_x||100) + 'px';
+    icon.dataset.itemId = item.id;
+    // Echoed with each move so the server can refuse moves of a stale copy
+    if (item.updated_at) icon.dataset.updatedAt = item.updated_at;
+    icon.innerHTML = `
+        <div class="icon">📁</div>
+        <div class="icon-label">${item.label}</div>
+    `;
+    icon.addEventListener('dblclick', ()=> showNotification(`${item.label} opened`, 'info'));
+    desktop.appendChild(icon);
+}
+
+// Persisted icons are dragged through one delegated set of listeners
+let iconDrag = null;
+
+document.addEventListener('mousedown', (e) => {
+    if (e.button !== 0) return; // Left click only
+    const icon = e.target.closest && e.target.closest('.desktop-icon[data-item-id]');
+    if (!icon) return;
+    iconDrag = { icon, moved: false, offsetX: e.clientX - icon.offsetLeft, offsetY: e.clientY - icon.offsetTop };
+    icon.style.zIndex = 1000;
+});
+
+document.addEventListener('mousemove', (e) => {
+    if (!iconDrag) return;
+    e.preventDefault();
+    const { icon } = iconDrag;
+    // Keep the icon on the desktop, above the taskbar
+    const maxX = window.innerWidth - icon.offsetWidth;
+    const maxY = window.innerHeight - icon.offsetHeight - 40;
+    icon.style.left = Math.max(0, Math.min(e.clientX - iconDrag.offsetX, maxX)) + 'px';
+    icon.style.top = Math.max(0, Math.min(e.clientY - iconDrag.offsetY, maxY)) + 'px';
+    iconDrag.moved = true;
+});
+
+document.addEventListener('mouseup', () => {
+    if (!iconDrag) return;
+    const { icon, moved } = iconDrag;
+    iconDrag = null;
+    icon.style.zIndex = 10;
+    if (moved) queueIconPosition(icon);
+});
+
+// Desktop item moves are coalesced per id and flushed as one batched sync call
+const DESKTOP_SYNC_URL = '/api/desktop-items/sync/';
+const DESKTOP_SYNC_DELAY_MS = 400;
+const pendingDesktopItems = new Map();
+let desktopSyncTimer = null;
+
+function queueIconPosition(icon) {
+    const id = icon.dataset.itemId;
+    if (!id) return;
+    const item = {
+        id: Number(id),
+        pos_x: parseInt(icon.style.left, 10) || 0,
+        pos_y: parseInt(icon.style.top, 10) || 0
+    };
+    if (icon.dataset.updatedAt) item.updated_at = icon.dataset.updatedAt;
+    queueDesktopItem(item);
+}
+
+function queueDesktopItem(data) {
+    pendingDesktopItems.set(data.id, Object.assign(pendingDesktopItems.get(data.id) || {}, data));
+    clearTimeout(desktopSyncTimer);
+    desktopSyncTimer = setTimeout(() => flushDesktopItems().catch(() => {}), DESKTOP_SYNC_DELAY_MS);
+}
+
+function takePendingDesktopItems() {
+    clearTimeout(desktopSyncTimer);
+    desktopSyncTimer = null;
+    const items = Array.from(pendingDesktopItems.values());
+    pendingDesktopItems.clear();
+    return items;
+}
+
+async function flushDesktopItems() {
+    const items = takePendingDesktopItems();
+    if (!items.length) return { results: [], conflicts: [] };
+    const res = await fetch(DESKTOP_SYNC_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+        body: JSON.stringify({ items })
+    });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const data = await res.json();
+    (data.results || []).forEach(item => rememberDesktopVersion(item.id, item.updated_at));
+    (data.conflicts || []).forEach(conflict => {
+        const icon = document.querySelector(`.desktop-icon[data-item-id="${conflict.id}"]`);
+        if (conflict.reason === 'not_found' && icon) delete icon.dataset.itemId;
+        if (conflict.reason === 'stale' && icon && conflict.current) {
+            icon.style.left = conflict.current.pos_x + 'px';
+            icon.style.top = conflict.current.pos_y + 'px';
+            rememberDesktopVersion(conflict.id, conflict.current.updated_at);
+        }
+        updateDebug(`Desktop sync conflict for item ${conflict.id}: ${conflict.reason}`, null, true);
+    });
+    return data;
+}
+
+// Record the version the server now holds for an item, including on moves
+// queued while the sync that produced it was in flight (they follow our own write)
+function rememberDesktopVersion(id, updatedAt) {
+    if (!updatedAt) return;
+    const icon = document.querySelector(`.desktop-icon[data-item-id="${id}"]`);
+    if (icon) icon.dataset.updatedAt = updatedAt;
+    const pending = pendingDesktopItems.get(id);
+    if (pending) pending.updated_at = updatedAt;
+}
+
+// The page is going away: hand the last moves to the browser so they are not lost.
+// A beacon cannot carry headers, so the CSRF token travels as a form field.
+window.addEventListener('pagehide', () => {
+    const items = takePendingDesktopItems();
+    if (!items.length) return;
+    const form = new FormData();
+    form.append('csrfmiddlewaretoken', getCSRFToken());
+    form.append('items', JSON.stringify(items));
+    if (!(navigator.sendBeacon && navigator.sendBeacon(DESKTOP_SYNC_URL, form))) {
+        fetch(DESKTOP_SYNC_URL, { method: 'POST', body: form, keepalive: true }).catch(() => {});
+    }
+});
+
+// Render persisted desktop items from the bootstrap state, then any further pages
+desktopBootstrap.then(async boot => {
+    (boot.desktop_items || []).forEach(renderDesktopItem);
+    let after = boot.desktop_items_next;
+    while (after) {
+        const res = await fetch(`/api/desktop-items/?after=${after}`, { headers: { 'Accept': 'application/json' } });
+        if (!res.ok) return;
+        const page = await res.json();
+        (page.results || []).forEach(renderDesktopItem);
+        after = page.next_after;
+    }
+}).catch(() => {});
+
+// Apply desktop changes made in other tabs as they stream in
+PixelChanges.on('desktop-items', change => {
+    const icon = document.querySelector(`.desktop-icon[data-item-id="${change.id}"]`);
+    if(change.action === 'delete'){ if(icon) icon.remove(); return; }
+    if(!icon){ renderDesktopItem(change.data); return; }
+    icon.style.left = change.data.pos_x + 'px';
+    icon.style.top = change.data.pos_y + 'px';
+    if(change.data.updated_at) icon.dataset.updatedAt = change.data.updated_at;
+    const label = icon.querySelector('.icon-label');
+    if(label) label.textContent = change.data.label;
+});
+PixelChanges.on('preferences', change => {
+    const key = change.data && change.data.theme;
+    if(key && key !== localStorage.getItem('pp_theme_key') && CP_THEMES[key]){
+        localStorage.setItem('pp_theme_key', key);
+        applyCpTheme(CP_THEMES[key]);
+    }
+});
+
+function arrangeDesktopIcons(){
+    const icons = Array.from(document.querySelectorAll('.desktop-icon'));
+    const startX = 80, startY = 80, gapX = 140, gapY = 120, maxY = window.innerHeight - 180;
+    let x = startX, y = startY;
+    icons.forEach(icon => {
+        icon.style.left = x + 'px';
+        icon.style.top = y + 'px';
+        y += gapY;
+        if(y > maxY){ y = startY; x += gapX; }
+        queueIconPosition(icon);
+    });
+    showNotification('Icons arranged!', 'success');
+}
+
+function toggleDebugPanel() {
+    const debugPanel = document.getElementById('debugPanel');
+    if (debugPanel) {
+        debugPanel.classList.toggle('show');
+        playSound('click');
+    }
+}
+
+// Notification system
+function showNotification(message, type = 'info') {
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.innerHTML = `
+        <div style="font-weight: bold; margin-bottom: 5px;">${type.toUpperCase()}</div>
+        <div>${message}</div>
+    `;
+
+    document.body.appendChild(notification);
+    playSound(type === 'error' ? 'error' : 'click');
+
+    safeTimeout(() => {
+        if (notification.parentNode) {
+            notification.remove();
+        }
+    }, 3000, 'Notification cleanup');
+}
+
+// Utility functions
+function copyToClipboard(text) {
+    try {
+        navigator.clipboard.writeText(text).then(() => {
+            showNotification(`Copied: ${text}`, 'success');
+        }).catch(() => {
+            showNotification('Copy failed - clipboard not available', 'error');
+        });
+    } catch (error) {
+        showNotification('Copy failed - clipboard not available', 'error');
+    }
+}
+
+function updateClock() {
+    try {
+        const clock = checkElement('clock', false);
+        if (clock) {
+            const now = new Date();
+            const timeString = now.toLocaleTimeString('en-US', {
+                hour12: false,
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit'
+            });
+            clock.textContent = timeString;
+        }
+    } catch (error) {
+        updateDebug(`Clock update error: ${error.message}`, null, true);
+    }
+}
+
+function initializeSystem() {
+    try {
+        updateDebug('Initializing Pixel Portfolio Desktop...', 10);
+
+        // Start button
+        const startButton = checkElement('startButton');
+        if (startButton) {
+            startButton.addEventListener('click', toggleStartMenu);
+        }
+
+        // Start menu items
+        document.addEventListener('click', (e) => {
+            if (e.target.classList.contains('start-menu-item')) {
+                const action = e.target.dataset.action;
+                if (action) {
+                    handleStartMenuAction(action);
+                }
+            }
+        });
+
+        // Desktop icons - single click to open
+        document.addEventListener('click', (e) => {
+            if (e.target.closest('.desktop-icon')) {
+                const icon = e.target.closest('.desktop-icon');
+                const windowType = icon.dataset.window;
+                if (windowType) {
+                    openWindow(windowType);
+                }
+            }
+        });
+
+        // Desktop icons - double click also works
+        document.addEventListener('dblclick', (e) => {
+            if (e.target.closest('.desktop-icon')) {
+                const icon = e.target.closest('.desktop-icon');
+                const windowType = icon.dataset.window;
+                if (windowType) {
+                    openWindow(windowType);
+                }
+            }
+        });
+
+        // Context menu
+        document.addEventListener('contextmenu', (e) => {
+            if (e.target.id === 'desktop' || e.target.classList.contains('desktop')) {
+                showContextMenu(e);
+            }
+        });
+
+        // Context menu actions
+        document.addEventListener('click', (e) => {
+            if (e.target.classList.contains('context-menu-item')) {
+                const action = e.target.dataset.action;
+                if (action) {
+                    handleContextMenuAction(action);
+                }
+            } else {
+                hideContextMenu();
+            }
+        });
+
+        // Hide start menu when clicking elsewhere
+        document.addEventListener('click', (e) => {
+            if (!e.target.closest('.start-menu') && !e.target.closest('.start-button')) {
+                const startMenu = document.getElementById('startMenu');
+                const startButton = document.getElementById('startButton');
+                if (startMenu && startButton) {
+                    startMenu.classList.remove('show');
+                    startButton.classList.remove('active');
+                }
+            }
+
+            // Close wallpaper panel when clicking outside
+            if (!e.target.closest('.wallpaper-panel')) {
+                const wallpaperPanel = document.getElementById('wallpaperPanel');
+                if (wallpaperPanel && wallpaperPanel.classList.contains('show')) {
+                    closeWallpaperPanel();
+                }
+            }
+        });
+
+        // Keyboard shortcuts
+        document.addEventListener('keydown', (e) => {
+            if (e.ctrlKey && e.key === 'r') {
+                e.preventDefault();
+                showRunDialog();
+            }
+            if (e.key === 'F1') {
+                e.preventDefault();
+                showNotification('Help system activated!', 'info');
+            }
+            if (e.key === 'F12') {
+                e.preventDefault();
+                toggleDebugPanel();
+            }
+            if (e.key === 'Escape') {
+                hideContextMenu();
+                const dialogs = document.querySelectorAll('.system-dialog');
+                dialogs.forEach(dialog => dialog.remove());
+
+                // Close wallpaper panel with Escape key
+                const wallpaperPanel = document.getElementById('wallpaperPanel');
+                if (wallpaperPanel && wallpaperPanel.classList.contains('show')) {
+                    closeWallpaperPanel();
+                }
+            }
+        });
+
+        // Run dialog enter key
+        document.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter' && e.target.id === 'runInput') {
+                executeRunCommand();
+            }
+        });
+
+        // Clock update
+        updateClock();
+        setInterval(updateClock, 1000);
+
+        // Startup sound and notification
+        playSound('startup');
+        showNotification('Pixel Portfolio Desktop loaded successfully!', 'success');
+
+        // Check system status
+        setTimeout(() => {
+            checkSystemStatus();
+        }, 500);
+
+        // Test wallpaper system
+        testWallpaperSystem();
+
+        // TEMPORARILY DISABLED: Load wallpaper settings after system is ready
+        // setTimeout(() => {
+        //     loadWallpaperSettings();
+        // }, 1000);
+
+        debugState.initialized = true;
+        updateDebug('System initialization complete!', 100);
+        performance.mark('desktop-interactive');
+        updateDebug(`Interactive after ${Math.round(performance.now())} ms`);
+
+    } catch (error) {
+        updateDebug(`Initialization error: ${error.message}`, null, true);
+        showNotification('System initialization failed!', 'error');
+    }
+}
+
+// Initialize when DOM is ready
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initializeSystem);
+} else {
+    initializeSystem();
+}
+
+// Global error handler
+window.addEventListener('error', (e) => {
+    updateDebug(`Global error: ${e.message}`, null, true);
+});
+
+// Prevent default drag behavior on images
+document.addEventListener('dragstart', (e) => {
+    if (e.target.tagName === 'IMG') {
+        e.preventDefault();
+    }
+});
+
+// Simple wallpaper test function
+function testWallpaperSystem() {
+    try {
+        updateDebug('Testing wallpaper system...');
+
+        // Check if basic elements exist
+        const desktop = document.getElementById('desktop');
+        if (!desktop) {
+            updateDebug('ERROR: Desktop element not found');
+            return false;
+        }
+
+        // Test basic wallpaper change
+        desktop.classList.add('wallpaper-matrix');
+        updateDebug('Matrix wallpaper applied successfully');
+
+        // Remove test wallpaper
+        setTimeout(() => {
+            desktop.classList.remove('wallpaper-matrix');
+            updateDebug('Test wallpaper removed');
+        }, 2000);
+
+        return true;
+    } catch (error) {
+        updateDebug('Wallpaper test failed: ' + error.message);
+        return false;
+    }
+}
+
+function hideStartMenu() {
+    const startMenu = document.getElementById('startMenu');
+    const startButton = document.getElementById('startButton');
+    if (startMenu) startMenu.classList.remove('show');
+    if (startButton) startButton.classList.remove('active');
+}
+
+function toggleStartMenu() {
+    const startMenu = document.getElementById('startMenu');
+    const startButton = document.getElementById('startButton');
+
+    if (startMenu && startButton) {
+        const isVisible = startMenu.classList.contains('show');
+
+        if (isVisible) {
+            hideStartMenu();
+        } else {
+            startMenu.classList.add('show');
+            startButton.classList.add('active');
+        }
+
+        playSound('click');
+    }
+}
+
+function restoreWindow(windowId) {
+    const windowData = windows.get(windowId);
+    if (!windowData) return;
+
+    const windowElement = document.getElementById(windowId);
+    if (windowElement) {
+        windowData.minimized = false;
+        windowElement.style.display = 'block';
+        windowElement.style.opacity = '1';
+        windowElement.style.transform = 'none';
+
+        setActiveWindow(windowId);
+        updateTaskbar();
+
+        playSound('open');
+        showNotification(`${windowData.title} restored!`, 'success');
+    }
+}
+
+function getHighestZIndex() {
+    let highest = 100;
+    document.querySelectorAll('.window').forEach(window => {
+        const zIndex = parseInt(window.style.zIndex) || 100;
+        if (zIndex > highest) {
+            highest = zIndex;
+        }
+    });
+    return highest;
+}
+
+function handleStartMenuAction(action) {
+    hideStartMenu();
+
+    switch(action) {
+        case 'home':
+            openWindow('home', 'home');
+            break;
+        case 'about':
+            openWindow('about', 'about');
+            break;
+        case 'projects':
+            openWindow('projects', 'projects');
+            break;
+        case 'contact':
+            openWindow('contact', 'contact');
+            break;
+        case 'mycomputer':
+            openWindow('mycomputer', 'mycomputer');
+            break;
+        case 'notepad':
+            openWindow('notepad', 'notepad');
+            break;
+        case 'calculator':
+            openWindow('calculator', 'calculator');
+            break;
+        case 'recycle':
+            openWindow('recycle', 'recycle');
+            break;
+        case 'run':
+            showRunDialog();
+            break;
+        case 'control':
+            openControlPanel();
+            break;
+        case 'wallpaper':
+            openWallpaperPanel();
+            break;
+        case 'help':
+            showNotification('Help system activated!', 'info');
+            break;
+        case 'restart':
+            showNotification('System restart initiated!', 'warning');
+            break;
+        case 'shutdown':
+            showShutdownScreen();
+            break;
+        default:
+            showNotification(`Action: ${action}`, 'info');
+            break;
+    }
+}
+
+function showShutdownScreen() {
+    const shutdownScreen = document.getElementById('shutdownScreen');
+    if (shutdownScreen) {
+        shutdownScreen.style.display = 'flex';
+        playSound('shutdown');
+
+        setTimeout(() => {
+            showNotification('Shutdown cancelled - system remains active', 'info');
+            shutdownScreen.style.display = 'none';
+        }, 3000);
+    }
+}
+
+// Database and system status check
+function checkSystemStatus() {
+    try {
+        updateDebug('Checking system status...');
+
+        // Check if localStorage is available
+        if (typeof(Storage) !== "undefined") {
+            updateDebug('localStorage: Available');
+        } else {
+            updateDebug('localStorage: Not available', null, true);
+        }
+
+        // Check if all required functions exist
+        const requiredFunctions = [
+            'openWindow', 'createWindow', 'makeWindowDraggable',
+            'toggleStartMenu', 'updateTaskbar', 'showNotification'
+        ];
+
+        let missingFunctions = [];
+        requiredFunctions.forEach(funcName => {
+            if (typeof window[funcName] !== 'function') {
+                missingFunctions.push(funcName);
+            }
+        });
+
+        if (missingFunctions.length > 0) {
+            updateDebug(`Missing functions: ${missingFunctions.join(', ')}`, null, true);
+        } else {
+            updateDebug('All required functions available');
+        }
+
+        // Check DOM elements
+        const requiredElements = ['desktop', 'startMenu', 'startButton', 'taskbar'];
+        let missingElements = [];
+        requiredElements.forEach(elementId => {
+            if (!document.getElementById(elementId)) {
+                missingElements.push(elementId);
+            }
+        });
+
+        if (missingElements.length > 0) {
+            updateDebug(`Missing elements: ${missingElements.join(', ')}`, null, true);
+        } else {
+            updateDebug('All required elements available');
+        }
+
+        return missingFunctions.length === 0 && missingElements.length === 0;
+
+    } catch (error) {
+        updateDebug(`System status check failed: ${error.message}`, null, true);
+        return false;
+    }
+}
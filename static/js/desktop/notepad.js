@@ -0,0 +1,98 @@
+// 📝 Notepad app for the desktop (loaded on demand by core.js)
+
+// Enhanced Notepad Functions
+function initializeNotepad() {
+    const textarea = document.getElementById('notepadText');
+    if (textarea) {
+        textarea.addEventListener('input', updateNotepadStats);
+        updateNotepadStats();
+    }
+}
+
+function updateNotepadStats() {
+    const textarea = document.getElementById('notepadText');
+    const charCount = document.getElementById('charCount');
+    const lineCount = document.getElementById('lineCount');
+
+    if (textarea && charCount && lineCount) {
+        const text = textarea.value;
+        const chars = text.length;
+        const lines = text.split('\n').length;
+
+        charCount.textContent = chars;
+        lineCount.textContent = lines;
+    }
+}
+
+async function notepadSave() {
+    try {
+        playSound('click');
+        const textarea = document.getElementById('notepadText');
+        const content = textarea ? textarea.value : '';
+        const title = 'Note ' + new Date().toLocaleString();
+        const res = await fetch('/api/notes/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify({ title, content })
+        });
+        if (!res.ok) throw new Error('Save failed');
+        showNotification('Note saved!', 'success');
+        updateDebug('Notepad note saved via API');
+    } catch (e) {
+        showNotification('Save failed (offline or CSRF).', 'error');
+        updateDebug('Notepad save error: ' + e.message, null, true);
+    }
+}
+
+async function notepadOpen() {
+    try {
+        playSound('click');
+        const res = await fetch('/api/notes/?limit=1');
+        if (!res.ok) throw new Error('Fetch failed');
+        const data = await res.json();
+        const latest = (data.results || [])[0];
+        if (latest) {
+            const textarea = document.getElementById('notepadText');
+            if (textarea) {
+                textarea.value = latest.content || '';
+                updateNotepadStats();
+            }
+            showNotification('Loaded latest note.', 'info');
+        } else {
+            showNotification('No notes yet.', 'info');
+        }
+        updateDebug('Notepad loaded via API');
+    } catch (e) {
+        showNotification('Open failed (offline).', 'error');
+        updateDebug('Notepad open error: ' + e.message, null, true);
+    }
+}
+
+function notepadNew() {
+    playSound('click');
+    const textarea = document.getElementById('notepadText');
+    if (textarea) {
+        textarea.value = '';
+        updateNotepadStats();
+    }
+    showNotification('New document created!', 'success');
+}
+
+function notepadClear() {
+    playSound('click');
+    const textarea = document.getElementById('notepadText');
+    if (textarea) {
+        textarea.value = '';
+        updateNotepadStats();
+    }
+    showNotification('Document cleared!', 'success');
+}
+
+function notepadPrint() {
+    playSound('click');
+    showNotification('Print dialog opened!', 'info');
+    updateDebug('Notepad print requested');
+}
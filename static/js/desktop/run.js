@@ -0,0 +1,40 @@
+// ▶️ Run dialog for the desktop (loaded on demand by core.js)
+
+function showRunDialog() {
+    const runDialog = document.createElement('div');
+    runDialog.className = 'system-dialog run-dialog';
+    runDialog.innerHTML = `
+        <div class="dialog-header">
+            <span>Run</span>
+            <span class="dialog-close" onclick="this.parentElement.parentElement.remove()">×</span>
+        </div>
+        <div class="dialog-content">
+            <p>Type the name of a program, folder, document, or Internet resource, and Windows will open it for you.</p>
+            <input type="text" id="runInput" placeholder="Type program name here..." />
+            <div class="dialog-buttons">
+                <button onclick="executeRunCommand()">OK</button>
+                <button onclick="this.parentElement.parentElement.remove()">Cancel</button>
+            </div>
+        </div>
+    `;
+
+    document.body.appendChild(runDialog);
+    document.getElementById('runInput').focus();
+    playSound('open');
+}
+
+function executeRunCommand() {
+    const input = document.getElementById('runInput');
+    const command = input.value.trim();
+
+    if (command) {
+        showNotification(`Running: ${command}`, 'info');
+        updateDebug(`Run command executed: ${command}`);
+    }
+
+    // Close dialog
+    const dialog = input.closest('.run-dialog');
+    if (dialog) {
+        dialog.remove();
+    }
+}
@@ -0,0 +1,396 @@
+// 🎨 Wallpaper panel and effects for the desktop (loaded on demand by core.js)
+
+// The panel markup ships with this module rather than with every page view
+const WALLPAPER_PANEL = `
+<div class="wallpaper-panel" id="wallpaperPanel">
+    <div class="wallpaper-header">
+        🎨 WALLPAPER CUSTOMIZATION
+        <span class="wallpaper-close" onclick="closeWallpaperPanel()">×</span>
+    </div>
+
+    <div class="wallpaper-grid">
+        <div class="wallpaper-option" data-wallpaper="default" onclick="setWallpaper('default')">
+            <div class="wallpaper-preview" style="background: var(--retro-desktop);"></div>
+            <div class="wallpaper-name">Classic Blue</div>
+            <div class="wallpaper-description">Original Windows 95 style</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="matrix" onclick="setWallpaper('matrix')">
+            <div class="wallpaper-preview matrix"></div>
+            <div class="wallpaper-name">Matrix Rain</div>
+            <div class="wallpaper-description">Green digital rain effect</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="cyberpunk" onclick="setWallpaper('cyberpunk')">
+            <div class="wallpaper-preview cyberpunk"></div>
+            <div class="wallpaper-name">Cyberpunk</div>
+            <div class="wallpaper-description">Neon pink and cyan</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="retro-wave" onclick="setWallpaper('retro-wave')">
+            <div class="wallpaper-preview retro-wave"></div>
+            <div class="wallpaper-name">Retro Wave</div>
+            <div class="wallpaper-description">80s synthwave colors</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="pixel-art" onclick="setWallpaper('pixel-art')">
+            <div class="wallpaper-preview pixel-art"></div>
+            <div class="wallpaper-name">Pixel Art</div>
+            <div class="wallpaper-description">Geometric pixel patterns</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="8bit" onclick="setWallpaper('8bit')">
+            <div class="wallpaper-preview 8bit"></div>
+            <div class="wallpaper-name">8-Bit Rainbow</div>
+            <div class="wallpaper-description">Classic gaming colors</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="crt" onclick="setWallpaper('crt')">
+            <div class="wallpaper-preview crt"></div>
+            <div class="wallpaper-name">CRT Monitor</div>
+            <div class="wallpaper-description">Authentic scanlines</div>
+        </div>
+
+        <div class="wallpaper-option" data-wallpaper="custom" onclick="setWallpaper('custom')">
+            <div class="wallpaper-preview" style="background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1);"></div>
+            <div class="wallpaper-name">Custom</div>
+            <div class="wallpaper-description">Create your own</div>
+        </div>
+    </div>
+
+    <div class="customization-options">
+        <h3 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 14px;">⚙️ ADVANCED OPTIONS</h3>
+
+        <div class="customization-option">
+            <span class="customization-label">Animation Speed:</span>
+            <div class="customization-control">
+                <input type="range" class="customization-slider" id="animationSpeed" min="0.5" max="3" step="0.1" value="1" onchange="setAnimationSpeed(this.value)">
+                <span id="speedValue">1x</span>
+            </div>
+        </div>
+
+        <div class="customization-option">
+            <span class="customization-label">Scanlines Effect:</span>
+            <div class="customization-control">
+                <div class="customization-toggle" id="scanlinesToggle" onclick="toggleScanlines()"></div>
+                <span id="scanlinesStatus">OFF</span>
+            </div>
+        </div>
+
+        <div class="customization-option">
+            <span class="customization-label">Particle Density:</span>
+            <div class="customization-control">
+                <input type="range" class="customization-slider" id="particleDensity" min="0" max="100" step="10" value="50" onchange="setParticleDensity(this.value)">
+                <span id="densityValue">50%</span>
+            </div>
+        </div>
+    </div>
+
+    <div style="text-align: center;">
+        <button class="btn primary" onclick="saveWallpaperSettings()">💾 Save Settings</button>
+        <button class="btn" onclick="resetWallpaperSettings()">🔄 Reset to Default</button>
+    </div>
+</div>
+`;
+document.body.insertAdjacentHTML('beforeend', WALLPAPER_PANEL);
+
+function openWallpaperPanel() {
+    const panel = document.getElementById('wallpaperPanel');
+    if (panel) {
+        panel.classList.add('show');
+        playSound('open');
+        updateDebug('Wallpaper panel opened');
+    }
+}
+
+function closeWallpaperPanel() {
+    const panel = document.getElementById('wallpaperPanel');
+    if (panel) {
+        panel.classList.remove('show');
+        playSound('close');
+        updateDebug('Wallpaper panel closed');
+        showNotification('Wallpaper panel closed', 'info');
+    } else {
+        updateDebug('ERROR: Wallpaper panel not found', null, true);
+    }
+}
+
+function setWallpaper(type) {
+    const desktop = document.getElementById('desktop');
+    if (!desktop) return;
+
+    // Remove all wallpaper classes
+    desktop.className = 'desktop';
+
+    // Add new wallpaper class
+    if (type !== 'default') {
+        desktop.classList.add(`wallpaper-${type}`);
+    }
+
+    // Update active state in panel if it exists
+    const wallpaperOptions = document.querySelectorAll('.wallpaper-option');
+    if (wallpaperOptions.length > 0) {
+        wallpaperOptions.forEach(option => {
+            option.classList.remove('active');
+        });
+        const activeOption = document.querySelector(`[data-wallpaper="${type}"]`);
+        if (activeOption) {
+            activeOption.classList.add('active');
+        }
+    }
+
+    currentWallpaper = type;
+    playSound('click');
+    showNotification(`Wallpaper changed to ${type}!`, 'success');
+    updateDebug(`Wallpaper changed to: ${type}`);
+}
+
+function applyCustomWallpaper() {
+    const desktop = document.getElementById('desktop');
+    if (!desktop) return;
+
+    // Create a custom gradient based on user preferences
+    const hue1 = Math.floor(Math.random() * 360);
+    const hue2 = (hue1 + 120) % 360;
+    const hue3 = (hue1 + 240) % 360;
+
+    desktop.style.background = `
+        linear-gradient(45deg,
+            hsl(${hue1}, 70%, 60%) 0%,
+            hsl(${hue2}, 70%, 60%) 50%,
+            hsl(${hue3}, 70%, 60%) 100%),
+        radial-gradient(circle at 20% 80%, rgba(255,255,255,0.1) 0%, transparent 50%),
+        radial-gradient(circle at 80% 20%, rgba(255,255,255,0.1) 0%, transparent 50%)
+    `;
+}
+
+function setAnimationSpeed(speed) {
+    wallpaperSettings.animationSpeed = parseFloat(speed);
+    document.getElementById('speedValue').textContent = speed + 'x';
+
+    // Apply to current wallpaper
+    const desktop = document.getElementById('desktop');
+    if (desktop) {
+        desktop.style.animationDuration = `${20 / speed}s`;
+    }
+
+    updateDebug(`Animation speed set to: ${speed}x`);
+}
+
+function toggleScanlines() {
+    const toggle = document.getElementById('scanlinesToggle');
+    const status = document.getElementById('scanlinesStatus');
+
+    wallpaperSettings.scanlines = !wallpaperSettings.scanlines;
+
+    if (wallpaperSettings.scanlines) {
+        toggle.classList.add('active');
+        status.textContent = 'ON';
+        addScanlinesEffect();
+    } else {
+        toggle.classList.remove('active');
+        status.textContent = 'OFF';
+        removeScanlinesEffect();
+    }
+
+    playSound('click');
+    updateDebug(`Scanlines ${wallpaperSettings.scanlines ? 'enabled' : 'disabled'}`);
+}
+
+function addScanlinesEffect() {
+    let scanlines = document.getElementById('customScanlines');
+    if (!scanlines) {
+        scanlines = document.createElement('div');
+        scanlines.id = 'customScanlines';
+        scanlines.style.cssText = `
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(0deg, transparent 50%, rgba(0,0,0,0.1) 50%);
+            background-size: 2px 2px;
+            pointer-events: none;
+            z-index: 9998;
+            animation: scanlines 0.1s linear infinite;
+        `;
+        document.body.appendChild(scanlines);
+    }
+}
+
+function removeScanlinesEffect() {
+    const scanlines = document.getElementById('customScanlines');
+    if (scanlines) {
+        scanlines.remove();
+    }
+}
+
+function setParticleDensity(density) {
+    wallpaperSettings.particleDensity = parseInt(density);
+    document.getElementById('densityValue').textContent = density + '%';
+
+    // Apply particle effect based on density
+    applyParticleEffect(density);
+
+    updateDebug(`Particle density set to: ${density}%`);
+}
+
+function applyParticleEffect(density) {
+    // Remove existing particles
+    const existingParticles = document.querySelectorAll('.particle');
+    existingParticles.forEach(particle => particle.remove());
+
+    if (density === 0) return;
+
+    const particleCount = Math.floor(density / 10) * 5; // 5 particles per 10% density
+
+    for (let i = 0; i < particleCount; i++) {
+        createParticle();
+    }
+}
+
+function createParticle() {
+    const particle = document.createElement('div');
+    particle.className = 'particle';
+    particle.style.cssText = `
+        position: fixed;
+        width: 2px;
+        height: 2px;
+        background: var(--pixel-primary);
+        border-radius: 50%;
+        pointer-events: none;
+        z-index: 9997;
+        animation: particleFloat 10s linear infinite;
+    `;
+
+    // Random position and animation
+    const startX = Math.random() * window.innerWidth;
+    const startY = Math.random() * window.innerHeight;
+    const endX = Math.random() * window.innerWidth;
+    const endY = Math.random() * window.innerHeight;
+
+    particle.style.left = startX + 'px';
+    particle.style.top = startY + 'px';
+    particle.style.animation = `particleFloat 10s linear infinite`;
+
+    document.body.appendChild(particle);
+
+    // Remove particle after animation
+    setTimeout(() => {
+        if (particle.parentNode) {
+            particle.remove();
+        }
+    }, 10000);
+}
+
+function saveWallpaperSettings() {
+    const settings = {
+        wallpaper: currentWallpaper,
+        ...wallpaperSettings
+    };
+
+    localStorage.setItem('pixelPortfolioWallpaper', JSON.stringify(settings));
+    showNotification('Wallpaper settings saved!', 'success');
+    updateDebug('Wallpaper settings saved to localStorage');
+}
+
+function resetWallpaperSettings() {
+    currentWallpaper = 'default';
+    wallpaperSettings = {
+        animationSpeed: 1,
+        scanlines: false,
+        particleDensity: 50
+    };
+
+    // Reset UI
+    setWallpaper('default');
+    document.getElementById('animationSpeed').value = 1;
+    document.getElementById('speedValue').textContent = '1x';
+    document.getElementById('scanlinesToggle').classList.remove('active');
+    document.getElementById('scanlinesStatus').textContent = 'OFF';
+    document.getElementById('particleDensity').value = 50;
+    document.getElementById('densityValue').textContent = '50%';
+
+    // Remove effects
+    removeScanlinesEffect();
+    applyParticleEffect(0);
+
+    // Clear localStorage
+    localStorage.removeItem('pixelPortfolioWallpaper');
+
+    showNotification('Settings reset to default!', 'success');
+    updateDebug('Wallpaper settings reset to default');
+}
+
+function loadWallpaperSettings() {
+    try {
+        const saved = localStorage.getItem('pixelPortfolioWallpaper');
+        if (saved) {
+            const settings = JSON.parse(saved);
+            currentWallpaper = settings.wallpaper || 'default';
+            wallpaperSettings = {
+                animationSpeed: settings.animationSpeed || 1,
+                scanlines: settings.scanlines || false,
+                particleDensity: settings.particleDensity || 50
+            };
+
+            // Apply saved settings only if DOM elements exist
+            const desktop = document.getElementById('desktop');
+            if (desktop) {
+                setWallpaper(currentWallpaper);
+            }
+
+            // Only apply other settings if elements exist
+            const speedElement = document.getElementById('animationSpeed');
+            if (speedElement) {
+                setAnimationSpeed(wallpaperSettings.animationSpeed);
+            }
+
+            if (wallpaperSettings.scanlines) {
+                const scanlinesToggle = document.getElementById('scanlinesToggle');
+                if (scanlinesToggle) {
+                    toggleScanlines();
+                }
+            }
+
+            const densityElement = document.getElementById('particleDensity');
+            if (densityElement) {
+                setParticleDensity(wallpaperSettings.particleDensity);
+            }
+
+            updateDebug('Wallpaper settings loaded from localStorage');
+        }
+    } catch (error) {
+        updateDebug('Error loading wallpaper settings: ' + error.message);
+        // Don't let wallpaper errors break the system
+    }
+}
+
+// Simple wallpaper toggle for testing
+let currentSimpleWallpaper = 0;
+const simpleWallpapers = [
+    'default',
+    'wallpaper-matrix',
+    'wallpaper-cyberpunk',
+    'wallpaper-retro-wave'
+];
+
+function toggleWallpaper() {
+    const desktop = document.getElementById('desktop');
+    if (!desktop) return;
+
+    // Remove current wallpaper
+    desktop.className = 'desktop';
+
+    // Add next wallpaper
+    currentSimpleWallpaper = (currentSimpleWallpaper + 1) % simpleWallpapers.length;
+    const wallpaper = simpleWallpapers[currentSimpleWallpaper];
+
+    if (wallpaper !== 'default') {
+        desktop.classList.add(wallpaper);
+    }
+
+    playSound('click');
+    showNotification(`Wallpaper: ${wallpaper}`, 'success');
+    updateDebug(`Simple wallpaper changed to: ${wallpaper}`);
+}
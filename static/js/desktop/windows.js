@@ -0,0 +1,527 @@
+// 🪟 Built-in window content, used when a page can't be fetched (loaded on
+// demand by core.js), plus the recycle bin and contact form actions it wires up.
+
+function loadWindowContent(window, type) {
+    const content = window.querySelector('.window-content');
+
+    const contentMap = {
+        home: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--pixel-primary); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">🏠</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--pixel-primary); font-family: 'Press Start 2P', monospace; font-size: 18px;">WELCOME TO PIXEL PORTFOLIO</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">Your advanced retro PC desktop experience is ready!</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🧪 DEBUG TEST</h2>
+                <button class="btn" onclick="testDragging()" style="background: red; color: white;">TEST DRAGGING</button>
+                <button class="btn" onclick="console.log('Window elements:', document.querySelectorAll('.window'))">LOG WINDOWS</button>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🎯 QUICK ACTIONS</h2>
+                <div style="display: flex; gap: 10px; flex-wrap: wrap;">
+                    <button class="btn primary" onclick="openWindow('about')">👤 Open Profile</button>
+                    <button class="btn primary" onclick="openWindow('projects')">🎮 View Projects</button>
+                    <button class="btn primary" onclick="openWindow('contact')">📧 Contact Me</button>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🖥️ DESKTOP FEATURES</h2>
+                <div style="font-size: 13px;">
+                    <p style="margin: 5px 0;">• <strong>Resizable Windows:</strong> Drag window edges to resize</p>
+                    <p style="margin: 5px 0;">• <strong>Window Management:</strong> Minimize, maximize, and close windows</p>
+                    <p style="margin: 5px 0;">• <strong>Sound Effects:</strong> Authentic retro PC sounds</p>
+                    <p style="margin: 5px 0;">• <strong>Right-click Context Menu:</strong> Desktop interaction</p>
+                    <p style="margin: 5px 0;">• <strong>Enhanced Start Menu:</strong> More applications and options</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🎮 SYSTEM APPLICATIONS</h2>
+                <div style="display: flex; gap: 10px; flex-wrap: wrap;">
+                    <button class="btn" onclick="openWindow('calculator')">🔢 Calculator</button>
+                    <button class="btn" onclick="openWindow('notepad')">📝 Notepad</button>
+                    <button class="btn" onclick="openWindow('mycomputer')">💻 My Computer</button>
+                </div>
+            </div>
+        `,
+        about: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--pixel-primary); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">👤</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--pixel-primary); font-family: 'Press Start 2P', monospace; font-size: 18px;">PLAYER PROFILE</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">BCA Graduate | Aspiring Full-Stack Developer</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🧑‍💻 PLAYER BIO</h2>
+                <p style="margin: 0; font-size: 13px; line-height: 1.6;">
+                    Greetings, fellow adventurer! I'm a passionate BCA graduate with a quest for creating innovative web solutions.
+                    My journey through the digital realm has equipped me with diverse technical skills and an insatiable curiosity
+                    for emerging technologies. From crafting tourism websites to exploring full-stack development,
+                    I'm always ready for the next coding challenge!
+                </p>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🛠️ TECHNICAL EXPERTISE</h2>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; font-size: 13px;">
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Frontend:</strong> HTML5, CSS3, JavaScript ES6+
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Frameworks:</strong> React, Vue.js, TypeScript
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Backend:</strong> Python, Django, Node.js
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Databases:</strong> PostgreSQL, MongoDB, SQLite
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Tools:</strong> Git, Docker, AWS, CI/CD
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 5px; border: 1px solid var(--retro-accent);">
+                        <strong>Design:</strong> Figma, Adobe Creative Suite
+                    </div>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🏆 EXPERIENCE HIGHLIGHTS</h2>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; font-size: 13px;">
+                    <div><strong>Years:</strong> 5+ in web development</div>
+                    <div><strong>Projects:</strong> 50+ successful deliveries</div>
+                    <div><strong>Technologies:</strong> Legacy & modern</div>
+                    <div><strong>Focus:</strong> Creative solutions</div>
+                </div>
+            </div>
+
+            <div style="text-align: center; margin-top: 20px;">
+                <button class="btn primary" onclick="openWindow('projects')">🎮 View Projects</button>
+                <button class="btn" onclick="openWindow('contact')">📧 Contact Me</button>
+            </div>
+        `,
+        projects: `
+            <section class="quest-section">
+                <div class="container">
+                    <!-- Stats -->
+                    <div class="quest-stats">
+                        <div class="stat-box">
+                            <span class="stat-number"></span>
+                            <span>TOTAL QUESTS</span>
+                        </div>
+                        <div class="stat-box">
+                            <span class="stat-number"></span>
+                            <span>COMPLETED</span>
+                        </div>
+                        <div class="stat-box">
+                            <span class="stat-number">∞</span>
+                            <span>XP GAINED</span>
+                        </div>
+                    </div>
+
+                    <!-- Projects -->
+                    <!-- Filled in by /projects/ when it is reachable -->
+                    <div class="quest-grid"></div>
+                </div>
+            </section>
+
+        `,
+        contact: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--pixel-warning); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">📧</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--pixel-warning); font-family: 'Press Start 2P', monospace; font-size: 18px;">NPC DIALOGUE</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">Connect with the developer NPC</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <div style="background: var(--retro-info); color: var(--retro-highlight); padding: 10px; margin-bottom: 15px; font-weight: bold; display: flex; align-items: center; gap: 10px; font-family: 'VT323', monospace;">
+                    <span>👨‍💻</span>
+                    <span>NPC_DEVELOPER</span>
+                </div>
+                <p style="margin: 0; font-size: 13px; line-height: 1.6;">
+                    Hello, adventurer! Welcome to my digital realm. I'm always excited to connect with fellow explorers of the coding universe.
+                    What brings you here today?
+                </p>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">💬 DIALOGUE OPTIONS</h2>
+                <div style="display: flex; flex-direction: column; gap: 8px;">
+                    <button class="btn" onclick="showContactForm()" style="text-align: left; justify-content: flex-start;">
+                        📝 I want to send you a message
+                    </button>
+                    <button class="btn" onclick="showContactInfo()" style="text-align: left; justify-content: flex-start;">
+                        📋 Show me your contact information
+                    </button>
+                    <button class="btn" onclick="showSocialLinks()" style="text-align: left; justify-content: flex-start;">
+                        🔗 Let's connect on social media
+                    </button>
+                </div>
+            </div>
+
+            <div id="contact-form" style="display: none; background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">📝 MESSAGE SCROLL</h2>
+                <div style="margin-bottom: 15px;">
+                    <label style="display: block; margin-bottom: 5px; font-weight: bold; font-family: 'Press Start 2P', monospace; font-size: 10px;">YOUR_NAME:</label>
+                    <input type="text" id="contact-name" style="width: 100%; padding: 8px; border: 2px inset var(--retro-highlight); background: white; font-family: inherit;">
+                </div>
+                <div style="margin-bottom: 15px;">
+                    <label style="display: block; margin-bottom: 5px; font-weight: bold; font-family: 'Press Start 2P', monospace; font-size: 10px;">EMAIL_ADDRESS:</label>
+                    <input type="email" id="contact-email" style="width: 100%; padding: 8px; border: 2px inset var(--retro-highlight); background: white; font-family: inherit;">
+                </div>
+                <div style="margin-bottom: 15px;">
+                    <label style="display: block; margin-bottom: 5px; font-weight: bold; font-family: 'Press Start 2P', monospace; font-size: 10px;">MESSAGE:</label>
+                    <textarea id="contact-message" rows="4" style="width: 100%; padding: 8px; border: 2px inset var(--retro-highlight); background: white; font-family: inherit; resize: vertical;"></textarea>
+                </div>
+                <button class="btn primary" onclick="sendMessage()">📤 SEND MESSAGE</button>
+                <button class="btn" onclick="hideContactForm()">↩️ GO BACK</button>
+            </div>
+
+            <div id="contact-info" style="display: none; background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">📋 CONTACT INFORMATION</h2>
+                <div style="font-size: 13px;">
+                    <p><strong>📧 Email:</strong> developer@pixelportfolio.com</p>
+                    <p><strong>📱 Phone:</strong> +91 12345 67890</p>
+                    <p><strong>📍 Location:</strong> Mumbai, Maharashtra</p>
+                    <p><strong>💼 LinkedIn:</strong> linkedin.com/in/pixelportfolio</p>
+                    <p><strong🐙 GitHub:</strong> github.com/pixelportfolio</p>
+                </div>
+                <button class="btn" onclick="hideContactInfo()" style="margin-top: 10px;">↩️ GO BACK</button>
+            </div>
+
+            <div id="social-links" style="display: none; background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🔗 SOCIAL CONNECTIONS</h2>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; font-size: 13px;">
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; border: 1px solid var(--retro-accent); text-align: center;">
+                        <div style="font-size: 16px; margin-bottom: 5px;">💼</div>
+                        <div>LINKEDIN</div>
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; border: 1px solid var(--retro-accent); text-align: center;">
+                        <div style="font-size: 16px; margin-bottom: 5px;">🐙</div>
+                        <div>GITHUB</div>
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; border: 1px solid var(--retro-accent); text-align: center;">
+                        <div style="font-size: 16px; margin-bottom: 5px;">🐦</div>
+                        <div>TWITTER</div>
+                    </div>
+                    <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; border: 1px solid var(--retro-accent); text-align: center;">
+                        <div style="font-size: 16px; margin-bottom: 5px;">📷</div>
+                        <div>INSTAGRAM</div>
+                    </div>
+                </div>
+                <button class="btn" onclick="hideSocialLinks()" style="margin-top: 10px;">↩️ GO BACK</button>
+            </div>
+        `,
+        mycomputer: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--retro-border); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">💻</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--retro-border); font-family: 'Press Start 2P', monospace; font-size: 18px;">MY COMPUTER</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">System information and file management interface</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">💾 SYSTEM DRIVES</h2>
+                <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 10px; font-family: 'Share Tech Mono', monospace; font-size: 12px; border: 2px inset var(--retro-accent); margin: 10px 0;">
+                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                        <span>🖥️ Local Disk (C:)</span>
+                        <span>System Drive</span>
+                    </div>
+                    <div style="background: var(--retro-accent); height: 8px; margin: 5px 0; position: relative;">
+                        <div style="background: var(--retro-error); height: 100%; width: 15.2%;"></div>
+                    </div>
+                    <div style="display: flex; justify-content: space-between; font-size: 11px;">
+                        <span>Used: 15.2 GB</span>
+                        <span>Free: 84.8 GB</span>
+                        <span>Total: 100 GB</span>
+                    </div>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">📁 QUICK ACCESS</h2>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px;">
+                    <button class="btn" onclick="openWindow('notepad')" style="text-align: left; padding: 10px;">
+                        <div style="font-size: 20px; margin-bottom: 5px;">📝</div>
+                        <div style="font-size: 12px;"><strong>Documents</strong><br>Personal files & notes</div>
+                    </button>
+                    <button class="btn" onclick="openWindow('projects')" style="text-align: left; padding: 10px;">
+                        <div style="font-size: 20px; margin-bottom: 5px;">🎮</div>
+                        <div style="font-size: 12px;"><strong>Projects</strong><br>Development work</div>
+                    </button>
+                    <button class="btn" onclick="showNotification('Downloads folder opened!', 'info')" style="text-align: left; padding: 10px;">
+                        <div style="font-size: 20px; margin-bottom: 5px;">📥</div>
+                        <div style="font-size: 12px;"><strong>Downloads</strong><br>Downloaded files</div>
+                    </button>
+                    <button class="btn" onclick="showNotification('Pictures folder opened!', 'info')" style="text-align: left; padding: 10px;">
+                        <div style="font-size: 20px; margin-bottom: 5px;">🖼️</div>
+                        <div style="font-size: 12px;"><strong>Pictures</strong><br>Image files</div>
+                    </button>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">⚙️ SYSTEM INFORMATION</h2>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; font-size: 13px;">
+                    <div><strong>OS:</strong> Pixel Portfolio OS v2.0</div>
+                    <div><strong>Processor:</strong> Retro CPU 486DX</div>
+                    <div><strong>Memory:</strong> 16 MB RAM</div>
+                    <div><strong>Graphics:</strong> VGA Compatible</div>
+                    <div><strong>Sound:</strong> Sound Blaster 16</div>
+                    <div><strong>Network:</strong> 56k Modem</div>
+                </div>
+            </div>
+        `,
+        notepad: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--retro-highlight); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">📝</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--retro-text); font-family: 'Press Start 2P', monospace; font-size: 18px;">NOTEPAD</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">Simple text editor for quick notes and code snippets</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <textarea id="notepadText" style="width: 100%; height: 200px; background: white; border: 2px inset var(--retro-highlight); padding: 10px; font-family: 'Courier New', monospace; font-size: 12px; resize: vertical;" placeholder="Type your notes here...">Welcome to Pixel Portfolio Notepad!
+
+This is a simple text editor where you can:
+• Write notes and reminders
+• Draft code snippets
+• Plan your projects
+• Jot down ideas
+
+Features:
+- Retro styling
+- Monospace font
+- Authentic feel
+- Auto-save functionality
+
+Start typing to replace this text...</textarea>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">📁 FILE OPERATIONS</h2>
+                <div style="display: flex; gap: 10px; flex-wrap: wrap;">
+                    <button class="btn" onclick="notepadSave()">💾 Save</button>
+                    <button class="btn" onclick="notepadOpen()">📂 Open</button>
+                    <button class="btn" onclick="notepadNew()">🆕 New</button>
+                    <button class="btn" onclick="notepadClear()">🗑️ Clear</button>
+                    <button class="btn" onclick="notepadPrint()">🖨️ Print</button>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; font-family: 'Share Tech Mono', monospace; font-size: 11px; border: 1px solid var(--retro-accent); margin-top: 15px;">
+                <div><strong>Status:</strong> Ready</div>
+                <div><strong>Characters:</strong> <span id="charCount">0</span></div>
+                <div><strong>Lines:</strong> <span id="lineCount">0</span></div>
+            </div>
+        `,
+        calculator: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--retro-border); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">🔢</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--retro-border); font-family: 'Press Start 2P', monospace; font-size: 18px;">CALCULATOR</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">Basic calculator for mathematical operations</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 15px; margin: 10px 0; font-family: 'Share Tech Mono', monospace; font-size: 18px; text-align: right; border: 2px inset var(--retro-accent); min-height: 30px; display: flex; align-items: center; justify-content: flex-end;">
+                    <div id="calcDisplay">0</div>
+                </div>
+
+                <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 8px; max-width: 280px; margin: 0 auto;">
+                    <button class="btn" onclick="calcClear()" style="background: var(--retro-error); color: var(--retro-highlight);">C</button>
+                    <button class="btn" onclick="calcInput('/')" style="background: var(--pixel-warning);">/</button>
+                    <button class="btn" onclick="calcInput('*')" style="background: var(--pixel-warning);">×</button>
+                    <button class="btn" onclick="calcBackspace()" style="background: var(--retro-info); color: var(--retro-highlight);">←</button>
+
+                    <button class="btn" onclick="calcInput('7')">7</button>
+                    <button class="btn" onclick="calcInput('8')">8</button>
+                    <button class="btn" onclick="calcInput('9')">9</button>
+                    <button class="btn" onclick="calcEquals()" style="grid-row: span 2; background: var(--pixel-success); color: var(--retro-highlight);">=</button>
+
+                    <button class="btn" onclick="calcInput('4')">4</button>
+                    <button class="btn" onclick="calcInput('5')">5</button>
+                    <button class="btn" onclick="calcInput('6')">6</button>
+                    <button class="btn" onclick="calcInput('-')" style="background: var(--pixel-warning);">−</button>
+
+                    <button class="btn" onclick="calcInput('1')">1</button>
+                    <button class="btn" onclick="calcInput('2')">2</button>
+                    <button class="btn" onclick="calcInput('3')">3</button>
+                    <button class="btn" onclick="calcInput('+')" style="background: var(--pixel-warning);">+</button>
+
+                    <button class="btn" onclick="calcInput('0')" style="grid-column: span 2;">0</button>
+                    <button class="btn" onclick="calcInput('.')">.</button>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; font-family: 'Share Tech Mono', monospace; font-size: 11px; border: 1px solid var(--retro-accent); margin-top: 15px;">
+                <div><strong>Mode:</strong> Standard</div>
+                <div><strong>Memory:</strong> <span id="calcMemory">0</span></div>
+                <div><strong>History:</strong> <span id="calcHistory">0</span> operations</div>
+            </div>
+        `,
+        recycle: `
+            <div style="display: flex; align-items: center; margin-bottom: 20px;">
+                <div style="width: 64px; height: 64px; background: var(--retro-error); border: 2px outset var(--retro-highlight); margin-right: 15px; display: flex; align-items: center; justify-content: center; font-size: 32px;">🗑️</div>
+                <div>
+                    <h1 style="margin: 0; color: var(--retro-error); font-family: 'Press Start 2P', monospace; font-size: 18px;">RECYCLE BIN</h1>
+                    <p style="margin: 5px 0; color: var(--retro-text); font-size: 14px;">Deleted files and folders are stored here temporarily</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 20px; margin: 10px 0; min-height: 150px; border: 2px inset var(--retro-accent); display: flex; flex-direction: column; align-items: center; justify-content: center;">
+                    <div style="font-size: 48px; margin-bottom: 10px;">🗑️</div>
+                    <p style="text-align: center; color: var(--retro-accent); font-style: italic; margin: 0;">Recycle Bin is empty</p>
+                    <p style="text-align: center; color: var(--retro-accent); font-size: 12px; margin: 5px 0 0 0;">No deleted items to display</p>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-highlight); border: 2px inset var(--retro-highlight); padding: 15px; margin: 15px 0;">
+                <h2 style="color: var(--pixel-secondary); margin: 0 0 10px 0; font-size: 16px; font-family: 'Press Start 2P', monospace;">🗑️ BIN OPERATIONS</h2>
+                <div style="display: flex; gap: 10px; flex-wrap: wrap;">
+                    <button class="btn" onclick="recycleEmpty()">🗑️ Empty Recycle Bin</button>
+                    <button class="btn" onclick="recycleRestore()">↩️ Restore All</button>
+                    <button class="btn" onclick="recycleProperties()">📋 Properties</button>
+                </div>
+            </div>
+
+            <div style="background: var(--retro-bg); color: var(--retro-accent); padding: 8px; font-family: 'Share Tech Mono', monospace; font-size: 11px; border: 1px solid var(--retro-accent); margin-top: 15px;">
+                <div><strong>Items:</strong> 0</div>
+                <div><strong>Size:</strong> 0 bytes</div>
+                <div><strong>Location:</strong> C:\\Recycled</div>
+                <div><strong>Last Modified:</strong> Never</div>
+            </div>
+        `
+    };
+
+    content.innerHTML = contentMap[type] || `<h1>🚧 Coming Soon</h1><p>This application is under development.</p>`;
+
+    // Initialize specific functionality for certain windows
+    if (type === 'notepad') {
+        initializeNotepad();
+    } else if (type === 'calculator') {
+        initializeCalculator();
+    }
+}
+
+// Enhanced Recycle Bin Functions
+function recycleEmpty() {
+    playSound('click');
+    showNotification('Recycle Bin emptied successfully!', 'success');
+    updateDebug('Recycle Bin emptied');
+}
+
+function recycleRestore() {
+    playSound('click');
+    showNotification('No items to restore!', 'info');
+    updateDebug('Recycle Bin restore attempted');
+}
+
+function recycleProperties() {
+    playSound('click');
+    showNotification('Recycle Bin properties opened!', 'info');
+    updateDebug('Recycle Bin properties viewed');
+}
+
+// Test function for debugging dragging
+function testDragging() {
+    console.log('=== TESTING DRAGGING ===');
+    const windows = document.querySelectorAll('.window');
+    console.log('Found windows:', windows.length);
+
+    windows.forEach((win, index) => {
+        console.log(`Window ${index}:`, win);
+        console.log(`Window ${index} style:`, win.style.cssText);
+        console.log(`Window ${index} position:`, win.style.left, win.style.top);
+        console.log(`Window ${index} offset:`, win.offsetLeft, win.offsetTop);
+    });
+
+    // Try to manually move a window
+    if (windows.length > 0) {
+        const testWindow = windows[0];
+        console.log('Testing manual movement of:', testWindow);
+        testWindow.style.left = '100px';
+        testWindow.style.top = '100px';
+        console.log('Manual movement applied. New style:', testWindow.style.cssText);
+    }
+}
+
+// Contact Form Functions
+function showContactForm() {
+    playSound('click');
+    document.getElementById('contact-form').style.display = 'block';
+    document.getElementById('contact-info').style.display = 'none';
+    document.getElementById('social-links').style.display = 'none';
+    updateDebug('Contact form displayed');
+}
+
+function hideContactForm() {
+    playSound('click');
+    document.getElementById('contact-form').style.display = 'none';
+    updateDebug('Contact form hidden');
+}
+
+function showContactInfo() {
+    playSound('click');
+    document.getElementById('contact-info').style.display = 'block';
+    document.getElementById('contact-form').style.display = 'none';
+    document.getElementById('social-links').style.display = 'none';
+    updateDebug('Contact info displayed');
+}
+
+function hideContactInfo() {
+    playSound('click');
+    document.getElementById('contact-info').style.display = 'none';
+    updateDebug('Contact info hidden');
+}
+
+function showSocialLinks() {
+    playSound('click');
+    document.getElementById('social-links').style.display = 'block';
+    document.getElementById('contact-form').style.display = 'none';
+    document.getElementById('contact-info').style.display = 'none';
+    updateDebug('Social links displayed');
+}
+
+function hideSocialLinks() {
+    playSound('click');
+    document.getElementById('social-links').style.display = 'none';
+    updateDebug('Social links hidden');
+}
+
+function sendMessage() {
+    const name = document.getElementById('contact-name').value;
+    const email = document.getElementById('contact-email').value;
+    const message = document.getElementById('contact-message').value;
+
+    if (!name || !email || !message) {
+        showNotification('Please fill in all fields!', 'error');
+        return;
+    }
+
+    playSound('click');
+    showNotification('Message sent successfully! Thank you!', 'success');
+
+    // Clear form
+    document.getElementById('contact-name').value = '';
+    document.getElementById('contact-email').value = '';
+    document.getElementById('contact-message').value = '';
+
+    // Hide form
+    hideContactForm();
+
+    updateDebug('Contact message sent');
+}